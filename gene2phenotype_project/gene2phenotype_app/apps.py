@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class Gene2PhenotypeAppConfig(AppConfig):
     default_auto_field = 'django.db.models.AutoField'
     name = 'gene2phenotype_app'
+
+    def ready(self):
+        # Connect the signals used to keep the in-memory indexes up to date
+        from . import signals
+        # Register the system checks (shared cache)
+        from . import checks
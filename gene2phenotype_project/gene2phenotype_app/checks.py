@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Warning, register, Tags
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+        The in-memory indexes (see ProcessIndex) are invalidated through the default cache.
+        The cache has to be shared by all the processes, otherwise an invalidation
+        done by one process is not seen by the other processes.
+        It is a warning: a single process (e.g. manage.py commands) works with the local memory cache.
+    """
+    warnings = []
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+
+    if backend == 'django.core.cache.backends.locmem.LocMemCache' and not getattr(settings, 'TESTING', False):
+        warnings.append(
+            Warning(
+                "The default cache uses the local memory backend, it is not shared between processes.",
+                hint="Add a [cache] section to the config file with a shared backend "
+                     "(e.g. memcached, redis, database or file based cache).",
+                id="gene2phenotype_app.W001",
+            )
+        )
+
+    return warnings
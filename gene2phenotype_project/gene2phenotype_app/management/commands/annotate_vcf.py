@@ -0,0 +1,60 @@
+import gzip
+import itertools
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from gene2phenotype_app.models import LocusGenotypeDisease
+from gene2phenotype_app.utils import open_text_stream, get_vcf_intervals, annotate_vcf
+
+
+class Command(BaseCommand):
+    """
+        Annotates a VCF file with the G2P records overlapping the variants.
+        The INFO field 'G2P' is added to the variants: gene|stable_id|allelic_requirement|confidence
+        The input can be gzipped. The output is gzipped if the file name ends with '.gz'.
+
+        By default only the public records are used (reviewed records linked to visible panels).
+
+        Usage:
+            python manage.py annotate_vcf input.vcf.gz --output output.vcf.gz
+            cat input.vcf | python manage.py annotate_vcf - > output.vcf
+    """
+    help = "Annotates a VCF file with the G2P records overlapping the variants"
+    block_size = 10000
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="VCF file (can be gzipped), '-' to read from stdin")
+        parser.add_argument("--output", default="-", help="Output VCF file, '-' to write to stdout (default)")
+        parser.add_argument("--all-records", action="store_true",
+                            help="Include records not reviewed and records linked to non-visible panels")
+
+    def handle(self, *args, **options):
+        queryset = LocusGenotypeDisease.objects.filter(is_deleted=0)
+        if not options["all_records"]:
+            queryset = queryset.filter(is_reviewed=1, lgdpanel__panel__is_visible=1).distinct()
+
+        intervals = get_vcf_intervals(queryset)
+
+        try:
+            input_file = sys.stdin.buffer if options["input"] == "-" else open(options["input"], "rb")
+        except OSError as e:
+            raise CommandError(f"Cannot open input file: {e}")
+
+        output = options["output"]
+        if output == "-":
+            output_file = self.stdout
+        elif output.endswith(".gz"):
+            output_file = gzip.open(output, "wt", encoding="utf-8")
+        else:
+            output_file = open(output, "w", encoding="utf-8")
+
+        try:
+            with open_text_stream(input_file) as lines:
+                annotated_lines = annotate_vcf(lines, intervals)
+                # Write the lines in blocks
+                while block := list(itertools.islice(annotated_lines, self.block_size)):
+                    output_file.write("".join(block))
+        finally:
+            if output_file is not self.stdout:
+                output_file.close()
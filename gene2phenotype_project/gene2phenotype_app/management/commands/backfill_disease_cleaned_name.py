@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from gene2phenotype_app.models import Disease, DiseaseSynonym
+from gene2phenotype_app.utils import clean_string
+
+
+class Command(BaseCommand):
+    """
+        Populates the column 'cleaned_name' of the diseases and disease synonyms.
+        The cleaned name is used to find duplicated diseases (see CreateDiseaseSerializer).
+        New diseases and synonyms get the cleaned name when they are saved, the existing
+        data is populated by the migration 0013. Run this command after changing clean_string().
+
+        Usage:
+            python manage.py backfill_disease_cleaned_name
+    """
+    help = "Populates the cleaned name of the diseases and disease synonyms"
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        for model, name_field in ((Disease, 'name'), (DiseaseSynonym, 'synonym')):
+            objs = []
+            for obj_id, name in model.objects.values_list('id', name_field).iterator():
+                objs.append(model(id=obj_id, cleaned_name=clean_string(str(name))))
+
+            # bulk_update does not create history rows
+            model.objects.bulk_update(objs, ['cleaned_name'], batch_size=1000)
+
+            self.stdout.write(f"Updated {len(objs)} {model._meta.verbose_name_plural}")
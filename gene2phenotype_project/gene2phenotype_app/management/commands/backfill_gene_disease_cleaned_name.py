@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from gene2phenotype_app.models import GeneDisease
+from gene2phenotype_app.utils import clean_omim_disease
+
+
+class Command(BaseCommand):
+    """
+        Populates the column 'cleaned_disease' of the external gene-disease associations.
+        The cleaned disease is the disease name without the subtype (see clean_omim_disease).
+        It should be run after the gene-disease associations are imported with bulk inserts,
+        the associations saved with the ORM get the cleaned disease when they are saved.
+
+        Usage:
+            python manage.py backfill_gene_disease_cleaned_name
+    """
+    help = "Populates the cleaned disease name of the gene-disease associations"
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        objs = []
+        for obj_id, disease in GeneDisease.objects.values_list('id', 'disease').iterator():
+            objs.append(GeneDisease(id=obj_id, cleaned_disease=clean_omim_disease(str(disease))))
+
+        GeneDisease.objects.bulk_update(objs, ['cleaned_disease'], batch_size=1000)
+
+        self.stdout.write(f"Updated {len(objs)} gene-disease associations")
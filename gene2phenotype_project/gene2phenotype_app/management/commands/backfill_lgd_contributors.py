@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from gene2phenotype_app.utils import get_contributor_models, add_contributors
+
+
+class Command(BaseCommand):
+    """
+        Populates the table 'lgd_contributor' from the history tables.
+        The command can be run more than once, existing rows are kept.
+
+        Usage:
+            python manage.py backfill_lgd_contributors
+    """
+    help = "Populates the list of curators of the LGD records from the history tables"
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        for model, lgd_field in get_contributor_models().items():
+            contributors = list(model.history.filter(
+                history_user__isnull=False
+            ).values_list(lgd_field, 'history_user_id').distinct())
+
+            add_contributors(contributors)
+            self.stdout.write(f"{model.__name__}: {len(contributors)} (record, curator) pairs")
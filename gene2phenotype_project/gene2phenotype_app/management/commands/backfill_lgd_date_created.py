@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Min
+
+from gene2phenotype_app.models import LocusGenotypeDisease
+
+
+class Command(BaseCommand):
+    """
+        Populates the column 'date_created' of the LGD records from the history table.
+        The date is the date of the first insertion ('+') in the history.
+        Only records without date are updated.
+
+        Usage:
+            python manage.py backfill_lgd_date_created
+    """
+    help = "Populates the creation date of the LGD records from the history table"
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        records_without_date = LocusGenotypeDisease.objects.filter(date_created__isnull=True).values('id')
+
+        dates = LocusGenotypeDisease.history.filter(
+            history_type='+',
+            id__in=records_without_date
+        ).values('id').annotate(date_created=Min('history_date'))
+
+        # bulk_update does not create history rows
+        lgd_list = [LocusGenotypeDisease(id=row['id'], date_created=row['date_created']) for row in dates]
+        LocusGenotypeDisease.objects.bulk_update(lgd_list, ['date_created'], batch_size=1000)
+
+        self.stdout.write(f"Updated {len(lgd_list)} records")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from gene2phenotype_app.models import DatasetStats
+from gene2phenotype_app.utils import refresh_stats
+
+
+class Command(BaseCommand):
+    """
+        Recalculates the dataset stats of the public records (tables dataset_stats
+        and dataset_stats_record).
+        The command has to be run once to create the rollup, after that the
+        rollup is updated when the records are updated.
+        It can be run again to rebuild the rollup.
+
+        Usage:
+            python manage.py refresh_dataset_stats
+    """
+    help = "Recalculates the dataset stats used by the endpoint statistics"
+
+    def handle(self, *args, **options):
+        # refresh_stats() replaces the rows in a transaction
+        refresh_stats()
+
+        total = DatasetStats.objects.filter(category='total', value='records').values_list('count', flat=True).first()
+        self.stdout.write(f"Dataset stats refreshed: {total} records")
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gene2phenotype_app', '0002_alter_lgdvarianttypecomment_lgd_variant_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lgdpanel',
+            index=models.Index(fields=['panel', 'is_deleted', 'lgd'], name='lgd_panel_panel_i_046983_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='locusgenotypedisease',
+            index=models.Index(fields=['confidence', 'genotype', 'mechanism'], name='locus_genot_confide_68bbb5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='locusgenotypedisease',
+            index=models.Index(fields=['date_review'], name='locus_genot_date_re_bd1358_idx'),
+        ),
+    ]
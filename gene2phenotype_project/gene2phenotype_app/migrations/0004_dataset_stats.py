@@ -0,0 +1,27 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gene2phenotype_app', '0003_panel_records_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetStats',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('category', models.CharField(max_length=50)),
+                ('value', models.CharField(max_length=255)),
+                ('count', models.IntegerField(default=0)),
+                ('date_update', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'dataset_stats',
+                'unique_together': {('category', 'value')},
+            },
+        ),
+    ]
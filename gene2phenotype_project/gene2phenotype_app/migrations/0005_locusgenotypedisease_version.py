@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gene2phenotype_app', '0004_dataset_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicallocusgenotypedisease',
+            name='version',
+            field=models.IntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='locusgenotypedisease',
+            name='version',
+            field=models.IntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gene2phenotype_app', '0005_locusgenotypedisease_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LGDContributor',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('lgd', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='gene2phenotype_app.locusgenotypedisease')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'lgd_contributor',
+                'unique_together': {('lgd', 'user')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gene2phenotype_app', '0006_lgd_contributor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicallocusgenotypedisease',
+            name='date_created',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='locusgenotypedisease',
+            name='date_created',
+            field=models.DateTimeField(null=True),
+        ),
+    ]
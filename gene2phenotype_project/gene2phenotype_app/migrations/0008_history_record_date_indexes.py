@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+
+# History tables used by the record history endpoint (/lgd/<stable_id>/history/)
+# The changes of a record are read with 'WHERE lgd_id = ? ORDER BY history_date DESC'
+# The historical models are generated by django-simple-history and cannot declare
+# extra indexes, the indexes are only created in the database
+HISTORY_INDEXES = {
+    "HistoricalLocusGenotypeDisease": ("id", "hist_lgd_id_date_idx"),
+    "HistoricalLGDPanel": ("lgd", "hist_lgd_panel_lgd_date_idx"),
+    "HistoricalLGDPublication": ("lgd", "hist_lgd_pub_lgd_date_idx"),
+    "HistoricalLGDPhenotype": ("lgd", "hist_lgd_pheno_lgd_date_idx"),
+    "HistoricalLGDPhenotypeSummary": ("lgd", "hist_lgd_pheno_sum_lgd_date_idx"),
+    "HistoricalLGDVariantType": ("lgd", "hist_lgd_var_type_lgd_date_idx"),
+    "HistoricalLGDVariantTypeDescription": ("lgd", "hist_lgd_var_desc_lgd_date_idx"),
+    "HistoricalLGDVariantGenccConsequence": ("lgd", "hist_lgd_var_cons_lgd_date_idx"),
+    "HistoricalLGDCrossCuttingModifier": ("lgd", "hist_lgd_ccm_lgd_date_idx"),
+    "HistoricalLGDMolecularMechanismSynopsis": ("lgd", "hist_lgd_mech_syn_lgd_date_idx"),
+    "HistoricalLGDMolecularMechanismEvidence": ("lgd", "hist_lgd_mech_evi_lgd_date_idx"),
+}
+
+
+def get_indexes(apps):
+    for model_name, (field, index_name) in HISTORY_INDEXES.items():
+        model = apps.get_model("gene2phenotype_app", model_name)
+        yield model, models.Index(fields=[field, "history_date"], name=index_name)
+
+def add_indexes(apps, schema_editor):
+    for model, index in get_indexes(apps):
+        schema_editor.add_index(model, index)
+
+def remove_indexes(apps, schema_editor):
+    for model, index in get_indexes(apps):
+        schema_editor.remove_index(model, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gene2phenotype_app', '0007_locusgenotypedisease_date_created'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_indexes, remove_indexes),
+    ]
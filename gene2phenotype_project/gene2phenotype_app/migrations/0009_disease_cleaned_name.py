@@ -0,0 +1,41 @@
+# Generated by Django 5.1.5 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gene2phenotype_app', '0008_history_record_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='disease',
+            name='cleaned_name',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='diseasesynonym',
+            name='cleaned_name',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='historicaldisease',
+            name='cleaned_name',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='historicaldiseasesynonym',
+            name='cleaned_name',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='disease',
+            index=models.Index(fields=['cleaned_name'], name='disease_cleaned_c94e13_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='diseasesynonym',
+            index=models.Index(fields=['cleaned_name'], name='disease_syn_cleaned_709e33_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.5 on 2026-10-19 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gene2phenotype_app', '0009_disease_cleaned_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='genedisease',
+            name='cleaned_disease',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='genedisease',
+            index=models.Index(fields=['gene', 'source'], name='gene_diseas_gene_id_122a43_idx'),
+        ),
+    ]
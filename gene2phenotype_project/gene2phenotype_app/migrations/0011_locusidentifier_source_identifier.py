@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-19 10:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gene2phenotype_app', '0010_genedisease_cleaned_disease'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='locusidentifier',
+            index=models.Index(fields=['source', 'identifier'], name='locus_ident_source__0e4929_idx'),
+        ),
+    ]
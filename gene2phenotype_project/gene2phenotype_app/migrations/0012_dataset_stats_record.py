@@ -0,0 +1,26 @@
+# Generated by Django 5.1.5 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gene2phenotype_app', '0011_locusidentifier_source_identifier'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetStatsRecord',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('lgd_id', models.IntegerField()),
+                ('category', models.CharField(max_length=50)),
+                ('value', models.CharField(max_length=255)),
+            ],
+            options={
+                'db_table': 'dataset_stats_record',
+                'indexes': [models.Index(fields=['lgd_id'], name='dataset_sta_lgd_id_191a2f_idx'), models.Index(fields=['category', 'value'], name='dataset_sta_categor_a15097_idx')],
+            },
+        ),
+    ]
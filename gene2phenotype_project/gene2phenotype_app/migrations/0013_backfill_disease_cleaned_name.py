@@ -0,0 +1,30 @@
+from django.db import migrations
+
+from gene2phenotype_app.utils import clean_string
+
+
+# Populates the column 'cleaned_name' (added in 0009) of the existing diseases and synonyms
+# New diseases and synonyms get the cleaned name when they are saved
+CLEANED_NAME_SOURCES = (("Disease", "name"), ("DiseaseSynonym", "synonym"))
+
+
+def backfill_cleaned_name(apps, schema_editor):
+    for model_name, name_field in CLEANED_NAME_SOURCES:
+        model = apps.get_model("gene2phenotype_app", model_name)
+        objs = [
+            model(id=obj_id, cleaned_name=clean_string(str(name)))
+            for obj_id, name in model.objects.values_list("id", name_field).iterator()
+        ]
+        # bulk_update does not create history rows
+        model.objects.bulk_update(objs, ["cleaned_name"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gene2phenotype_app', '0012_dataset_stats_record'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_cleaned_name, migrations.RunPython.noop),
+    ]
@@ -68,8 +68,10 @@ class LocusGenotypeDisease(models.Model):
     confidence = models.ForeignKey("Attrib", related_name='confidence', on_delete=models.PROTECT) # confidence value
     confidence_support = models.TextField(null=True, default=None) # text summary to support the confidence value
     date_review = models.DateTimeField(null=True)
+    date_created = models.DateTimeField(null=True) # records migrated from the old db don't have this date
     is_reviewed = models.SmallIntegerField(null=False)
     is_deleted = models.SmallIntegerField(null=False, default=False)
+    version = models.IntegerField(null=False, default=1) # incremented every time the record is updated
     history = HistoricalRecords()
 
     class Meta:
@@ -80,7 +82,9 @@ class LocusGenotypeDisease(models.Model):
             models.Index(fields=['disease']),
             models.Index(fields=['confidence']),
             models.Index(fields=['is_deleted']),
-            models.Index(fields=['is_reviewed'])
+            models.Index(fields=['is_reviewed']),
+            models.Index(fields=['confidence', 'genotype', 'mechanism']),
+            models.Index(fields=['date_review'])
         ]
 
 class LGDMolecularMechanismSynopsis(models.Model):
@@ -304,9 +308,24 @@ class LGDPanel(models.Model):
         unique_together = ["lgd", "panel"]
         indexes = [
             models.Index(fields=['panel']),
-            models.Index(fields=['lgd', 'panel'])
+            models.Index(fields=['lgd', 'panel']),
+            models.Index(fields=['panel', 'is_deleted', 'lgd'])
         ]
 
+class LGDContributor(models.Model):
+    """
+        Users who worked on the LGD record (curators).
+        The table is updated every time a history row is created for the
+        record or for the record data (panels, phenotypes, publications, etc.).
+    """
+    id = models.AutoField(primary_key=True)
+    lgd = models.ForeignKey("LocusGenotypeDisease", on_delete=models.PROTECT)
+    user = models.ForeignKey("User", on_delete=models.PROTECT)
+
+    class Meta:
+        db_table = "lgd_contributor"
+        unique_together = ["lgd", "user"]
+
 class Meta(models.Model):
     """
         Meta table can be used to keep track of bulk updates.
@@ -322,6 +341,51 @@ class Meta(models.Model):
     class Meta:
         db_table = "meta"
 
+class DatasetStats(models.Model):
+    """
+        Rollup table with the global statistics of the G2P records.
+        The rows are refreshed after the records are updated.
+
+        Example:
+            category: 'confidence'
+            value: 'definitive'
+            count: 1500
+    """
+    id = models.AutoField(primary_key=True)
+    category = models.CharField(max_length=50, null=False)
+    value = models.CharField(max_length=255, null=False)
+    count = models.IntegerField(null=False, default=0)
+    date_update = models.DateTimeField(null=False)
+
+    class Meta:
+        db_table = "dataset_stats"
+        unique_together = ["category", "value"]
+
+class DatasetStatsRecord(models.Model):
+    """
+        Contribution of each public record to the rollup table (dataset_stats).
+        It is used to update the rollup incrementally: when a record changes
+        its old contribution is subtracted and the new one is added.
+        The 'gene' category stores the locus id, it is used to count the distinct genes.
+
+        Example:
+            lgd_id: 1
+            category: 'confidence'
+            value: 'definitive'
+    """
+    id = models.AutoField(primary_key=True)
+    # Not a foreign key: the contribution of a deleted record is needed to update the rollup
+    lgd_id = models.IntegerField(null=False)
+    category = models.CharField(max_length=50, null=False)
+    value = models.CharField(max_length=255, null=False)
+
+    class Meta:
+        db_table = "dataset_stats_record"
+        indexes = [
+            models.Index(fields=['lgd_id']),
+            models.Index(fields=['category', 'value'])
+        ]
+
 class Sequence(models.Model):
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=100, null=False)
@@ -358,7 +422,8 @@ class LocusIdentifier(models.Model):
     class Meta:
         db_table = "locus_identifier"
         indexes = [
-            models.Index(fields=['identifier'])
+            models.Index(fields=['identifier']),
+            models.Index(fields=['source', 'identifier'])
         ]
 
 class LocusAttrib(models.Model):
@@ -434,25 +499,29 @@ class OntologyTerm(models.Model):
 class Disease(models.Model):
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=255, unique=True, null=False)
+    cleaned_name = models.CharField(max_length=255, null=True) # name normalised with clean_string(), set on save
     history = HistoricalRecords()
 
     class Meta:
         db_table = "disease"
         indexes = [
-            models.Index(fields=['name'])
+            models.Index(fields=['name']),
+            models.Index(fields=['cleaned_name'])
         ]
 
 class DiseaseSynonym(models.Model):
     id = models.AutoField(primary_key=True)
     disease = models.ForeignKey("Disease", on_delete=models.PROTECT)
     synonym = models.CharField(max_length=255, null=False)
+    cleaned_name = models.CharField(max_length=255, null=True) # synonym normalised with clean_string(), set on save
     history = HistoricalRecords()
 
     class Meta:
         db_table = "disease_synonym"
         unique_together = ['disease', 'synonym']
         indexes = [
-            models.Index(fields=['synonym'])
+            models.Index(fields=['synonym']),
+            models.Index(fields=['cleaned_name'])
         ]
 
 class DiseaseOntologyTerm(models.Model):
@@ -685,6 +754,7 @@ class GeneDisease(models.Model):
     id = models.AutoField(primary_key=True)
     gene = models.ForeignKey("Locus", on_delete=models.PROTECT)
     disease = models.CharField(max_length=255, null=False)
+    cleaned_disease = models.CharField(max_length=255, null=True) # disease normalised with clean_omim_disease(), set on save
     identifier = models.CharField(max_length=50, null=False)
     source = models.ForeignKey("Source", on_delete=models.PROTECT)
 
@@ -693,7 +763,8 @@ class GeneDisease(models.Model):
         unique_together = ['gene', 'disease', 'source']
         indexes = [
             models.Index(fields=['gene']),
-            models.Index(fields=['disease'])
+            models.Index(fields=['disease']),
+            models.Index(fields=['gene', 'source'])
         ]
 
 
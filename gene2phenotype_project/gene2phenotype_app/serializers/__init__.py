@@ -25,4 +25,6 @@ from .locus_genotype_disease import (LocusGenotypeDiseaseSerializer, LGDCommentS
 
 from .stable_id import G2PStableIDSerializer
 
-from .curation import CurationDataSerializer
\ No newline at end of file
+from .curation import CurationDataSerializer
+
+from .stats import DatasetStatsSerializer
\ No newline at end of file
@@ -4,7 +4,7 @@ from django.db import transaction
 from collections import OrderedDict
 import copy
 
-from ..models import (CurationData, Disease, User, LocusGenotypeDisease,
+from ..models import (CurationData, Disease, LocusGenotypeDisease,
                       Locus, DiseaseOntologyTerm, CVMolecularMechanism,
                       Publication)
 
@@ -20,7 +20,7 @@ from .stable_id import G2PStableIDSerializer
 from .phenotype import LGDPhenotypeSerializer, LGDPhenotypeSummarySerializer
 from .publication import PublicationSerializer
 
-from ..utils import get_date_now
+from ..utils import get_date_now, auth_from_serializer_context
 
 class CurationDataSerializer(serializers.ModelSerializer):
     """
@@ -54,8 +54,7 @@ class CurationDataSerializer(serializers.ModelSerializer):
         data_copy = copy.deepcopy(data)
         data_dict = self.convert_to_dict(data_copy)
 
-        user_email = self.context.get('user')
-        user_obj = User.objects.get(email=user_email)
+        user_obj = auth_from_serializer_context(self.context).user
 
         if ("locus" not in data_dict["json_data"] or data_dict["json_data"]["locus"] == ""
             or data_dict["json_data"]["locus"] is None):
@@ -307,13 +306,12 @@ class CurationDataSerializer(serializers.ModelSerializer):
                 "message": f"Curation data with the session name '{session_name}' already exists. Please change the session name and try again."
             })
 
-        user_email = self.context.get('user')
-        try:
-            user_obj = User.objects.get(email=user_email)
-        except User.DoesNotExist:
+        auth_context = auth_from_serializer_context(self.context)
+        if not auth_context.is_authenticated:
             raise serializers.ValidationError({
-                "message": f"User '{user_email}' does not exist."
+                "message": f"User '{auth_context.user}' does not exist."
             })
+        user_obj = auth_context.user
 
         try:
             new_curation_data = CurationData.objects.create(
@@ -363,16 +361,13 @@ class CurationDataSerializer(serializers.ModelSerializer):
                 data: CurationData object to publish
         """
 
-        user = self.context.get('user')
         publications_list = []
 
         # Get user object
-        try:
-            user_obj = User.objects.get(email=user, is_active=1)
-
-        except User.DoesNotExist:
+        user_obj = auth_from_serializer_context(self.context).user
+        if not user_obj.is_active:
             raise serializers.ValidationError({
-                "message" : f"Invalid user '{user}'"
+                "message" : f"Invalid user '{user_obj}'"
             })
 
         ### Publications ###
@@ -504,7 +499,8 @@ class CurationDataSerializer(serializers.ModelSerializer):
                     "phenotypes": data.json_data["phenotypes"],
                     "variant_types": data.json_data["variant_types"],
                     "mechanism": mechanism_obj,
-                    "mechanism_support": mechanism_support_obj
+                    "mechanism_support": mechanism_support_obj,
+                    "date_created": get_date_now()
                 }
 
         lgd_obj = LocusGenotypeDiseaseSerializer(context={'user':user_obj}).create(lgd_data, disease_obj, publications_list)
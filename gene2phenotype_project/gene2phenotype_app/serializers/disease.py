@@ -6,7 +6,7 @@ from ..models import (Disease, DiseaseOntologyTerm, DiseaseSynonym,
                       Attrib, LocusGenotypeDisease, OntologyTerm,
                       Source, GeneDisease)
 
-from ..utils import (clean_string, get_ontology, get_ontology_source)
+from ..utils import (clean_string, get_ontology, get_ontology_source, disease_suggestion_index)
 
 
 class DiseaseOntologyTermSerializer(serializers.ModelSerializer):
@@ -107,7 +107,10 @@ class DiseaseSerializer(serializers.ModelSerializer):
         """
             Returns the ontology terms associated with the disease.
         """
-        disease_ontologies = DiseaseOntologyTerm.objects.filter(disease=id)
+        if hasattr(id, 'prefetched_ontology_terms'):
+            disease_ontologies = id.prefetched_ontology_terms
+        else:
+            disease_ontologies = DiseaseOntologyTerm.objects.filter(disease=id).select_related('ontology_term__source')
         return DiseaseOntologyTermSerializer(disease_ontologies, many=True).data
 
     def get_synonyms(self, id):
@@ -115,7 +118,10 @@ class DiseaseSerializer(serializers.ModelSerializer):
             Returns disease synonyms used in other sources.
         """
         synonyms = []
-        disease_synonyms = DiseaseSynonym.objects.filter(disease=id)
+        if hasattr(id, 'prefetched_synonyms'):
+            disease_synonyms = id.prefetched_synonyms
+        else:
+            disease_synonyms = DiseaseSynonym.objects.filter(disease=id)
         for d_synonym in disease_synonyms:
             synonyms.append(d_synonym.synonym)
         return synonyms
@@ -215,6 +221,15 @@ class CreateDiseaseSerializer(serializers.ModelSerializer):
     """
     ontology_terms = DiseaseOntologyTermSerializer(many=True, required=False)
 
+    # Similar diseases (see DiseaseSuggestionIndex) with this score or higher are near-duplicates
+    suggestion_score = 0.75
+    max_suggestions = 5
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Diseases similar to the new disease, set by create()
+        self.suggestions = []
+
     # Add synonyms
 
     def create(self, validated_data):
@@ -228,6 +243,9 @@ class CreateDiseaseSerializer(serializers.ModelSerializer):
             this method cleans the disease name and tries to find it in the db:
                 it checks if the disease name or the synonym name is already stored in G2P.
                 If so, returns existing disease.
+            If the name is not found, the disease is added. The diseases with a
+            similar name are kept in the attribute 'suggestions', they are only
+            advisory (possible duplicates) and do not prevent the creation.
 
             If applicable, it associates the ontology terms to the disease.
 
@@ -240,26 +258,28 @@ class CreateDiseaseSerializer(serializers.ModelSerializer):
         """
 
         disease_name = validated_data.get('name')
-        ontologies_list = validated_data.get('ontology_terms')
+        ontologies_list = validated_data.get('ontology_terms', [])
 
         disease_obj = None
 
         # Clean disease name
         cleaned_input_disease_name = clean_string(str(disease_name))
         # Check if name already exists
-        all_disease_names = Disease.objects.all()
-        for disease_db in all_disease_names:
-            cleaned_db_disease_name = clean_string(str(disease_db.name))
-            if cleaned_db_disease_name == cleaned_input_disease_name:
-                disease_obj = disease_db
-        all_disease_synonyms = DiseaseSynonym.objects.all()
-        for disease_synonym in all_disease_synonyms:
-            cleaned_db_disease_syn = clean_string(str(disease_synonym.synonym))
-            if cleaned_db_disease_syn == cleaned_input_disease_name:
-                disease_obj = disease_synonym.disease
+        # The cleaned names of the diseases and synonyms are stored in the column 'cleaned_name'
+        # A synonym match takes precedence over a disease name match
+        disease_synonym = DiseaseSynonym.objects.filter(
+            cleaned_name=cleaned_input_disease_name).select_related('disease').first()
+
+        if disease_synonym is not None:
+            disease_obj = disease_synonym.disease
+        else:
+            disease_obj = Disease.objects.filter(cleaned_name=cleaned_input_disease_name).first()
 
         if disease_obj is None:
-            # TODO: give disease suggestions
+            self.suggestions = [
+                suggestion for suggestion in disease_suggestion_index.suggest(disease_name, self.max_suggestions)
+                if suggestion['score'] >= self.suggestion_score
+            ]
 
             disease_obj = Disease.objects.create(
                 name = disease_name
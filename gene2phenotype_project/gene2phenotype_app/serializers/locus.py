@@ -3,9 +3,9 @@ from django.db.models import Q
 
 from ..models import (Locus, LocusIdentifier, LocusAttrib,
                       AttribType, UniprotAnnotation, GeneStats,
-                      LocusGenotypeDisease)
+                      LocusGenotypeDisease, GeneDisease)
 
-from ..utils import validate_gene
+from ..utils import validate_gene, clean_omim_disease
 
 """
     Locus represents a gene, variant or region.
@@ -29,7 +29,10 @@ class LocusSerializer(serializers.ModelSerializer):
             Locus IDs from external sources.
             It can be the HGNC ID for a gene.
         """
-        locus_ids = LocusIdentifier.objects.filter(locus=id)
+        if hasattr(id, 'prefetched_ids'):
+            locus_ids = id.prefetched_ids
+        else:
+            locus_ids = LocusIdentifier.objects.filter(locus=id).select_related('source')
         data = {}
         for id in locus_ids:
             data[id.source.name] = id.identifier
@@ -41,6 +44,10 @@ class LocusSerializer(serializers.ModelSerializer):
             Returns the locus synonyms.
             The locus synonym can be an old gene symbol.
         """
+        if hasattr(id, 'prefetched_synonyms'):
+            locus_attribs = [locus_attrib.value for locus_attrib in id.prefetched_synonyms]
+            return locus_attribs if locus_attribs else None
+
         attrib_type_obj = AttribType.objects.filter(code='gene_synonym')
         locus_attribs = LocusAttrib.objects.filter(
             locus=id,
@@ -60,6 +67,8 @@ class LocusGeneSerializer(LocusSerializer):
         It can also include:
          - summary of records associated with the locus (method records_summary)
          - gene product function from UniProt (method function)
+         - gene scores (method badonyi_score)
+         - external gene-disease associations (method diseases)
     """
 
     last_updated = serializers.SerializerMethodField()
@@ -160,7 +169,10 @@ class LocusGeneSerializer(LocusSerializer):
                     (dict) result_data: it includes the protein function description and the uniprot accession
         """
         result_data = {}
-        uniprot_annotation_objs = UniprotAnnotation.objects.filter(gene=self.id)
+        if hasattr(self, 'prefetched_uniprot_annotations'):
+            uniprot_annotation_objs = self.prefetched_uniprot_annotations
+        else:
+            uniprot_annotation_objs = UniprotAnnotation.objects.filter(gene=self.id)
 
         for function_obj in uniprot_annotation_objs:
             result_data['protein_function'] = function_obj.protein_function
@@ -182,7 +194,10 @@ class LocusGeneSerializer(LocusSerializer):
         """
 
         result_data = {}
-        badonyi_stats_objs = GeneStats.objects.filter(gene=self.id)
+        if hasattr(self, 'prefetched_gene_stats'):
+            badonyi_stats_objs = self.prefetched_gene_stats
+        else:
+            badonyi_stats_objs = GeneStats.objects.filter(gene=self.id).select_related('description_attrib')
 
         for badonyi_obj in badonyi_stats_objs:
             key = badonyi_obj.description_attrib.value
@@ -190,6 +205,32 @@ class LocusGeneSerializer(LocusSerializer):
 
         return result_data
 
+    def diseases(self):
+        """
+            Returns the external gene-disease associations (OMIM, Mondo, etc.).
+            The disease name is returned as it is stored and without the subtype
+            (column 'cleaned_disease', set when the association is saved).
+            In the future, we will import diseases from other sources (Mondo, GenCC).
+
+            Returns:
+                    (list) results: list of diseases
+        """
+        if hasattr(self, 'prefetched_gene_diseases'):
+            gene_disease_objs = self.prefetched_gene_diseases
+        else:
+            gene_disease_objs = GeneDisease.objects.filter(gene=self.id).select_related('source')
+
+        results = []
+        for gene_disease_obj in gene_disease_objs:
+            results.append({
+                'original_disease_name': gene_disease_obj.disease,
+                'disease_name': gene_disease_obj.cleaned_disease or clean_omim_disease(gene_disease_obj.disease),
+                'identifier': gene_disease_obj.identifier,
+                'source': gene_disease_obj.source.name
+            })
+
+        return results
+
 
     class Meta:
         model = Locus
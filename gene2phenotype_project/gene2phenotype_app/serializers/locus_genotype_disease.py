@@ -1,7 +1,6 @@
 from rest_framework import serializers
 from django.db import connection, IntegrityError
 from django.db.models import Prefetch
-import itertools
 
 from ..models import (Panel, Attrib,
                      LGDPanel, LocusGenotypeDisease, LGDVariantGenccConsequence,
@@ -10,7 +9,10 @@ from ..models import (Panel, Attrib,
                      LGDComment, LGDVariantTypeComment, User,
                      LGDMolecularMechanismEvidence, CVMolecularMechanism,
                      OntologyTerm, Publication, LGDPhenotypeSummary,
-                     LGDVariantTypeDescription, LGDMolecularMechanismSynopsis)
+                     LGDVariantTypeDescription, LGDMolecularMechanismSynopsis,
+                     LocusIdentifier, LocusAttrib, DiseaseOntologyTerm,
+                     DiseaseSynonym, PublicationComment, PublicationFamilies,
+                     LGDContributor)
 
 
 from .publication import LGDPublicationSerializer
@@ -18,7 +20,7 @@ from .locus import LocusSerializer
 from .disease import DiseaseSerializer
 from .panel import LGDPanelSerializer
 
-from ..utils import get_date_now
+from ..utils import get_date_now, auth_from_serializer_context
 
 class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
     """
@@ -46,6 +48,172 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
     curators = serializers.SerializerMethodField(allow_null=True)
     is_reviewed = serializers.IntegerField(allow_null=True, required=False)
 
+    def __init__(self, *args, **kwargs):
+        """
+            Optional argument 'fields': list of the fields to display (sparse fieldset).
+            The other fields are not calculated.
+        """
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+    @classmethod
+    def select_fields(cls, fields=None, exclude=None):
+        """
+            Returns the list of fields to display.
+
+            Args:
+                (list) fields: fields to include (default: all fields)
+                (list) exclude: fields to exclude
+
+            Returns:
+                (list) field names or None if all the fields are selected
+        """
+        if not fields and not exclude:
+            return None
+
+        all_fields = list(cls().fields)
+        invalid_fields = [name for name in (fields or []) + (exclude or []) if name not in all_fields]
+        if invalid_fields:
+            raise serializers.ValidationError({"message": f"Invalid fields: {', '.join(invalid_fields)}"})
+
+        return [name for name in all_fields if (not fields or name in fields) and name not in (exclude or [])]
+
+    @staticmethod
+    def prefetch_records(queryset, user, fields=None):
+        """
+            Loads all the data used by the serializer for the records in the queryset.
+            The related data is fetched with one query per table (Prefetch) for all
+            the records, the number of queries does not depend on the number of records.
+            The serializer reads the prefetched data (attributes 'prefetched_*').
+
+            Args:
+                (QuerySet) queryset: LocusGenotypeDisease queryset
+                (User) user: used to select public or all comments
+                (list) fields: only load the data of these fields (default: all fields)
+
+            Returns:
+                (QuerySet) queryset with the related data
+        """
+        is_authenticated = user is not None and user.is_authenticated
+
+        lgd_comments = LGDComment.objects.filter(is_deleted=0).select_related('user')
+        publication_comments = PublicationComment.objects.filter(is_deleted=0).select_related('user')
+        if not is_authenticated:
+            lgd_comments = lgd_comments.filter(is_public=1)
+            publication_comments = publication_comments.filter(is_public=1)
+
+        # Data loaded for each field of the serializer
+        field_prefetch = {
+            "locus": [
+                Prefetch('locus__locusidentifier_set',
+                         queryset=LocusIdentifier.objects.select_related('source'),
+                         to_attr='prefetched_ids'),
+                Prefetch('locus__locusattrib_set',
+                         queryset=LocusAttrib.objects.filter(attrib_type__code='gene_synonym', is_deleted=0),
+                         to_attr='prefetched_synonyms'),
+            ],
+            "disease": [
+                Prefetch('disease__diseaseontologyterm_set',
+                         queryset=DiseaseOntologyTerm.objects.select_related('ontology_term__source'),
+                         to_attr='prefetched_ontology_terms'),
+                Prefetch('disease__diseasesynonym_set',
+                         queryset=DiseaseSynonym.objects.all(),
+                         to_attr='prefetched_synonyms'),
+            ],
+            "variant_consequence": [
+                Prefetch('lgdvariantgenccconsequence_set',
+                         queryset=LGDVariantGenccConsequence.objects.filter(is_deleted=0).select_related(
+                             'variant_consequence', 'support'),
+                         to_attr='prefetched_variant_consequences'),
+            ],
+            "molecular_mechanism": [
+                Prefetch('lgdmolecularmechanismsynopsis_set',
+                         queryset=LGDMolecularMechanismSynopsis.objects.filter(is_deleted=0).select_related(
+                             'synopsis', 'synopsis_support'),
+                         to_attr='prefetched_mechanism_synopsis'),
+                Prefetch('lgdmolecularmechanismevidence_set',
+                         queryset=LGDMolecularMechanismEvidence.objects.filter(is_deleted=0).select_related(
+                             'evidence', 'publication'),
+                         to_attr='prefetched_mechanism_evidence'),
+            ],
+            "cross_cutting_modifier": [
+                Prefetch('lgdcrosscuttingmodifier_set',
+                         queryset=LGDCrossCuttingModifier.objects.filter(is_deleted=0).select_related('ccm'),
+                         to_attr='prefetched_ccm'),
+            ],
+            "publications": [
+                Prefetch('lgdpublication_set',
+                         queryset=LGDPublication.objects.filter(is_deleted=0).select_related('publication').prefetch_related(
+                             Prefetch('publication__publicationcomment_set',
+                                      queryset=publication_comments,
+                                      to_attr='prefetched_comments'),
+                             Prefetch('publication__publicationfamilies_set',
+                                      queryset=PublicationFamilies.objects.filter(is_deleted=0).select_related('consanguinity'),
+                                      to_attr='prefetched_families')),
+                         to_attr='prefetched_publications'),
+            ],
+            "phenotypes": [
+                Prefetch('lgdphenotype_set',
+                         queryset=LGDPhenotype.objects.filter(is_deleted=0).select_related('phenotype', 'publication'),
+                         to_attr='prefetched_phenotypes'),
+            ],
+            "phenotype_summary": [
+                Prefetch('lgdphenotypesummary_set',
+                         queryset=LGDPhenotypeSummary.objects.filter(is_deleted=0).select_related('publication'),
+                         to_attr='prefetched_phenotype_summary'),
+            ],
+            "variant_type": [
+                Prefetch('lgdvarianttype_set',
+                         queryset=LGDVariantType.objects.filter(is_deleted=0).select_related(
+                             'variant_type_ot', 'publication').prefetch_related(
+                                Prefetch('lgdvarianttypecomment_set',
+                                         queryset=LGDVariantTypeComment.objects.filter(is_deleted=0),
+                                         to_attr="current_comments")),
+                         to_attr='prefetched_variant_types'),
+            ],
+            "variant_description": [
+                Prefetch('lgdvarianttypedescription_set',
+                         queryset=LGDVariantTypeDescription.objects.filter(is_deleted=0).select_related('publication'),
+                         to_attr='prefetched_variant_descriptions'),
+            ],
+            "panels": [
+                Prefetch('lgdpanel_set',
+                         queryset=LGDPanel.objects.filter(is_deleted=0).select_related('panel'),
+                         to_attr='prefetched_panels'),
+            ],
+            "comments": [
+                Prefetch('lgdcomment_set',
+                         queryset=lgd_comments,
+                         to_attr='prefetched_comments'),
+            ],
+            "curators": [
+                Prefetch('lgdcontributor_set',
+                         queryset=LGDContributor.objects.select_related('user'),
+                         to_attr='prefetched_contributors'),
+            ],
+        }
+
+        prefetch_list = []
+        for field_name, field_prefetch_list in field_prefetch.items():
+            if fields is None or field_name in fields:
+                prefetch_list.extend(field_prefetch_list)
+
+        return queryset.select_related(
+            'stable_id', 'genotype', 'confidence', 'mechanism', 'mechanism_support',
+            'locus__sequence__reference', 'disease'
+        ).prefetch_related(*prefetch_list)
+
+    def get_related(self, lgd, attr, queryset):
+        """
+            Returns the data prefetched by prefetch_records() if available,
+            otherwise returns the queryset.
+        """
+        return getattr(lgd, attr) if hasattr(lgd, attr) else queryset
+
     def get_locus(self, id):
         """
             Locus linked to the LGD record.
@@ -75,7 +243,8 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
             Variant consequences linked to the LGD record.
             This is the GenCC level of variant consequence: altered_gene_product_level, etc.
         """
-        queryset = LGDVariantGenccConsequence.objects.filter(lgd_id=id, is_deleted=0)
+        queryset = self.get_related(id, 'prefetched_variant_consequences',
+                                    LGDVariantGenccConsequence.objects.filter(lgd_id=id, is_deleted=0))
         return LGDVariantGenCCConsequenceSerializer(queryset, many=True).data
 
     def get_molecular_mechanism(self, id):
@@ -88,8 +257,10 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
         mechanism_synopsis = []
         mechanism_evidence = {}
 
-        queryset_synopsis = LGDMolecularMechanismSynopsis.objects.filter(lgd_id=id, is_deleted=0).prefetch_related()
-        queryset_evidence = LGDMolecularMechanismEvidence.objects.filter(lgd_id=id, is_deleted=0).prefetch_related()
+        queryset_synopsis = self.get_related(id, 'prefetched_mechanism_synopsis',
+                                             LGDMolecularMechanismSynopsis.objects.filter(lgd_id=id, is_deleted=0))
+        queryset_evidence = self.get_related(id, 'prefetched_mechanism_evidence',
+                                             LGDMolecularMechanismEvidence.objects.filter(lgd_id=id, is_deleted=0))
 
         for synopsis_data in queryset_synopsis:
             mechanism_synopsis.append({
@@ -125,23 +296,26 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
         """
             Cross cutting modifier terms associated with the LGD record.
         """
-        queryset = LGDCrossCuttingModifier.objects.filter(lgd_id=id, is_deleted=0)
+        queryset = self.get_related(id, 'prefetched_ccm',
+                                    LGDCrossCuttingModifier.objects.filter(lgd_id=id, is_deleted=0))
         return LGDCrossCuttingModifierSerializer(queryset, many=True).data
 
     def get_publications(self, id):
         """
             Publications associated with the LGD record.
         """
-        queryset = LGDPublication.objects.filter(lgd_id=id, is_deleted=0)
+        queryset = self.get_related(id, 'prefetched_publications',
+                                    LGDPublication.objects.filter(lgd_id=id, is_deleted=0).select_related('publication'))
         # It is necessary to send the user to return public/private comments
-        return LGDPublicationSerializer(queryset, context={'user': self.context.get('user')}, many=True).data
+        return LGDPublicationSerializer(queryset, context={'auth_context': auth_from_serializer_context(self.context)}, many=True).data
 
     def get_phenotypes(self, id):
         """
             Phenotypes associated with the LGD record.
             The response includes the list of publications associated with the phenotype.
         """
-        queryset = LGDPhenotype.objects.filter(lgd_id=id, is_deleted=0).prefetch_related()
+        queryset = self.get_related(id, 'prefetched_phenotypes',
+                                    LGDPhenotype.objects.filter(lgd_id=id, is_deleted=0))
         data = {}
 
         for lgd_phenotype in queryset:
@@ -168,7 +342,8 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
         """
         # The LGD record is supposed to have one summary
         # but one summary can be linked to several publications
-        queryset = LGDPhenotypeSummary.objects.filter(lgd_id=id, is_deleted=0).prefetch_related()
+        queryset = self.get_related(id, 'prefetched_phenotype_summary',
+                                    LGDPhenotypeSummary.objects.filter(lgd_id=id, is_deleted=0))
         data = {}
 
         for summary_obj in queryset:
@@ -184,13 +359,13 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
             The variant type can be linked to several publications therefore response 
             includes the list of publications associated with the variant type.
         """
-        queryset = LGDVariantType.objects.filter(lgd_id=id, is_deleted=0).prefetch_related(
+        queryset = self.get_related(id, 'prefetched_variant_types', LGDVariantType.objects.filter(lgd_id=id, is_deleted=0).prefetch_related(
             Prefetch(
                 'lgdvarianttypecomment_set',
                 queryset=LGDVariantTypeComment.objects.filter(is_deleted=0), # skip deleted comments
                 to_attr="current_comments" # prefetched comments are saved under 'current_comments'
             )
-        )
+        ))
         data = {}
 
         for lgd_variant in queryset:
@@ -244,7 +419,8 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
             Variant HGVS description linked to the LGD record and publication(s).
             The response includes a list of publications associated with the HGVS description.
         """
-        queryset = LGDVariantTypeDescription.objects.filter(lgd_id=id, is_deleted=0).prefetch_related()
+        queryset = self.get_related(id, 'prefetched_variant_descriptions',
+                                    LGDVariantTypeDescription.objects.filter(lgd_id=id, is_deleted=0))
         data = {}
 
         for lgd_variant in queryset:
@@ -265,7 +441,8 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
         """
             Panel(s) associated with the LGD record.
         """
-        queryset = LGDPanel.objects.filter(lgd_id=id, is_deleted=0)
+        queryset = self.get_related(id, 'prefetched_panels',
+                                    LGDPanel.objects.filter(lgd_id=id, is_deleted=0))
         return LGDPanelSerializer(queryset, many=True).data
 
     def get_comments(self, id):
@@ -275,19 +452,18 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
             seen by curators.
         """
         # Check if user is authenticated
-        user = self.context.get("user")
-        try:
-            User.objects.get(email=user)
+        if auth_from_serializer_context(self.context).is_authenticated:
             authenticated_user = 1
-        except User.DoesNotExist:
+        else:
             authenticated_user = 0
 
         # If user is authenticated return all comments
         # otherwise return only the public comments
         if authenticated_user == 1:
-            lgd_comments = LGDComment.objects.filter(lgd_id=id, is_deleted=0).prefetch_related()
+            lgd_comments = LGDComment.objects.filter(lgd_id=id, is_deleted=0).select_related('user')
         else:
-            lgd_comments = LGDComment.objects.filter(lgd_id=id, is_deleted=0, is_public=1).prefetch_related()
+            lgd_comments = LGDComment.objects.filter(lgd_id=id, is_deleted=0, is_public=1)
+        lgd_comments = self.get_related(id, 'prefetched_comments', lgd_comments)
 
         data = []
         for comment in lgd_comments:
@@ -311,61 +487,29 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
     def get_date_created(self, id):
         """
             Date the LGD record was created.
-            Dependency: this method depends on the history table.
-            
+            The date is set when the record is published.
+
             Note: entries that were migrated from the old db don't have the date when they were created.
         """
-        date = None
-        lgd_obj = self.instance
-        insertion_history_type = '+'
-        history_records = lgd_obj.history.all().order_by('history_date').filter(
-            history_type=insertion_history_type)
-
-        if history_records:
-            date = history_records.first().history_date.date()
+        if id.date_created is not None:
+            return id.date_created.date()
 
-        return date
+        return None
 
     def get_curators(self, id):
         """
             List of curators who worked on the LGD record.
-            Dependency: this method depends on the history table.
+            Dependency: this method depends on the table 'lgd_contributor'
+            which is populated from the history tables.
 
             Note: entries that were migrated from the old db have limited info details.
         """
         list_curators = set()
-        lgd_obj = self.instance
-        # Check LGD record history
-        history_records = lgd_obj.history.all().values('history_user__first_name', 'history_user__last_name')
-        # Check LGD cross cutting modifier history
-        history_records_ccm = LGDCrossCuttingModifier.history.filter(id=lgd_obj.id).values(
-                                    'history_user__first_name', 'history_user__last_name')
-        # Check LGD panel history
-        history_records_lgdpanel = LGDPanel.history.filter(id=lgd_obj.id).values(
-                                    'history_user__first_name', 'history_user__last_name')
-        # Check LGD phenotype history
-        history_records_lgdpheno = LGDPhenotype.history.filter(id=lgd_obj.id).values(
-                                    'history_user__first_name', 'history_user__last_name')
-        # Check LGD publication history
-        history_records_lgdpublication = LGDPublication.history.filter(id=lgd_obj.id).values(
-                                    'history_user__first_name', 'history_user__last_name')
-        # Check LGD variation GenCC consequence history
-        history_records_lgdvarcons = LGDVariantGenccConsequence.history.filter(id=lgd_obj.id).values(
-                                    'history_user__first_name', 'history_user__last_name')
-        # Check LGD variation type history
-        history_records_lgdvartype = LGDVariantType.history.filter(id=lgd_obj.id).values(
-                                    'history_user__first_name', 'history_user__last_name')
-        # Check LGD variation type description history
-        history_records_lgdvartype_desc = LGDVariantTypeDescription.history.filter(id=lgd_obj.id).values(
-                                    'history_user__first_name', 'history_user__last_name')
-
-        for record in itertools.chain(history_records, history_records_ccm, history_records_lgdpanel, 
-                                      history_records_lgdpheno, history_records_lgdpublication,
-                                      history_records_lgdvarcons, history_records_lgdvartype,
-                                      history_records_lgdvartype_desc):
-            first_name = record.get('history_user__first_name')
-            last_name = record.get('history_user__last_name')
-            list_curators.add(f"{first_name} {last_name}")
+        contributors = self.get_related(id, 'prefetched_contributors',
+                                        LGDContributor.objects.filter(lgd=id).select_related('user'))
+
+        for contributor in contributors:
+            list_curators.add(f"{contributor.user.first_name} {contributor.user.last_name}")
 
         return list_curators
 
@@ -400,6 +544,9 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
                             - panel(s)
                             - confidence
                             - publications
+
+            Optional data:
+                            - date_created (default: now)
         """
         locus_name = data.get('locus') # Usually this is the gene symbol
         stable_id_obj = data.get('stable_id') # stable id obj
@@ -454,7 +601,8 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
                 confidence = confidence_obj,
                 is_reviewed = 1,
                 is_deleted = 0,
-                date_review = get_date_now()
+                date_review = get_date_now(),
+                date_created = data.get('date_created') or get_date_now()
             )
 
             # Insert panels
@@ -740,7 +888,7 @@ class LocusGenotypeDiseaseSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = LocusGenotypeDisease
-        exclude = ['id', 'is_deleted', 'date_review', 'mechanism', 'mechanism_support', 'confidence_support']
+        exclude = ['id', 'is_deleted', 'date_review', 'mechanism', 'mechanism_support', 'confidence_support', 'version']
 
 class LGDCommentSerializer(serializers.ModelSerializer):
     """
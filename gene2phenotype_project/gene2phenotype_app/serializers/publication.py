@@ -1,10 +1,12 @@
 from rest_framework import serializers
+from django.db.models import Manager
+from collections import defaultdict
 
 from ..models import (Publication, PublicationComment,
                       PublicationFamilies, Attrib, LGDPublication)
 from ..utils import (get_publication, get_authors)
 
-from ..utils import get_date_now
+from ..utils import get_date_now, auth_from_serializer_context
 
 class PublicationCommentSerializer(serializers.ModelSerializer):
     """
@@ -148,10 +150,14 @@ class PublicationSerializer(serializers.ModelSerializer):
                     (list) comments: list of comments
         """
 
-        user = self.context.get('user')
+        auth_context = auth_from_serializer_context(self.context)
+
+        # Comments prefetched by LocusGenotypeDiseaseSerializer.prefetch_records()
+        if hasattr(id, 'prefetched_comments'):
+            queryset = id.prefetched_comments
 
         # Authenticated users can view all types of comments
-        if user and user.is_authenticated:
+        elif auth_context.is_authenticated:
             queryset = PublicationComment.objects.filter(
                 publication_id=id.id, is_deleted=0).prefetch_related('user')
 
@@ -180,7 +186,10 @@ class PublicationSerializer(serializers.ModelSerializer):
                     (list) families: list of families
         """
 
-        queryset = PublicationFamilies.objects.filter(publication_id=id.id, is_deleted=0).prefetch_related('consanguinity')
+        if hasattr(id, 'prefetched_families'):
+            queryset = id.prefetched_families
+        else:
+            queryset = PublicationFamilies.objects.filter(publication_id=id.id, is_deleted=0).select_related('consanguinity')
         data = []
 
         for publication_family in queryset:
@@ -283,6 +292,49 @@ class PublicationSerializer(serializers.ModelSerializer):
         fields = ['pmid', 'title', 'authors', 'year', 'comments', 'families']
 
 ### G2P record (LGD) - publication ###
+class LGDPublicationDisplayListSerializer(serializers.ListSerializer):
+    """
+        List serializer used to display the publications of a record.
+        The comments and families of all the publications are loaded
+        in two queries instead of two queries per publication.
+        Called by: LGDPublicationSerializer(many=True)
+    """
+
+    def to_representation(self, data):
+        if isinstance(data, Manager):
+            data = data.all()
+        lgd_publications = list(data)
+
+        publications = [
+            lgd_publication.publication for lgd_publication in lgd_publications
+            if not hasattr(lgd_publication.publication, 'prefetched_comments')
+        ]
+
+        if publications:
+            publication_ids = {publication.id for publication in publications}
+            comments = PublicationComment.objects.filter(
+                publication_id__in=publication_ids, is_deleted=0).select_related('user')
+            # Anonymous users can only view public comments
+            if not auth_from_serializer_context(self.context).is_authenticated:
+                comments = comments.filter(is_public=1)
+
+            families = PublicationFamilies.objects.filter(
+                publication_id__in=publication_ids, is_deleted=0).select_related('consanguinity')
+
+            comments_by_publication = defaultdict(list)
+            for comment in comments:
+                comments_by_publication[comment.publication_id].append(comment)
+
+            families_by_publication = defaultdict(list)
+            for family in families:
+                families_by_publication[family.publication_id].append(family)
+
+            for publication in publications:
+                publication.prefetched_comments = comments_by_publication[publication.id]
+                publication.prefetched_families = families_by_publication[publication.id]
+
+        return super().to_representation(lgd_publications)
+
 class LGDPublicationSerializer(serializers.ModelSerializer):
     """
         Serializer for the LGDPublication model.
@@ -397,6 +449,7 @@ class LGDPublicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = LGDPublication
         fields = ['publication', 'comment', 'families']
+        list_serializer_class = LGDPublicationDisplayListSerializer
 
 class LGDPublicationListSerializer(serializers.Serializer):
     """
@@ -0,0 +1,40 @@
+from rest_framework import serializers
+
+from ..models import DatasetStats
+
+
+class DatasetStatsSerializer(serializers.ModelSerializer):
+    """
+        Serializer for the DatasetStats model.
+        The stats are calculated for the public records: reviewed records
+        linked to at least one visible panel.
+        The rollup is created by the command refresh_dataset_stats and updated
+        incrementally after the records are updated (see utils/stats_utils.py).
+    """
+
+    def stats(self, queryset):
+        """
+            Returns the stats from the rollup rows.
+        """
+        stats = {
+            'total_records': 0,
+            'total_genes': 0,
+            'by_confidence': {},
+            'by_mechanism': {},
+            'by_genotype': {},
+            'by_variant_consequence': {},
+            'last_updated': None
+        }
+
+        for row in queryset:
+            if row.category == 'total':
+                stats[f"total_{row.value}"] = row.count
+            else:
+                stats[f"by_{row.category}"][row.value] = row.count
+            stats['last_updated'] = row.date_update.date()
+
+        return stats
+
+    class Meta:
+        model = DatasetStats
+        fields = ['category', 'value', 'count']
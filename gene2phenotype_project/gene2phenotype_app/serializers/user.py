@@ -9,7 +9,7 @@ from rest_framework_simplejwt.tokens import RefreshToken, TokenError
 from rest_framework.validators import UniqueValidator
 from django.contrib.auth.models import update_last_login
 
-from ..utils import CustomMail
+from ..utils import CustomMail, auth_from_serializer_context
 from ..models import User, UserPanel, Panel
 
 
@@ -31,11 +31,10 @@ class UserSerializer(serializers.ModelSerializer):
             If the first and last name are not available then
             splits the username.
         """
-        user = User.objects.filter(email=obj).first()
-        if user.first_name is not None and user.last_name is not None:
-            name = f"{user.first_name} {user.last_name}"
+        if obj.first_name is not None and obj.last_name is not None:
+            name = f"{obj.first_name} {obj.last_name}"
         else:
-            user_name = user.username.split('_')
+            user_name = obj.username.split('_')
             name = ' '.join(user_name).title()
 
         return name
@@ -48,8 +47,7 @@ class UserSerializer(serializers.ModelSerializer):
             Output example: ["Developmental disorders", "Ear disorders"]
         """
 
-        user_login = self.context.get('user')
-        if user_login and user_login.is_authenticated:
+        if auth_from_serializer_context(self.context).is_authenticated:
             user_panels = UserPanel.objects.filter(
                 user=id, is_deleted=0
                 ).select_related('panel'
@@ -62,55 +60,6 @@ class UserSerializer(serializers.ModelSerializer):
 
         return user_panels
 
-    def panels_names(self, id):
-        """
-            Get a list of panels the user has permission to edit.
-            It returns the panel names i.e. short name.
-
-            Output example: ["DD", "Ear"]
-        """
-
-        user_login = self.context.get('user')
-        if user_login and user_login.is_authenticated:
-            user_panels = UserPanel.objects.filter(
-                user=id, is_deleted=0
-                ).select_related('panel'
-                                 ).values_list('panel__name', flat=True)
-        else:
-            user_panels = UserPanel.objects.filter(
-                user=id, is_deleted=0, panel__is_visible=1
-                ).select_related('panel'
-                                 ).values_list('panel__name', flat=True)
-
-        return user_panels
-
-    def check_panel_permission(self, panels):
-        """
-            Check if user has permission to edit the inputted panels.
-
-            Args:
-                panels: a list of panels
-
-            Returns:
-                True if user has permission to edit all panels from the list
-                False if user does not have permission to edit at least one panel
-        """
-        user_login = self.context.get('user')
-
-        if user_login and user_login.is_authenticated:
-            for panel in panels:
-                panel_name = panel.get("name")
-                try:
-                    user_panel_obj = UserPanel.objects.get(
-                        user = user_login.id,
-                        panel__name = panel_name,
-                        is_deleted = 0
-                    )
-                except UserPanel.DoesNotExist:
-                    return False
-
-        return True
-    
     class Meta:
         model = User
         fields = ['user_name', 'email', 'is_active', 'panels', 'is_superuser', 'is_staff']
@@ -0,0 +1,88 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from simple_history.signals import post_create_historical_record
+
+from .models import (LocusGenotypeDisease, LGDPanel, LGDVariantGenccConsequence, Panel, Locus, Disease,
+                     LocusAttrib, LocusIdentifier, DiseaseSynonym, DiseaseOntologyTerm, GeneDisease)
+from .utils import clean_string, clean_omim_disease, disease_suggestion_index, disease_resolver, panel_index, gene_index, region_index, bump_record_version, get_contributor_models, add_contributors, schedule_stats_update
+
+
+@receiver([post_save, post_delete], sender=LGDPanel)
+@receiver([post_save, post_delete], sender=LocusGenotypeDisease)
+def update_panel_index(sender, **kwargs):
+    panel_index.invalidate()
+
+@receiver([post_save, post_delete], sender=Locus)
+@receiver([post_save, post_delete], sender=LocusAttrib)
+@receiver([post_save, post_delete], sender=LocusIdentifier)
+def update_gene_index(sender, **kwargs):
+    gene_index.invalidate()
+
+@receiver([post_save, post_delete], sender=Locus)
+def update_region_index(sender, **kwargs):
+    region_index.invalidate()
+
+@receiver([post_save, post_delete], sender=LocusGenotypeDisease)
+@receiver([post_save, post_delete], sender=LGDPanel)
+@receiver([post_save, post_delete], sender=LGDVariantGenccConsequence)
+@receiver([post_save, post_delete], sender=Panel)
+def update_dataset_stats(sender, instance, **kwargs):
+    if sender is LocusGenotypeDisease:
+        lgd_ids = [instance.id]
+    elif sender is Panel:
+        # The panel visibility changes the public records
+        lgd_ids = LGDPanel.objects.filter(panel=instance).values_list('lgd_id', flat=True)
+    else:
+        lgd_ids = [instance.lgd_id]
+
+    schedule_stats_update(lgd_ids)
+
+@receiver(post_save, sender=Panel)
+def update_panel_records_version(sender, instance, raw=False, **kwargs):
+    # The panel data is part of the record data
+    if not raw:
+        bump_record_version(LocusGenotypeDisease.objects.filter(lgdpanel__panel=instance))
+
+@receiver(post_save, sender=Locus)
+def update_locus_records_version(sender, instance, raw=False, **kwargs):
+    # The gene data is part of the record data
+    if not raw:
+        bump_record_version(LocusGenotypeDisease.objects.filter(locus=instance))
+
+@receiver(post_save, sender=Disease)
+def update_disease_records_version(sender, instance, raw=False, **kwargs):
+    # The disease data is part of the record data
+    if not raw:
+        bump_record_version(LocusGenotypeDisease.objects.filter(disease=instance))
+
+@receiver(pre_save, sender=Disease)
+def set_disease_cleaned_name(sender, instance, **kwargs):
+    # The cleaned name is used to find duplicated diseases
+    instance.cleaned_name = clean_string(str(instance.name))
+
+@receiver(pre_save, sender=DiseaseSynonym)
+def set_disease_synonym_cleaned_name(sender, instance, **kwargs):
+    instance.cleaned_name = clean_string(str(instance.synonym))
+
+@receiver(pre_save, sender=GeneDisease)
+def set_gene_disease_cleaned_disease(sender, instance, **kwargs):
+    # The disease name without the subtype is displayed in the gene page
+    instance.cleaned_disease = clean_omim_disease(str(instance.disease))
+
+@receiver([post_save, post_delete], sender=Disease)
+@receiver([post_save, post_delete], sender=DiseaseSynonym)
+def update_disease_suggestion_index(sender, **kwargs):
+    disease_suggestion_index.invalidate()
+
+@receiver([post_save, post_delete], sender=Disease)
+@receiver([post_save, post_delete], sender=DiseaseSynonym)
+@receiver([post_save, post_delete], sender=DiseaseOntologyTerm)
+def update_disease_resolver(sender, **kwargs):
+    disease_resolver.invalidate()
+
+@receiver(post_create_historical_record)
+def update_lgd_contributors(sender, instance, history_user, **kwargs):
+    # The users who change the record (or the record data) are the record curators
+    lgd_field = get_contributor_models().get(type(instance))
+    if lgd_field is not None and history_user is not None:
+        add_contributors([(getattr(instance, lgd_field), history_user.id)])
@@ -0,0 +1,61 @@
+from django.test import TestCase
+from django.core.management import call_command
+from io import StringIO
+import gzip
+import os
+import tempfile
+
+VCF_HEADER = [
+    "##fileformat=VCFv4.2\n",
+    "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n",
+]
+
+VCF_VARIANTS = [
+    "12\t88049000\t.\tA\tG\t.\tPASS\t.\n",
+    "12\t88049010\t.\tAGGGGGGG\tA\t.\tPASS\tDP=10\n",
+    "chr12\t88100000\t.\tC\tT\t.\tPASS\t.\n",
+    "12\t88142100\t.\tC\tT\t.\tPASS\t.\n",
+    "15\t100\t.\tC\tT\t.\tPASS\t.\n",
+]
+
+class AnnotateVCFCommand(TestCase):
+    """
+        Test the command that annotates a VCF file with the G2P records
+    """
+    fixtures = ["gene2phenotype_app/fixtures/attribs.json", "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+                "gene2phenotype_app/fixtures/disease.json", "gene2phenotype_app/fixtures/g2p_stable_id.json",
+                "gene2phenotype_app/fixtures/lgd_panel.json", "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+                "gene2phenotype_app/fixtures/locus.json", "gene2phenotype_app/fixtures/sequence.json",
+                "gene2phenotype_app/fixtures/user_panels.json", "gene2phenotype_app/fixtures/ontology_term.json",
+                "gene2phenotype_app/fixtures/source.json"]
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_file = os.path.join(self.tmp_dir.name, "input.vcf.gz")
+
+        with gzip.open(self.input_file, "wt") as f:
+            f.writelines(VCF_HEADER + VCF_VARIANTS)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_annotate_vcf(self):
+        out = StringIO()
+        call_command("annotate_vcf", self.input_file, stdout=out)
+        lines = out.getvalue().splitlines()
+
+        self.assertTrue(lines[1].startswith("##INFO=<ID=G2P"))
+        self.assertEqual(lines[2], VCF_HEADER[1].rstrip("\n"))
+
+        annotation = "G2P=CEP290|G2P00001|biallelic_autosomal|definitive"
+        info = [line.split("\t")[7] for line in lines[3:]]
+        self.assertEqual(info, [".", f"DP=10;{annotation}", annotation, ".", "."])
+
+    def test_annotate_vcf_gzip_output(self):
+        output_file = os.path.join(self.tmp_dir.name, "output.vcf.gz")
+        call_command("annotate_vcf", self.input_file, "--output", output_file)
+
+        with gzip.open(output_file, "rt") as f:
+            lines = f.readlines()
+
+        self.assertEqual(len(lines), len(VCF_HEADER) + len(VCF_VARIANTS) + 1)
@@ -0,0 +1,37 @@
+from django.test import TestCase
+from django.core.management import call_command
+from django.apps import apps
+from io import StringIO
+import importlib
+from gene2phenotype_app.models import Disease, DiseaseSynonym
+
+class BackfillDiseaseCleanedNameCommand(TestCase):
+    """
+        Test the command that populates the cleaned name of the diseases
+    """
+    fixtures = ["gene2phenotype_app/fixtures/attribs.json", "gene2phenotype_app/fixtures/disease.json",
+                "gene2phenotype_app/fixtures/ontology_term.json", "gene2phenotype_app/fixtures/source.json"]
+
+    def test_backfill(self):
+        disease = Disease.objects.first()
+        Disease.objects.filter(id=disease.id).update(cleaned_name=None)
+
+        call_command("backfill_disease_cleaned_name", stdout=StringIO())
+
+        disease.refresh_from_db()
+        self.assertIsNotNone(disease.cleaned_name)
+        self.assertFalse(Disease.objects.filter(cleaned_name__isnull=True).exists())
+
+    def test_migration(self):
+        """
+            Test the data migration populates the cleaned names
+        """
+        migration = importlib.import_module("gene2phenotype_app.migrations.0013_backfill_disease_cleaned_name")
+        Disease.objects.update(cleaned_name=None)
+        DiseaseSynonym.objects.update(cleaned_name=None)
+
+        migration.backfill_cleaned_name(apps, None)
+
+        self.assertFalse(Disease.objects.filter(cleaned_name__isnull=True).exists())
+        self.assertFalse(DiseaseSynonym.objects.filter(cleaned_name__isnull=True).exists())
+        self.assertEqual(Disease.objects.get(id=5).cleaned_name, "2 griscelli")
@@ -0,0 +1,32 @@
+from django.test import TestCase
+from django.core.management import call_command
+from django.urls import reverse
+from io import StringIO
+from gene2phenotype_app.models import GeneDisease
+
+class BackfillGeneDiseaseCleanedNameCommand(TestCase):
+    """
+        Test the command that populates the cleaned disease of the gene-disease associations
+    """
+    fixtures = ["gene2phenotype_app/fixtures/attribs.json", "gene2phenotype_app/fixtures/locus.json",
+                "gene2phenotype_app/fixtures/sequence.json", "gene2phenotype_app/fixtures/source.json"]
+
+    def test_backfill(self):
+        # bulk_create does not send the pre_save signal
+        GeneDisease.objects.bulk_create([
+            GeneDisease(gene_id=1, disease="JOUBERT SYNDROME 5; JBTS5", identifier="610188", source_id=4)
+        ])
+        self.assertTrue(GeneDisease.objects.filter(cleaned_disease__isnull=True).exists())
+
+        call_command("backfill_gene_disease_cleaned_name", stdout=StringIO())
+
+        self.assertEqual(GeneDisease.objects.get(identifier="610188").cleaned_disease, "joubert syndrome")
+
+        response = self.client.get(reverse("locus_gene_disease", kwargs={"name": "CEP290"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["disease_name"], "joubert syndrome")
+
+    def test_save(self):
+        gene_disease = GeneDisease.objects.create(gene_id=2, disease="GRISCELLI SYNDROME, TYPE 2; GS2",
+                                                  identifier="607624", source_id=4)
+        self.assertEqual(gene_disease.cleaned_disease, "griscelli syndrome")
@@ -0,0 +1,31 @@
+from django.test import TestCase
+from django.core.management import call_command
+from io import StringIO
+from gene2phenotype_app.models import User, LocusGenotypeDisease, LGDContributor
+
+class BackfillLGDContributorsCommand(TestCase):
+    """
+        Test the command that populates the curators of the records from the history tables
+    """
+    fixtures = ["gene2phenotype_app/fixtures/attribs.json", "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+                "gene2phenotype_app/fixtures/disease.json", "gene2phenotype_app/fixtures/g2p_stable_id.json",
+                "gene2phenotype_app/fixtures/locus_genotype_disease.json", "gene2phenotype_app/fixtures/locus.json",
+                "gene2phenotype_app/fixtures/sequence.json", "gene2phenotype_app/fixtures/user_panels.json",
+                "gene2phenotype_app/fixtures/ontology_term.json", "gene2phenotype_app/fixtures/source.json"]
+
+    def test_backfill(self):
+        user = User.objects.get(email="user5@test.ac.uk")
+        lgd = LocusGenotypeDisease.objects.get(stable_id__stable_id="G2P00001")
+        lgd._history_user = user
+        lgd.save()
+        # Records without user are ignored
+        lgd._history_user = None
+        lgd.save()
+
+        LGDContributor.objects.all().delete()
+
+        call_command("backfill_lgd_contributors", stdout=StringIO())
+        # Running the command again does not create duplicates
+        call_command("backfill_lgd_contributors", stdout=StringIO())
+
+        self.assertEqual(list(LGDContributor.objects.values_list("lgd_id", "user_id")), [(lgd.id, user.id)])
@@ -0,0 +1,29 @@
+from django.test import TestCase
+from django.core.management import call_command
+from io import StringIO
+from gene2phenotype_app.models import LocusGenotypeDisease
+
+class BackfillLGDDateCreatedCommand(TestCase):
+    """
+        Test the command that populates the creation date of the records from the history table
+    """
+    fixtures = ["gene2phenotype_app/fixtures/attribs.json", "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+                "gene2phenotype_app/fixtures/disease.json", "gene2phenotype_app/fixtures/g2p_stable_id.json",
+                "gene2phenotype_app/fixtures/locus_genotype_disease.json", "gene2phenotype_app/fixtures/locus.json",
+                "gene2phenotype_app/fixtures/sequence.json", "gene2phenotype_app/fixtures/user_panels.json",
+                "gene2phenotype_app/fixtures/ontology_term.json", "gene2phenotype_app/fixtures/source.json"]
+
+    def test_backfill(self):
+        lgd = LocusGenotypeDisease.objects.get(stable_id__stable_id="G2P00001")
+        self.assertIsNone(lgd.date_created)
+
+        # Simulate the insertion of the record
+        lgd.save()
+        history_insert = lgd.history.first()
+        history_insert.history_type = '+'
+        history_insert.save()
+
+        call_command("backfill_lgd_date_created", stdout=StringIO())
+
+        lgd.refresh_from_db()
+        self.assertEqual(lgd.date_created, history_insert.history_date)
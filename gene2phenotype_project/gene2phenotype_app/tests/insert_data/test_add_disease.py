@@ -0,0 +1,72 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.conf import settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from gene2phenotype_app.models import Disease, DiseaseSynonym, User
+from gene2phenotype_app.serializers import CreateDiseaseSerializer
+
+class CreateDiseaseDuplicates(TestCase):
+    """
+        Test the disease creation finds diseases already stored with a similar name
+    """
+    fixtures = ["gene2phenotype_app/fixtures/attribs.json", "gene2phenotype_app/fixtures/disease.json",
+                "gene2phenotype_app/fixtures/ontology_term.json", "gene2phenotype_app/fixtures/source.json"]
+
+    def test_existing_disease(self):
+        disease = CreateDiseaseSerializer().create({"name": "griscelli type II", "ontology_terms": []})
+        self.assertEqual(disease.id, 5)
+        self.assertEqual(Disease.objects.count(), 9)
+
+    def test_existing_synonym(self):
+        """
+            Test a synonym match takes precedence over a disease name match
+        """
+        DiseaseSynonym.objects.create(disease_id=1, synonym="Griscelli type 2")
+
+        disease = CreateDiseaseSerializer().create({"name": "griscelli type II", "ontology_terms": []})
+        self.assertEqual(disease.id, 1)
+
+    def test_new_disease(self):
+        disease = CreateDiseaseSerializer().create({"name": "Griscelli type 3", "ontology_terms": []})
+        self.assertEqual(disease.cleaned_name, "3 griscelli")
+        self.assertEqual(Disease.objects.count(), 10)
+
+    def test_similar_disease(self):
+        """
+            Test a disease similar to an existing disease is added,
+            the similar disease is returned as a suggestion
+        """
+        serializer = CreateDiseaseSerializer()
+        disease = serializer.create({"name": "griscelli syndrome type 2", "ontology_terms": []})
+
+        self.assertEqual(disease.name, "griscelli syndrome type 2")
+        self.assertEqual([suggestion["id"] for suggestion in serializer.suggestions], [5])
+        self.assertEqual(Disease.objects.count(), 10)
+
+class AddDiseaseEndpoint(TestCase):
+    """
+        Test endpoint to add a disease
+    """
+    fixtures = ["gene2phenotype_app/fixtures/attribs.json", "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+                "gene2phenotype_app/fixtures/disease.json", "gene2phenotype_app/fixtures/g2p_stable_id.json",
+                "gene2phenotype_app/fixtures/lgd_panel.json", "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+                "gene2phenotype_app/fixtures/locus.json", "gene2phenotype_app/fixtures/sequence.json",
+                "gene2phenotype_app/fixtures/user_panels.json", "gene2phenotype_app/fixtures/ontology_term.json",
+                "gene2phenotype_app/fixtures/source.json"]
+
+    def setUp(self):
+        user = User.objects.get(email="user5@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        self.client.cookies[settings.SIMPLE_JWT['AUTH_COOKIE']] = str(refresh.access_token)
+
+    def test_add_similar_disease(self):
+        """
+            Test the disease is added and the similar diseases are returned
+        """
+        response = self.client.post(reverse("add_disease"), {"name": "griscelli syndrome type 2"},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["name"], "griscelli syndrome type 2")
+        self.assertEqual(response.data["suggestions"][0]["id"], 5)
+        self.assertIsInstance(response.data["suggestions"][0]["score"], float)
+        self.assertEqual(Disease.objects.count(), 10)
@@ -1,8 +1,12 @@
 from django.test import TestCase
 from django.urls import reverse
 from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
 from rest_framework_simplejwt.tokens import RefreshToken
-from gene2phenotype_app.models import User, LGDPublication
+from gene2phenotype_app.models import (User, LGDPublication, LGDContributor,
+                                       PublicationComment, PublicationFamilies)
+from gene2phenotype_app.serializers import LGDPublicationSerializer
+from gene2phenotype_app.utils import get_date_now, AuthContext
 
 class LGDEditPublicationsEndpoint(TestCase):
     """
@@ -51,3 +55,55 @@ class LGDEditPublicationsEndpoint(TestCase):
 
         lgd_publications = LGDPublication.objects.filter(lgd__stable_id__stable_id="G2P00001")
         self.assertEqual(len(lgd_publications), 2)
+
+        # The user is now one of the record curators
+        self.assertTrue(LGDContributor.objects.filter(lgd__stable_id__stable_id="G2P00001", user=user).exists())
+
+        response = self.client.get(reverse("lgd", kwargs={"stable_id": "G2P00001"}))
+        self.assertEqual(response.data["curators"], {"Test User5"})
+
+
+class LGDPublicationDisplayTests(TestCase):
+    """
+        Test the display of the publications linked to a LGD record
+    """
+    fixtures = LGDEditPublicationsEndpoint.fixtures
+
+    def setUp(self):
+        self.user = User.objects.get(email="user5@test.ac.uk")
+        LGDPublication.objects.create(lgd_id=1, publication_id=2, is_deleted=0)
+
+        for publication_id in (1, 2):
+            PublicationComment.objects.create(publication_id=publication_id, comment="public comment",
+                                              is_public=1, is_deleted=0, user=self.user, date=get_date_now())
+            PublicationComment.objects.create(publication_id=publication_id, comment="private comment",
+                                              is_public=0, is_deleted=0, user=self.user, date=get_date_now())
+            PublicationFamilies.objects.create(publication_id=publication_id, families=publication_id,
+                                               is_deleted=0)
+
+    def get_publications(self, user):
+        queryset = LGDPublication.objects.filter(lgd_id=1, is_deleted=0).select_related('publication')
+        auth_context = AuthContext(user, user.is_authenticated, user.is_superuser, frozenset())
+        # One query for the publications, one for the comments and one for the families
+        with self.assertNumQueries(3):
+            return LGDPublicationSerializer(queryset, context={'auth_context': auth_context}, many=True).data
+
+    def test_publications_anonymous(self):
+        data = self.get_publications(AnonymousUser())
+
+        self.assertEqual(len(data), 2)
+        for lgd_publication in data:
+            publication = lgd_publication["publication"]
+            self.assertEqual([comment["comment"] for comment in publication["comments"]], ["public comment"])
+            self.assertEqual(len(publication["families"]), 1)
+
+    def test_publications_curator(self):
+        data = self.get_publications(self.user)
+
+        families = {}
+        for lgd_publication in data:
+            publication = lgd_publication["publication"]
+            self.assertEqual(len(publication["comments"]), 2)
+            families[publication["pmid"]] = publication["families"][0]["number_of_families"]
+
+        self.assertEqual(families, {3897232: 1, 15214012: 2})
@@ -0,0 +1,19 @@
+from django.test import SimpleTestCase, override_settings
+from gene2phenotype_app.checks import check_shared_cache
+
+class SharedCacheCheck(SimpleTestCase):
+    """
+        Test the system check of the default cache
+    """
+    @override_settings(TESTING=False)
+    def test_local_memory_cache(self):
+        warnings = check_shared_cache(None)
+        self.assertEqual([warning.id for warning in warnings], ["gene2phenotype_app.W001"])
+        # A warning does not stop the management commands (e.g. migrate)
+        self.assertFalse(warnings[0].is_serious())
+
+    @override_settings(TESTING=False, CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": "/tmp/g2p_cache"}
+    })
+    def test_shared_cache(self):
+        self.assertEqual(check_shared_cache(None), [])
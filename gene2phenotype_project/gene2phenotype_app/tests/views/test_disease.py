@@ -0,0 +1,118 @@
+from django.test import TestCase
+from django.urls import reverse
+from gene2phenotype_app.models import DiseaseSynonym
+
+class DiseaseSuggestionsEndpoint(TestCase):
+    """
+        Test endpoint that returns the diseases similar to a disease name
+    """
+    fixtures = ["gene2phenotype_app/fixtures/attribs.json", "gene2phenotype_app/fixtures/disease.json",
+                "gene2phenotype_app/fixtures/ontology_term.json", "gene2phenotype_app/fixtures/source.json"]
+
+    def test_suggestions(self):
+        """
+            Test the suggestions for a name with typos
+        """
+        response = self.client.get(reverse("disease_suggestions") + "?name=griscelli typ 2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["id"], 5)
+        self.assertEqual(response.data["results"][0]["name"], "Griscelli Type 2")
+        self.assertFalse(response.data["results"][0]["is_synonym"])
+
+    def test_suggestions_limit(self):
+        """
+            Test the number of suggestions and the order by score
+        """
+        response = self.client.get(reverse("disease_suggestions") + "?name=ichthyosis type&limit=2")
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual({disease["id"] for disease in response.data["results"]}, {7, 8})
+
+        scores = [disease["score"] for disease in response.data["results"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_suggestions_synonym(self):
+        """
+            Test the suggestions include the new synonyms
+        """
+        DiseaseSynonym.objects.create(disease_id=3, synonym="Matthew-Wood syndrome")
+
+        response = self.client.get(reverse("disease_suggestions") + "?name=mathew wood syndrome")
+        self.assertEqual(response.data["results"][0]["id"], 3)
+        self.assertEqual(response.data["results"][0]["matched_name"], "Matthew-Wood syndrome")
+        self.assertTrue(response.data["results"][0]["is_synonym"])
+
+    def test_suggestions_invalid(self):
+        """
+            Test the suggestions without a name
+        """
+        response = self.client.get(reverse("disease_suggestions"))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["message"], "Please provide a disease name")
+
+class DiseaseDetailEndpoint(TestCase):
+    """
+        Test endpoints that return the disease data
+    """
+    fixtures = ["gene2phenotype_app/fixtures/attribs.json", "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+                "gene2phenotype_app/fixtures/disease.json", "gene2phenotype_app/fixtures/g2p_stable_id.json",
+                "gene2phenotype_app/fixtures/lgd_panel.json", "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+                "gene2phenotype_app/fixtures/locus.json", "gene2phenotype_app/fixtures/sequence.json",
+                "gene2phenotype_app/fixtures/user_panels.json", "gene2phenotype_app/fixtures/ontology_term.json",
+                "gene2phenotype_app/fixtures/source.json"]
+
+    def test_disease_name(self):
+        """
+            Test the disease search by disease name
+        """
+        response = self.client.get(reverse("disease_details", kwargs={"id": "Griscelli Type 2"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["name"], "Griscelli Type 2")
+
+    def test_disease_ontology(self):
+        """
+            Test the disease search by Mondo and OMIM IDs
+        """
+        response = self.client.get(reverse("disease_details", kwargs={"id": "MONDO:0007808"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["name"], "Ichthyosis hystrix, Curth-Macklin type")
+
+        response = self.client.get(reverse("disease_summary", kwargs={"id": "610188"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["disease"], "610188")
+        self.assertEqual(len(response.data["records_summary"]), 1)
+
+    def test_disease_new_synonym(self):
+        """
+            Test the disease resolver is updated when a synonym is added
+        """
+        response = self.client.get(reverse("disease_details", kwargs={"id": "Griscelli syndrome 2"}))
+        self.assertEqual(response.status_code, 404)
+
+        DiseaseSynonym.objects.create(disease_id=5, synonym="Griscelli syndrome 2")
+
+        response = self.client.get(reverse("disease_summary", kwargs={"id": "Griscelli syndrome 2"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["records_summary"]), 0)
+
+    def test_disease_etag(self):
+        """
+            Test the disease ETag changes when a synonym is added
+        """
+        response = self.client.get(reverse("disease_details", kwargs={"id": "Griscelli Type 2"}))
+        etag = response.headers["ETag"]
+
+        response = self.client.get(reverse("disease_details", kwargs={"id": "Griscelli Type 2"}), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        DiseaseSynonym.objects.create(disease_id=5, synonym="Griscelli syndrome 2")
+
+        response = self.client.get(reverse("disease_details", kwargs={"id": "Griscelli Type 2"}), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_disease_not_found(self):
+        """
+            Test the disease search with invalid names and IDs
+        """
+        response = self.client.get(reverse("disease_details", kwargs={"id": "MONDO:0000000"}))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["message"], "No matching Disease found for: MONDO:0000000")
@@ -0,0 +1,303 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
+import csv
+import json
+import io
+from gene2phenotype_app.models import Locus, LocusAttrib, LocusIdentifier, GeneDisease, GeneStats
+
+class LocusGeneEndpoint(TestCase):
+    """
+        Test endpoint that returns the gene data
+    """
+    fixtures = ["gene2phenotype_app/fixtures/attribs.json", "gene2phenotype_app/fixtures/locus.json",
+                "gene2phenotype_app/fixtures/sequence.json", "gene2phenotype_app/fixtures/source.json"]
+
+    def test_gene_symbol(self):
+        """
+            Test the gene search by gene symbol
+        """
+        response = self.client.get(reverse("locus_gene", kwargs={"name": "CEP290"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["gene_symbol"], "CEP290")
+
+    def test_gene_synonym(self):
+        """
+            Test the gene search by gene synonym (case insensitive)
+        """
+        response = self.client.get(reverse("locus_gene", kwargs={"name": "bbs14"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["gene_symbol"], "CEP290")
+
+    def test_gene_identifier(self):
+        """
+            Test the gene search by gene identifier
+        """
+        response = self.client.get(reverse("locus_gene_summary", kwargs={"name": "HGNC:9766"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["gene_symbol"], "RAB27A")
+
+    def test_gene_not_found(self):
+        """
+            Test the gene search with deleted synonyms and invalid names
+        """
+        response = self.client.get(reverse("locus_gene", kwargs={"name": "KIAA0373"}))
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.get(reverse("locus_gene_function", kwargs={"name": "INVALID"}))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["message"], "No matching Gene found for: INVALID")
+
+    def test_gene_new_synonym(self):
+        """
+            Test the gene index is updated when a synonym is added
+        """
+        response = self.client.get(reverse("locus_gene", kwargs={"name": "NEWSYN"}))
+        self.assertEqual(response.status_code, 404)
+
+        LocusAttrib.objects.create(locus_id=2, attrib_type_id=10, value="NEWSYN", is_deleted=0)
+
+        response = self.client.get(reverse("locus_gene", kwargs={"name": "NEWSYN"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["gene_symbol"], "RAB27A")
+
+    def test_gene_etag(self):
+        """
+            Test the gene ETag changes when a gene identifier is added
+        """
+        response = self.client.get(reverse("locus_gene", kwargs={"name": "CEP290"}))
+        etag = response.headers["ETag"]
+
+        response = self.client.get(reverse("locus_gene", kwargs={"name": "CEP290"}), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        LocusIdentifier.objects.create(locus_id=1, identifier="610142", source_id=4)
+
+        response = self.client.get(reverse("locus_gene", kwargs={"name": "CEP290"}), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+class LocusGenePageEndpoint(TestCase):
+    """
+        Test endpoint that returns all the data of the gene page
+    """
+    fixtures = ["gene2phenotype_app/fixtures/attribs.json", "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+                "gene2phenotype_app/fixtures/disease.json", "gene2phenotype_app/fixtures/g2p_stable_id.json",
+                "gene2phenotype_app/fixtures/lgd_panel.json", "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+                "gene2phenotype_app/fixtures/locus.json", "gene2phenotype_app/fixtures/sequence.json",
+                "gene2phenotype_app/fixtures/user_panels.json", "gene2phenotype_app/fixtures/ontology_term.json",
+                "gene2phenotype_app/fixtures/source.json", "gene2phenotype_app/fixtures/uniprot_annotation.json",
+                "gene2phenotype_app/fixtures/gene_stats.json", "gene2phenotype_app/fixtures/gene_disease.json"]
+
+    # Gene, identifiers, synonyms, function, gene stats, diseases and three queries for the records summary
+    page_queries = 9
+
+    def test_gene_page(self):
+        """
+            Test the gene page returns the same data as the gene endpoints
+        """
+        response = self.client.get(reverse("locus_gene_page", kwargs={"name": "CEP290"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data), ["gene_symbol", "gene", "records_summary", "function", "gene_stats", "diseases"])
+
+        response_gene = self.client.get(reverse("locus_gene", kwargs={"name": "CEP290"}))
+        self.assertEqual(response.json()["gene"], response_gene.json())
+
+        response_summary = self.client.get(reverse("locus_gene_summary", kwargs={"name": "CEP290"}))
+        self.assertEqual(response.json()["records_summary"], response_summary.json()["records_summary"])
+        self.assertEqual(len(response.json()["records_summary"]), 1)
+
+        response_function = self.client.get(reverse("locus_gene_function", kwargs={"name": "CEP290"}))
+        self.assertEqual(response.json()["function"], response_function.json()["function"])
+        self.assertEqual(response.json()["gene_stats"], response_function.json()["gene_stats"])
+        self.assertEqual(response.json()["gene_stats"], {"gain_of_function_mp": 0.041, "loss_of_function_mp": 0.934,
+                                                         "dominant_negative_mp": 0.025})
+
+        response_diseases = self.client.get(reverse("locus_gene_disease", kwargs={"name": "CEP290"}))
+        self.assertEqual(response.json()["diseases"], response_diseases.json()["results"])
+
+    def test_gene_page_include(self):
+        """
+            Test the gene page with a subset of sections
+        """
+        response = self.client.get(reverse("locus_gene_page", kwargs={"name": "CEP290"}) + "?include=function,diseases")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data), ["gene_symbol", "function", "diseases"])
+        self.assertEqual(response.data["function"]["uniprot_accession"], "O15078")
+        self.assertEqual([disease["disease_name"] for disease in response.data["diseases"]],
+                         ["joubert syndrome", "meckel syndrome"])
+
+    def test_gene_page_queries(self):
+        """
+            Test the number of queries of the gene page does not depend on the data of the gene
+        """
+        url = reverse("locus_gene_page", kwargs={"name": "CEP290"})
+        # Build the gene index
+        self.client.get(url)
+
+        with self.assertNumQueries(self.page_queries):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["diseases"]), 2)
+
+        GeneDisease.objects.create(gene_id=1, disease="Senior-Loken syndrome 6", identifier="610189", source_id=4)
+        GeneStats.objects.create(gene_id=1, gene_symbol="CEP290", score=0.5, source_id=9, description_attrib_id=59)
+
+        with self.assertNumQueries(self.page_queries):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["diseases"]), 3)
+
+    def test_gene_page_invalid_include(self):
+        """
+            Test the gene page with an invalid section
+        """
+        response = self.client.get(reverse("locus_gene_page", kwargs={"name": "CEP290"}) + "?include=gene,invalid")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["message"], "Invalid sections: invalid")
+
+class LocusRegionEndpoint(TestCase):
+    """
+        Test endpoint that returns the loci overlapping a region
+    """
+    fixtures = LocusGenePageEndpoint.fixtures
+
+    def test_region(self):
+        """
+            Test the loci overlapping a region and their records
+        """
+        response = self.client.get(reverse("locus_region", kwargs={"region": "chr12:88000000-88050000"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["name"], "CEP290")
+        self.assertEqual([record["stable_id"] for record in response.data["results"][0]["records"]], ["G2P00001"])
+
+    def test_region_boundaries(self):
+        """
+            Test the region start and end are inclusive
+        """
+        response = self.client.get(reverse("locus_region", kwargs={"region": "12:88142099-88142099"}))
+        self.assertEqual(response.data["count"], 1)
+
+        response = self.client.get(reverse("locus_region", kwargs={"region": "12:88142100-88200000"}))
+        self.assertEqual(response.data["count"], 0)
+
+    def test_region_nested_loci(self):
+        """
+            Test a region overlapping a long locus that starts before shorter loci
+        """
+        Locus.objects.create(type_id=48, sequence_id=1, start=1000, end=90000000, strand=1, name="REGION_1")
+        Locus.objects.create(type_id=48, sequence_id=1, start=2000, end=3000, strand=1, name="REGION_2")
+
+        response = self.client.get(reverse("locus_region", kwargs={"region": "12:50000-60000"}))
+        self.assertEqual([locus["name"] for locus in response.data["results"]], ["REGION_1"])
+
+        response = self.client.get(reverse("locus_region", kwargs={"region": "12:2500-88050000"}))
+        self.assertEqual([locus["name"] for locus in response.data["results"]], ["REGION_1", "REGION_2", "CEP290"])
+
+    def test_invalid_region(self):
+        """
+            Test invalid regions
+        """
+        response = self.client.get(reverse("locus_region", kwargs={"region": "12:100"}))
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(reverse("locus_region", kwargs={"region": "12:200-100"}))
+        self.assertEqual(response.status_code, 400)
+
+class GeneListDownloadEndpoint(TestCase):
+    """
+        Test endpoint that returns the records of a list of genes
+    """
+    fixtures = LocusGenePageEndpoint.fixtures
+
+    def read_report(self, response):
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_gene_list_file(self):
+        """
+            Test the download with a gene list file
+        """
+        gene_list = SimpleUploadedFile("genes.csv", b"CEP290\nbbs14,RAB27A\nINVALID\n")
+        response = self.client.post(reverse("gene_list_download"), {"file": gene_list})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Genes-Not-Found"], "1")
+
+        rows = self.read_report(response)
+        self.assertEqual(rows[0][:4], ["input", "status", "gene symbol", "g2p id"])
+        self.assertEqual(rows[1][:4], ["CEP290", "found", "CEP290", "G2P00001"])
+        # bbs14 is a synonym of CEP290
+        self.assertEqual(rows[2][:4], ["bbs14", "found", "CEP290", "G2P00001"])
+        # RAB27A does not have records
+        self.assertEqual(rows[3], ["RAB27A", "no records", "RAB27A", "", "", "", "", "", "", ""])
+        self.assertEqual(rows[4][:3], ["INVALID", "not found", ""])
+        self.assertEqual(len(rows), 5)
+
+    def test_gene_list_tsv(self):
+        """
+            Test the download with a list of genes in TSV format
+        """
+        response = self.client.post(reverse("gene_list_download") + "?output=tsv", {"genes": ["CEP290"]},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+
+        content = b"".join(response.streaming_content).decode()
+        self.assertEqual(content.splitlines()[1].split("\t")[:4], ["CEP290", "found", "CEP290", "G2P00001"])
+
+    def test_gene_list_empty(self):
+        """
+            Test the download without genes
+        """
+        response = self.client.post(reverse("gene_list_download"), {"genes": ""}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+class GeneIdentifierResolveEndpoint(TestCase):
+    """
+        Test endpoint that maps gene identifiers to the genes and their records
+    """
+    fixtures = LocusGenePageEndpoint.fixtures
+
+    def read_response(self, response):
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_identifiers(self):
+        """
+            Test the mapping of HGNC and Ensembl identifiers
+        """
+        identifiers = ["HGNC:29021", "ensg00000069974", "HGNC:0", "CEP290"]
+        response = self.client.post(reverse("gene_identifier_resolve"), {"identifiers": identifiers},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+
+        data = self.read_response(response)
+        self.assertEqual(data["results"], {
+            "HGNC:29021": {"gene_symbol": "CEP290", "source": "HGNC", "records": ["G2P00001"]},
+            # The identifiers are case insensitive, the input identifier is returned
+            "ensg00000069974": {"gene_symbol": "RAB27A", "source": "Ensembl", "records": []},
+        })
+        # Gene symbols are not identifiers
+        self.assertEqual(data["not_found"], ["HGNC:0", "CEP290"])
+        self.assertEqual(data["count"], 2)
+
+    def test_identifiers_source(self):
+        """
+            Test the mapping of identifiers from one source
+        """
+        gene_list = SimpleUploadedFile("identifiers.txt", b"HGNC:9766\nENSG00000069974\n")
+        response = self.client.post(reverse("gene_identifier_resolve") + "?source=hgnc", {"file": gene_list})
+        self.assertEqual(response.status_code, 200)
+
+        data = self.read_response(response)
+        self.assertEqual(list(data["results"]), ["HGNC:9766"])
+        self.assertEqual(data["not_found"], ["ENSG00000069974"])
+
+    def test_identifiers_invalid(self):
+        """
+            Test the mapping without identifiers and with an invalid source
+        """
+        response = self.client.post(reverse("gene_identifier_resolve"), {"identifiers": []},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(reverse("gene_identifier_resolve") + "?source=invalid",
+                                    {"identifiers": ["HGNC:9766"]}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["message"], "Invalid source 'invalid'")
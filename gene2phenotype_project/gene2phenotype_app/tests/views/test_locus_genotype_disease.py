@@ -1,5 +1,13 @@
 from django.test import TestCase
+from django.conf import settings
+from django.core.cache import cache
 from django.urls import reverse
+from django.contrib.auth.models import AnonymousUser
+from gene2phenotype_app.models import (User, LocusGenotypeDisease, LGDPanel, G2PStableID, LGDPublication,
+                                       LGDMolecularMechanismEvidence, LGDMolecularMechanismSynopsis, LGDComment)
+from gene2phenotype_app.serializers import LocusGenotypeDiseaseSerializer
+from gene2phenotype_app.utils import bump_record_version
+from rest_framework_simplejwt.tokens import RefreshToken
 
 class LocusGenotypeDiseaseDetailEndpoint(TestCase):
     """
@@ -18,6 +26,7 @@ class LocusGenotypeDiseaseDetailEndpoint(TestCase):
 
     def setUp(self):
         self.url_list_lgd = reverse("lgd", kwargs={"stable_id": "G2P00001"})
+        cache.clear()
 
     def test_lgd_detail(self):
         """
@@ -67,3 +76,304 @@ class LocusGenotypeDiseaseDetailEndpoint(TestCase):
             {"name": "Eye", "description": "Eye disorders"}
         ]
         self.assertEqual(response.data["panels"], expected_data_panels)
+
+class LocusGenotypeDiseaseDetailCacheEndpoint(TestCase):
+    """
+        Test the cached JSON of the locus genotype disease record
+    """
+    fixtures = LocusGenotypeDiseaseDetailEndpoint.fixtures
+
+    def setUp(self):
+        self.url_list_lgd = reverse("lgd", kwargs={"stable_id": "G2P00001"})
+        self.url_lgd_comment = reverse("lgd_comment", kwargs={"stable_id": "G2P00001"})
+        cache.clear()
+
+    def test_lgd_detail_cache(self):
+        """
+            Test the record is read from the cache until it is updated
+        """
+        response = self.client.get(self.url_list_lgd)
+        self.assertEqual(response.status_code, 200)
+
+        # The record version and the JSON are read from the cache
+        with self.assertNumQueries(0):
+            response_cached = self.client.get(self.url_list_lgd)
+        self.assertEqual(response_cached.status_code, 200)
+        self.assertEqual(response_cached.json()["stable_id"], "G2P00001")
+        self.assertEqual(response_cached.json()["comments"], [])
+
+        user = User.objects.get(email="user5@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        self.client.cookies[settings.SIMPLE_JWT['AUTH_COOKIE']] = str(refresh.access_token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url_lgd_comment,
+                                        {"comments": [{"comment": "This is a comment", "is_public": 1}]},
+                                        content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+
+        del self.client.cookies[settings.SIMPLE_JWT['AUTH_COOKIE']]
+        response = self.client.get(self.url_list_lgd)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["comments"]), 1)
+
+    def test_lgd_detail_cache_visibility(self):
+        """
+            Test the cached record is not returned once the record is deleted
+        """
+        response = self.client.get(self.url_list_lgd)
+        self.assertEqual(response.status_code, 200)
+
+        # The views that update the record increment its version
+        LocusGenotypeDisease.objects.filter(id=1).update(is_deleted=1)
+        bump_record_version(LocusGenotypeDisease.objects.filter(id=1))
+
+        response = self.client.get(self.url_list_lgd)
+        self.assertEqual(response.status_code, 404)
+
+    def test_lgd_detail_not_modified(self):
+        """
+            Test the record is not sent again if it did not change
+        """
+        response = self.client.get(self.url_list_lgd)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url_list_lgd, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        user = User.objects.get(email="user5@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        self.client.cookies[settings.SIMPLE_JWT['AUTH_COOKIE']] = str(refresh.access_token)
+
+        # Curators get a different version of the record
+        response = self.client.get(self.url_list_lgd, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_lgd_detail_fields_not_modified(self):
+        """
+            Test the responses with a subset of fields have a different ETag
+        """
+        response = self.client.get(self.url_list_lgd)
+        etag = response.headers["ETag"]
+
+        response = self.client.get(self.url_list_lgd, {"fields": "stable_id"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"stable_id": "G2P00001"})
+        etag_fields = response.headers["ETag"]
+
+        # The same selection of fields in a different order
+        response = self.client.get(self.url_list_lgd, {"fields": "stable_id,locus", "exclude": "locus"},
+                                   HTTP_IF_NONE_MATCH=etag_fields)
+        self.assertEqual(response.status_code, 304)
+
+class LocusGenotypeDiseaseDetailFieldsEndpoint(TestCase):
+    """
+        Test the locus genotype disease record with a subset of fields
+    """
+    fixtures = LocusGenotypeDiseaseDetailEndpoint.fixtures
+
+    def setUp(self):
+        self.url_list_lgd = reverse("lgd", kwargs={"stable_id": "G2P00001"})
+        cache.clear()
+
+    def test_lgd_detail_fields(self):
+        """
+            Test the record display with the selected fields
+        """
+        response = self.client.get(self.url_list_lgd, {"fields": "locus,disease,confidence,panels"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data.keys()), ["locus", "disease", "confidence", "panels"])
+        self.assertEqual(response.data["confidence"], "definitive")
+        self.assertEqual(len(response.data["panels"]), 2)
+
+    def test_lgd_detail_exclude(self):
+        """
+            Test the record display without the excluded fields
+        """
+        response = self.client.get(self.url_list_lgd, {"exclude": "publications,curators,comments"})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("publications", response.data)
+        self.assertNotIn("curators", response.data)
+        self.assertEqual(response.data["stable_id"], "G2P00001")
+
+        # The full record is still available
+        response = self.client.get(self.url_list_lgd)
+        self.assertIn("publications", response.json())
+
+    def test_lgd_detail_invalid_fields(self):
+        """
+            Test the record display with an invalid field
+        """
+        response = self.client.get(self.url_list_lgd, {"fields": "locus,gene"})
+        self.assertEqual(response.status_code, 400)
+
+class LocusGenotypeDiseaseBatchDetailEndpoint(TestCase):
+    """
+        Test endpoint that returns a list of locus genotype disease records
+    """
+    fixtures = LocusGenotypeDiseaseDetailEndpoint.fixtures
+
+    def setUp(self):
+        self.url_lgd_batch = reverse("lgd_batch")
+
+    def test_lgd_batch_detail(self):
+        """
+            Test the display of a list of records
+        """
+        response = self.client.post(self.url_lgd_batch, {"stable_ids": ["G2P00001", "G2P99999"]}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["stable_id"], "G2P00001")
+        self.assertEqual(response.data["results"][0]["confidence"], "definitive")
+        self.assertEqual(response.data["not_found"], ["G2P99999"])
+
+    def test_lgd_batch_invalid_input(self):
+        """
+            Test the input is not a list of stable IDs
+        """
+        response = self.client.post(self.url_lgd_batch, {"stable_ids": "G2P00001"}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_lgd_batch_detail_fields(self):
+        """
+            Test the list of records with the selected fields
+        """
+        response = self.client.post(f"{self.url_lgd_batch}?fields=stable_id,confidence",
+                                    {"stable_ids": ["G2P00001"]}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"], [{"stable_id": "G2P00001", "confidence": "definitive"}])
+
+
+class LocusGenotypeDiseaseQueryCount(TestCase):
+    """
+        Test the number of queries used to load the records does not depend on the number of records
+    """
+    fixtures = LocusGenotypeDiseaseDetailEndpoint.fixtures
+    # One query for the records and one query per related table
+    prefetch_queries = 19
+    batch_queries = 19
+
+    def create_records(self, number):
+        """
+            Creates copies of the record G2P00001 with its panels, publications,
+            molecular mechanism and comments.
+        """
+        user = User.objects.get(email="user5@test.ac.uk")
+        lgd = LocusGenotypeDisease.objects.get(id=1)
+
+        for i in range(number):
+            stable_id = G2PStableID.objects.create(stable_id=f"G2P1{i:04d}", is_live=True)
+            new_lgd = LocusGenotypeDisease.objects.create(
+                stable_id=stable_id, locus_id=lgd.locus_id, genotype_id=lgd.genotype_id, disease_id=i + 3,
+                mechanism_id=lgd.mechanism_id, mechanism_support_id=lgd.mechanism_support_id,
+                confidence_id=lgd.confidence_id, date_review=lgd.date_review, is_reviewed=1, is_deleted=0
+            )
+            for lgd_panel in LGDPanel.objects.filter(lgd=lgd):
+                LGDPanel.objects.create(lgd=new_lgd, panel_id=lgd_panel.panel_id, is_deleted=0)
+            LGDPublication.objects.create(lgd=new_lgd, publication_id=1, is_deleted=0)
+            LGDMolecularMechanismEvidence.objects.create(lgd=new_lgd, evidence_id=18, publication_id=1, is_deleted=0)
+            LGDMolecularMechanismSynopsis.objects.create(lgd=new_lgd, synopsis_id=12, synopsis_support_id=16, is_deleted=0)
+            LGDComment.objects.create(lgd=new_lgd, comment="comment", is_public=1, is_deleted=0, user=user,
+                                      date=lgd.date_review)
+
+    def serialize_records(self):
+        queryset = LocusGenotypeDisease.objects.filter(is_deleted=0)
+        records = LocusGenotypeDiseaseSerializer.prefetch_records(queryset, AnonymousUser())
+        return LocusGenotypeDiseaseSerializer(records, many=True, context={'user': AnonymousUser()}).data
+
+    def test_prefetch_records(self):
+        """
+            Test the serializer reads the data loaded by prefetch_records
+        """
+        with self.assertNumQueries(self.prefetch_queries):
+            self.assertEqual(len(self.serialize_records()), 1)
+
+        self.create_records(5)
+
+        with self.assertNumQueries(self.prefetch_queries):
+            self.assertEqual(len(self.serialize_records()), 6)
+
+    def test_lgd_batch_detail(self):
+        """
+            Test the number of queries of the batch endpoint
+        """
+        url_lgd_batch = reverse("lgd_batch")
+
+        with self.assertNumQueries(self.batch_queries):
+            response = self.client.post(url_lgd_batch, {"stable_ids": ["G2P00001"]}, content_type="application/json")
+        self.assertEqual(response.data["count"], 1)
+
+        self.create_records(5)
+        stable_ids = ["G2P00001"] + [f"G2P1{i:04d}" for i in range(5)]
+
+        with self.assertNumQueries(self.batch_queries):
+            response = self.client.post(url_lgd_batch, {"stable_ids": stable_ids}, content_type="application/json")
+        self.assertEqual(response.data["count"], 6)
+        self.assertEqual(response.data["results"][5]["publications"], response.data["results"][0]["publications"])
+
+class LocusGenotypeDiseaseHistoryEndpoint(TestCase):
+    """
+        Test endpoint that returns the changes made to a record
+    """
+    fixtures = LocusGenotypeDiseaseDetailEndpoint.fixtures
+
+    def setUp(self):
+        self.url_lgd_history = reverse("lgd_history", kwargs={"stable_id": "G2P00001"})
+
+        lgd = LocusGenotypeDisease.objects.get(id=1)
+        lgd.confidence_id = 3 # strong
+        lgd.save()
+        lgd_panel = LGDPanel.objects.create(lgd=lgd, panel_id=2, is_deleted=0)
+        lgd_panel.is_deleted = 1
+        lgd_panel.save()
+
+    def login(self):
+        user = User.objects.get(email="user5@test.ac.uk")
+        refresh = RefreshToken.for_user(user)
+        self.client.cookies[settings.SIMPLE_JWT['AUTH_COOKIE']] = str(refresh.access_token)
+
+    def test_lgd_history(self):
+        """
+            Test the changes are returned newest first
+        """
+        self.login()
+        response = self.client.get(self.url_lgd_history)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["next"])
+
+        changes = [(change["data_type"], change["action"], change["value"]) for change in response.data["results"]]
+        self.assertEqual(changes, [("panel", "deleted", "Ear"), ("panel", "created", "Ear"), ("record", "updated", None)])
+
+    def test_lgd_history_pages(self):
+        """
+            Test the changes are split in pages with the cursor
+        """
+        self.login()
+        url = f"{self.url_lgd_history}?page_size=1"
+        changes = []
+
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data["results"]), 1)
+            changes.extend((change["data_type"], change["action"]) for change in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(changes, [("panel", "deleted"), ("panel", "created"), ("record", "updated")])
+
+    def test_lgd_history_invalid_cursor(self):
+        """
+            Test the history with an invalid cursor
+        """
+        self.login()
+        response = self.client.get(f"{self.url_lgd_history}?cursor=invalid")
+        self.assertEqual(response.status_code, 400)
+
+    def test_lgd_history_no_permission(self):
+        """
+            Test the history is not available to anonymous users
+        """
+        response = self.client.get(self.url_lgd_history)
+        self.assertEqual(response.status_code, 401)
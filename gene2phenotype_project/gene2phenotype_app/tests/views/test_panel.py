@@ -1,8 +1,11 @@
 from django.test import TestCase
 from django.conf import settings
 from django.urls import reverse
-from gene2phenotype_app.models import User
+from gene2phenotype_app.models import User, UserPanel, Attrib, LocusGenotypeDisease
 from rest_framework_simplejwt.tokens import RefreshToken
+from gene2phenotype_app.utils import build_gene_panel_matrix
+import numpy as np
+import io
 
 class PanelListEndpointTests(TestCase):
     """
@@ -62,6 +65,35 @@ class PanelDetailsEndpointTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data.get("description"), "Developmental disorders")
 
+    def test_get_panel_details_not_modified(self):
+        """
+            Get the details of a panel that did not change since the last request.
+        """
+        response = self.client.get(self.url_panels)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response.headers)
+        self.assertNotIn("Last-Modified", response.headers)
+        self.assertIn("Authorization", response.headers["Vary"])
+
+        response = self.client.get(self.url_panels, HTTP_IF_NONE_MATCH=response.headers["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(self.url_panels, HTTP_IF_NONE_MATCH='"old-etag"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_panel_details_curators_modified(self):
+        """
+            Get the details of a panel after a curator is removed from the panel.
+        """
+        response = self.client.get(self.url_panels)
+        curators = response.data.get("curators")
+
+        UserPanel.objects.filter(user__email="user2@test.ac.uk", panel__name="DD").delete()
+
+        response = self.client.get(self.url_panels, HTTP_IF_NONE_MATCH=response.headers["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data.get("curators")), len(curators) - 1)
+
 class PanelSummaryEndpointTests(TestCase):
     """
         Test the panel endpoint: PanelRecordsSummary
@@ -83,3 +115,166 @@ class PanelSummaryEndpointTests(TestCase):
         response = self.client.get(self.url_panels)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data.get("records_summary")), 1)
+
+class PanelCompareEndpointTests(TestCase):
+    """
+        Test the panel endpoint: PanelCompare
+    """
+    fixtures = ["gene2phenotype_app/fixtures/user_panels.json", "gene2phenotype_app/fixtures/attribs.json",
+                "gene2phenotype_app/fixtures/g2p_stable_id.json", "gene2phenotype_app/fixtures/locus.json",
+                "gene2phenotype_app/fixtures/sequence.json", "gene2phenotype_app/fixtures/disease.json",
+                "gene2phenotype_app/fixtures/ontology_term.json", "gene2phenotype_app/fixtures/source.json",
+                "gene2phenotype_app/fixtures/locus_genotype_disease.json", "gene2phenotype_app/fixtures/lgd_panel.json",
+                "gene2phenotype_app/fixtures/cv_molecular_mechanism.json"]
+
+    def setUp(self):
+        self.url_compare = reverse('panels_compare')
+
+    def test_panel_intersection(self):
+        """
+            Records linked to both panels.
+        """
+        response = self.client.get(self.url_compare, {'a': 'DD', 'b': 'Eye', 'op': 'intersection'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get("count"), 1)
+        self.assertEqual(response.data.get("results")[0]["stable_id"], "G2P00001")
+
+    def test_panel_difference_genes(self):
+        """
+            Genes linked to the first panel but not to the second panel.
+        """
+        response = self.client.get(self.url_compare, {'a': 'DD', 'b': 'Eye', 'op': 'difference', 'type': 'genes'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get("count"), 0)
+
+    def test_non_visible_panel(self):
+        """
+            Non-authenticated users cannot compare non-visible panels.
+        """
+        response = self.client.get(self.url_compare, {'a': 'DD', 'b': 'Ear'})
+        self.assertEqual(response.status_code, 404)
+
+class PanelRecordsEndpointTests(TestCase):
+    """
+        Test the panel endpoint: PanelRecords
+    """
+    fixtures = ["gene2phenotype_app/fixtures/user_panels.json", "gene2phenotype_app/fixtures/attribs.json",
+                "gene2phenotype_app/fixtures/g2p_stable_id.json", "gene2phenotype_app/fixtures/locus.json",
+                "gene2phenotype_app/fixtures/sequence.json", "gene2phenotype_app/fixtures/disease.json",
+                "gene2phenotype_app/fixtures/ontology_term.json", "gene2phenotype_app/fixtures/source.json",
+                "gene2phenotype_app/fixtures/locus_genotype_disease.json", "gene2phenotype_app/fixtures/lgd_panel.json",
+                "gene2phenotype_app/fixtures/cv_molecular_mechanism.json"]
+
+    def setUp(self):
+        self.url_records = reverse('panel_records', kwargs={'name': 'DD'})
+
+    def test_get_panel_records(self):
+        """
+            List the records of a visible panel.
+        """
+        response = self.client.get(self.url_records)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data.get("results")), 1)
+        self.assertEqual(response.data.get("results")[0]["stable_id"], "G2P00001")
+        self.assertIsNone(response.data.get("next"))
+
+    def test_filter_panel_records(self):
+        """
+            Filter the records by confidence.
+        """
+        response = self.client.get(self.url_records, {'confidence': 'limited,moderate'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data.get("results")), 0)
+
+    def test_filter_panel_records_invalid_date(self):
+        """
+            Filter the records with an invalid review date.
+        """
+        response = self.client.get(self.url_records, {'review_after': '01-01-2024'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data.get("message"), "Invalid date '01-01-2024', the format is YYYY-MM-DD")
+
+class PanelMatrixEndpointTests(TestCase):
+    """
+        Test the panel endpoint: PanelMatrixDownload
+    """
+    fixtures = ["gene2phenotype_app/fixtures/user_panels.json", "gene2phenotype_app/fixtures/attribs.json",
+                "gene2phenotype_app/fixtures/g2p_stable_id.json", "gene2phenotype_app/fixtures/locus.json",
+                "gene2phenotype_app/fixtures/sequence.json", "gene2phenotype_app/fixtures/disease.json",
+                "gene2phenotype_app/fixtures/ontology_term.json", "gene2phenotype_app/fixtures/source.json",
+                "gene2phenotype_app/fixtures/locus_genotype_disease.json", "gene2phenotype_app/fixtures/lgd_panel.json",
+                "gene2phenotype_app/fixtures/cv_molecular_mechanism.json"]
+
+    def setUp(self):
+        self.url_matrix = reverse('panels_matrix')
+
+    def test_get_matrix_tsv(self):
+        """
+            Download the gene x panel matrix in tsv format.
+        """
+        response = self.client.get(self.url_matrix)
+        self.assertEqual(response.status_code, 200)
+        lines = response.content.decode().splitlines()
+        self.assertEqual(lines[0], "gene symbol\tDD\tEye")
+        self.assertEqual(lines[1], "CEP290\tdefinitive\tdefinitive")
+
+    def test_get_matrix_npz(self):
+        """
+            Download the gene x panel matrix in numpy format.
+        """
+        response = self.client.get(self.url_matrix, {'output': 'npz'})
+        self.assertEqual(response.status_code, 200)
+
+        data = np.load(io.BytesIO(response.content))
+        self.assertEqual(data["genes"].tolist(), ["CEP290"])
+        self.assertEqual(data["panels"].tolist(), ["DD", "Eye"])
+        self.assertEqual([data["confidence"][code] for code in data["matrix"][0]], ["definitive", "definitive"])
+
+    def test_matrix_unknown_confidence(self):
+        """
+            Build the matrix with a confidence value not in CONFIDENCE_LEVELS.
+        """
+        with self.assertRaises(ValueError):
+            build_gene_panel_matrix([("CEP290", "DD", "unknown")])
+
+    def test_get_matrix_unknown_confidence(self):
+        """
+            Download the matrix when a record has a confidence value not in CONFIDENCE_LEVELS.
+        """
+        confidence = Attrib.objects.create(type_id=1, value="unknown")
+        LocusGenotypeDisease.objects.filter(id=1).update(confidence=confidence)
+
+        response = self.client.get(self.url_matrix)
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.data["message"],
+                         "Cannot build the gene panel matrix: Unknown confidence 'unknown' for gene 'CEP290' in panel 'DD'")
+
+class LGDEditPanelEndpointTests(TestCase):
+    """
+        Test the endpoint to add a panel to a record: LGDEditPanel
+    """
+    fixtures = PanelDetailsEndpointTests.fixtures
+
+    def setUp(self):
+        self.url_lgd_panel = reverse('lgd_panel', kwargs={'stable_id': 'G2P00001'})
+
+    def login(self, email):
+        user = User.objects.get(email=email)
+        refresh = RefreshToken.for_user(user)
+        self.client.cookies[settings.SIMPLE_JWT['AUTH_COOKIE']] = str(refresh.access_token)
+
+    def test_add_panel(self):
+        """
+            Add a panel the user can edit.
+        """
+        self.login("user5@test.ac.uk")
+        response = self.client.post(self.url_lgd_panel, {"name": "Ear"}, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+
+    def test_add_panel_no_permission(self):
+        """
+            The user cannot edit the panel (user panel is deleted).
+        """
+        self.login("user3@test.ac.uk")
+        response = self.client.post(self.url_lgd_panel, {"name": "Eye"}, content_type="application/json")
+        self.assertEqual(response.status_code, 403)
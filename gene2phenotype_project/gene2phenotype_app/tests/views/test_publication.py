@@ -0,0 +1,67 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
+import json
+from gene2phenotype_app.models import LGDPublication
+
+class PublicationRecordsEndpoint(TestCase):
+    """
+        Test endpoint that returns the records citing a list of PMIDs
+    """
+    fixtures = ["gene2phenotype_app/fixtures/attribs.json", "gene2phenotype_app/fixtures/cv_molecular_mechanism.json",
+                "gene2phenotype_app/fixtures/disease.json", "gene2phenotype_app/fixtures/g2p_stable_id.json",
+                "gene2phenotype_app/fixtures/lgd_mechanism_evidence.json", "gene2phenotype_app/fixtures/lgd_panel.json",
+                "gene2phenotype_app/fixtures/lgd_publication.json", "gene2phenotype_app/fixtures/locus_genotype_disease.json",
+                "gene2phenotype_app/fixtures/locus.json", "gene2phenotype_app/fixtures/ontology_term.json",
+                "gene2phenotype_app/fixtures/publication.json", "gene2phenotype_app/fixtures/sequence.json",
+                "gene2phenotype_app/fixtures/source.json", "gene2phenotype_app/fixtures/user_panels.json"]
+
+    def read_response(self, response):
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_pmids(self):
+        """
+            Test the records citing a list of PMIDs
+        """
+        response = self.client.post(reverse("publication_records"), {"pmids": [3897232, "15214012", "abc"]},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+
+        data = self.read_response(response)
+        self.assertEqual(data["results"], [
+            {"pmid": 3897232, "records": [{"stable_id": "G2P00001", "linked_by": ["publication", "mechanism_evidence"]}]}
+        ])
+        self.assertEqual(data["not_found"], [15214012])
+        self.assertEqual(data["invalid"], ["abc"])
+        self.assertEqual(data["count"], 1)
+
+    def test_pmids_invalid(self):
+        """
+            Test the PMIDs with non-ASCII digits or too many digits are invalid
+        """
+        response = self.client.post(reverse("publication_records"), {"pmids": "3897232 ² 12345678901"},
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+
+        data = self.read_response(response)
+        self.assertEqual(data["invalid"], ["²", "12345678901"])
+        self.assertEqual(data["count"], 1)
+
+    def test_pmids_deleted_link(self):
+        """
+            Test the deleted links are ignored
+        """
+        LGDPublication.objects.filter(lgd_id=1, publication_id=1).update(is_deleted=1)
+
+        pmid_list = SimpleUploadedFile("pmids.txt", b"3897232\n")
+        response = self.client.post(reverse("publication_records"), {"file": pmid_list})
+
+        data = self.read_response(response)
+        self.assertEqual(data["results"][0]["records"], [{"stable_id": "G2P00001", "linked_by": ["mechanism_evidence"]}])
+
+    def test_pmids_empty(self):
+        """
+            Test the endpoint without PMIDs
+        """
+        response = self.client.post(reverse("publication_records"), {"pmids": ""}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
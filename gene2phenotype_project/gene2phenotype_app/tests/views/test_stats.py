@@ -0,0 +1,105 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from gene2phenotype_app.models import LocusGenotypeDisease, DatasetStats, Panel
+from gene2phenotype_app.utils import refresh_stats
+
+
+class DatasetStatisticsEndpointTests(TestCase):
+    """
+        Test the stats endpoint: DatasetStatistics
+    """
+    fixtures = ["gene2phenotype_app/fixtures/user_panels.json", "gene2phenotype_app/fixtures/attribs.json",
+                "gene2phenotype_app/fixtures/g2p_stable_id.json", "gene2phenotype_app/fixtures/locus.json",
+                "gene2phenotype_app/fixtures/sequence.json", "gene2phenotype_app/fixtures/disease.json",
+                "gene2phenotype_app/fixtures/ontology_term.json", "gene2phenotype_app/fixtures/source.json",
+                "gene2phenotype_app/fixtures/locus_genotype_disease.json", "gene2phenotype_app/fixtures/lgd_panel.json",
+                "gene2phenotype_app/fixtures/cv_molecular_mechanism.json"]
+
+    def setUp(self):
+        self.url_stats = reverse('stats')
+
+    def test_get_stats_empty(self):
+        """
+            Test the stats are empty before the rollup is created.
+            The endpoint only reads the rollup.
+        """
+        response = self.client.get(self.url_stats)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get("total_records"), 0)
+        self.assertFalse(DatasetStats.objects.exists())
+
+    def test_get_stats(self):
+        """
+            Test the global stats.
+            The record is linked to two panels but it is only counted once.
+        """
+        out = StringIO()
+        call_command("refresh_dataset_stats", stdout=out)
+        self.assertIn("Dataset stats refreshed: 1 records", out.getvalue())
+
+        response = self.client.get(self.url_stats)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get("total_records"), 1)
+        self.assertEqual(response.data.get("total_genes"), 1)
+        self.assertEqual(response.data.get("by_confidence"), {"definitive": 1})
+
+class DatasetStatisticsRefreshTests(TransactionTestCase):
+    """
+        Test the rollup used by the stats endpoint is refreshed on write.
+        The refresh runs after the transaction is committed.
+    """
+    fixtures = DatasetStatisticsEndpointTests.fixtures
+
+    def setUp(self):
+        self.url_stats = reverse('stats')
+        refresh_stats()
+
+    def test_refresh_on_write(self):
+        """
+            Test the rollup is refreshed after a record is deleted.
+        """
+        response = self.client.get(self.url_stats)
+        self.assertEqual(response.data.get("total_records"), 1)
+
+        lgd = LocusGenotypeDisease.objects.get(id=1)
+        lgd.is_deleted = 1
+        lgd.save()
+
+        self.assertFalse(DatasetStats.objects.filter(category="confidence").exists())
+        response = self.client.get(self.url_stats)
+        self.assertEqual(response.data.get("total_records"), 0)
+
+    def get_rollup(self):
+        return sorted(DatasetStats.objects.values_list('category', 'value', 'count'))
+
+    def test_incremental_update(self):
+        """
+            Test the incremental update gives the same rollup as the full refresh.
+        """
+        lgd = LocusGenotypeDisease.objects.get(id=1)
+        lgd.confidence_id = 3
+        lgd.save()
+
+        response = self.client.get(self.url_stats)
+        self.assertEqual(response.data.get("by_confidence"), {"strong": 1})
+        self.assertEqual(response.data.get("total_genes"), 1)
+
+        incremental = self.get_rollup()
+        refresh_stats()
+        self.assertEqual(incremental, self.get_rollup())
+
+    def test_incremental_update_panel(self):
+        """
+            Test the rollup is updated when the panels of the record are hidden.
+        """
+        for panel in Panel.objects.all():
+            panel.is_visible = 0
+            panel.save()
+
+        response = self.client.get(self.url_stats)
+        self.assertEqual(response.data.get("total_records"), 0)
+        self.assertEqual(response.data.get("total_genes"), 0)
+        self.assertEqual(response.data.get("by_confidence"), {})
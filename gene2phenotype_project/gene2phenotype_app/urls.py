@@ -9,8 +9,11 @@ def perform_create(self, serializer):
 urlpatterns = [
     path('', views.ListEndpoints, name="list_endpoints"),
     path('panels/', views.PanelList.as_view(), name="list_panels"),
+    path('panels/compare/', views.PanelCompare.as_view(), name="panels_compare"),
+    path('panels/matrix/', views.PanelMatrixDownload, name="panels_matrix"),
     path('panel/<str:name>/', views.PanelDetail.as_view(), name="panel_details"),
     path('panel/<str:name>/summary/', views.PanelRecordsSummary.as_view(), name="panel_summary"),
+    path('panel/<str:name>/records/', views.PanelRecords.as_view(), name="panel_records"),
     path('panel/<str:name>/download/', views.PanelDownload, name="panel_download"),
     path('users/', views.UserList.as_view(), name="list_users"),
     path('user/panels/', views.UserPanels.as_view(), name="user_panels"),
@@ -19,16 +22,25 @@ urlpatterns = [
     path('attrib/<str:code>/', views.AttribList.as_view(), name="list_attribs_by_type"),
     path('molecular_mechanisms/', views.ListMolecularMechanisms.as_view(), name="list_mechanisms"),
     path('ontology_terms/variant_types/', views.VariantTypesList.as_view(), name="list_variant_types"),
+    path('genes/download/', views.GeneListDownload, name="gene_list_download"),
+    path('genes/identifiers/', views.GeneIdentifierResolve, name="gene_identifier_resolve"),
     path('gene/<str:name>/', views.LocusGene.as_view(), name="locus_gene"),
     path('gene/<str:name>/summary/', views.LocusGeneSummary.as_view(), name="locus_gene_summary"),
     path('gene/<str:name>/function/', views.GeneFunction.as_view(), name="locus_gene_function"),
     path('gene/<str:name>/disease/', views.GeneDiseaseView.as_view(), name="locus_gene_disease"),
+    path('gene/<str:name>/page/', views.LocusGenePage.as_view(), name="locus_gene_page"),
+    path('region/<str:region>/', views.LocusRegion.as_view(), name="locus_region"),
+    path('diseases/suggestions/', views.DiseaseSuggestions.as_view(), name="disease_suggestions"),
     path('disease/<path:id>/summary/', views.DiseaseSummary.as_view(), name="disease_summary"),
     path('disease/<path:id>/', views.DiseaseDetail.as_view(), name="disease_details"),
     path('publication/<str:pmids>/', views.PublicationDetail, name="publication_details"),
+    path('publications/records/', views.PublicationRecords, name="publication_records"),
     path('phenotype/<str:hpo_list>/', views.PhenotypeDetail, name="phenotype_details"),
     path('lgd/<str:stable_id>/', views.LocusGenotypeDiseaseDetail.as_view(), name="lgd"),
+    path('lgd/<str:stable_id>/history/', views.LocusGenotypeDiseaseHistory.as_view(), name="lgd_history"),
+    path('lgds/', views.LocusGenotypeDiseaseBatchDetail.as_view(), name="lgd_batch"),
     path('search/', views.SearchView.as_view(), name="search"),
+    path('stats/', views.DatasetStatistics.as_view(), name="stats"),
 
     ### Endpoints to add data ###
     path('add/disease/', views.AddDisease.as_view(), name="add_disease"),
@@ -1,6 +1,15 @@
-from .disease_utils import clean_string, get_ontology, clean_omim_disease, get_ontology_source
+from .disease_utils import (clean_string, get_ontology, clean_omim_disease, get_ontology_source,
+                            disease_suggestion_index, disease_resolver)
 from .publication_utils import get_publication, get_authors
-from .locus_utils import validate_gene
+from .locus_utils import validate_gene, gene_index, region_index, clean_chromosome
 from .phenotype_utils import validate_phenotype
-from .user_utils import CustomMail
+from .user_utils import CustomMail, AuthContext, get_auth_context, auth_from_serializer_context
 from .date_utils import get_date_now
+from .panel_utils import panel_index, build_gene_panel_matrix, CONFIDENCE_LEVELS
+from .lgd_utils import (get_cached_record, set_cached_record, bump_record_version,
+                        get_cached_record_version, set_cached_record_version,
+                        get_record_audience, get_records_etag,
+                        get_contributor_models, add_contributors, get_record_history)
+from .vcf_utils import open_text_stream, get_vcf_intervals, annotate_vcf
+from .stats_utils import refresh_stats, schedule_stats_update
+from .request_utils import read_id_list
@@ -3,7 +3,13 @@
 import os
 import sys
 import re
+import math
 import requests
+import numpy as np
+from collections import Counter
+from django.db.models import Q
+
+from .index_utils import ProcessIndex
 
 def latin2arab(match):
     latin = match.group(1)
@@ -128,4 +134,180 @@ def get_ontology_source(id):
     elif id.isdigit():
         source = "OMIM"
 
-    return source
\ No newline at end of file
+    return source
+
+
+def get_trigrams(name):
+    """
+        Returns the character trigrams of the cleaned name (with counts).
+        The name is padded so the first and last letters of each word are
+        part of more trigrams.
+    """
+    padded = f"  {name} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class DiseaseSuggestionIndex(ProcessIndex):
+    """
+        Character trigram TF-IDF index of the disease names and synonyms.
+        It is used to suggest existing diseases similar to a new disease name.
+
+        The index stores for each trigram the names containing it and the
+        trigram weight (TF-IDF) in the name vector, the name vectors are L2
+        normalised: the similarity of two names is the dot product of their
+        vectors (cosine similarity).
+        The names are normalised with clean_string() before the trigrams are extracted.
+    """
+    cache_key = "disease_suggestion_index"
+
+    def build(self):
+        from ..models import Disease, DiseaseSynonym
+
+        disease_names = {}
+        documents = [] # (disease id, name or synonym, is synonym)
+        document_trigrams = []
+
+        for disease_id, name, cleaned_name in Disease.objects.values_list('id', 'name', 'cleaned_name').iterator():
+            disease_names[disease_id] = name
+            documents.append((disease_id, name, False))
+            document_trigrams.append(get_trigrams(cleaned_name or clean_string(name)))
+
+        synonyms = DiseaseSynonym.objects.values_list('disease_id', 'synonym', 'cleaned_name')
+        for disease_id, synonym, cleaned_name in synonyms.iterator():
+            documents.append((disease_id, synonym, True))
+            document_trigrams.append(get_trigrams(cleaned_name or clean_string(synonym)))
+
+        postings = {}
+        for document, trigrams in enumerate(document_trigrams):
+            for trigram, count in trigrams.items():
+                postings.setdefault(trigram, []).append((document, count))
+
+        total = len(documents)
+        idf = {trigram: math.log((total + 1) / (len(docs) + 1)) + 1 for trigram, docs in postings.items()}
+
+        norms = np.zeros(total)
+        for trigram, docs in postings.items():
+            for document, count in docs:
+                norms[document] += (count * idf[trigram]) ** 2
+        norms = np.sqrt(norms)
+        norms[norms == 0] = 1
+
+        index = {}
+        for trigram, docs in postings.items():
+            document_ids = np.array([document for document, _ in docs], dtype=np.int32)
+            weights = np.array([count for _, count in docs], dtype=np.float32) * idf[trigram] / norms[document_ids]
+            index[trigram] = (document_ids, weights.astype(np.float32))
+
+        return {
+            "documents": documents,
+            "disease_names": disease_names,
+            "postings": index,
+            "idf": idf,
+            "total": total,
+        }
+
+    def suggest(self, name, limit=10):
+        """
+            Returns the diseases with a name or synonym similar to the input name.
+
+            Args:
+                (str) name: disease name
+                (int) limit: maximum number of diseases
+
+            Returns:
+                (list) diseases sorted by similarity (best first):
+                        - id: disease id
+                        - name: disease name
+                        - matched_name: disease name or synonym similar to the input name
+                        - is_synonym: the matched name is a synonym
+                        - score: cosine similarity (0 to 1)
+        """
+        index = self.get()
+        if not index["total"]:
+            return []
+
+        query = get_trigrams(clean_string(name))
+        # Trigrams not found in the index have the highest IDF
+        default_idf = math.log(index["total"] + 1) + 1
+        query_weights = {trigram: count * index["idf"].get(trigram, default_idf) for trigram, count in query.items()}
+        query_norm = math.sqrt(sum(weight ** 2 for weight in query_weights.values())) or 1
+
+        scores = np.zeros(index["total"], dtype=np.float32)
+        for trigram, weight in query_weights.items():
+            if trigram in index["postings"]:
+                document_ids, weights = index["postings"][trigram]
+                scores[document_ids] += weights * (weight / query_norm)
+
+        # Keep more names than the limit: a disease can match with its name and synonyms
+        candidates = min(limit * 5, index["total"])
+        top = np.argpartition(-scores, candidates - 1)[:candidates]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        results = {}
+        for document in top.tolist():
+            score = float(scores[document])
+            if score <= 0 or len(results) == limit:
+                break
+
+            disease_id, matched_name, is_synonym = index["documents"][document]
+            if disease_id not in results:
+                results[disease_id] = {
+                    "id": disease_id,
+                    "name": index["disease_names"].get(disease_id),
+                    "matched_name": matched_name,
+                    "is_synonym": is_synonym,
+                    "score": round(score, 3)
+                }
+
+        return list(results.values())
+
+
+disease_suggestion_index = DiseaseSuggestionIndex()
+
+
+class DiseaseResolver(ProcessIndex):
+    """
+        Resolves a disease name, disease synonym or ontology ID (Mondo, OMIM)
+        to the disease id.
+
+        Each input is resolved with one query, the result (including misses)
+        is cached in the process until the next disease write.
+    """
+    cache_key = "disease_resolver"
+    max_size = 10000
+
+    def build(self):
+        return {}
+
+    def resolve(self, name):
+        """
+            Returns the disease id or None if the disease is not found.
+
+            Args:
+                (str) name: disease name, disease synonym, Mondo ID or OMIM ID (only digits)
+        """
+        from ..models import Disease, DiseaseOntologyTerm
+
+        resolved = self.get()
+        if name in resolved:
+            return resolved[name]
+
+        if name.startswith('MONDO') or name.isdigit():
+            queryset = DiseaseOntologyTerm.objects.filter(
+                ontology_term__accession=name
+            ).order_by('ontology_term_id', 'id').values_list('disease_id', flat=True)
+        else:
+            queryset = Disease.objects.filter(
+                Q(name=name) | Q(diseasesynonym__synonym=name)
+            ).order_by('id').values_list('id', flat=True)
+
+        disease_id = queryset.first()
+
+        if len(resolved) >= self.max_size:
+            resolved.clear()
+        resolved[name] = disease_id
+
+        return disease_id
+
+
+disease_resolver = DiseaseResolver()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import abc
+import threading
+import uuid
+from django.core.cache import cache
+from django.db import transaction
+
+
+class ProcessIndex(abc.ABC):
+    """
+        Base class for the in-memory indexes kept by each process.
+
+        The index is built from the database on first access and rebuilt
+        lazily on the next access after invalidate() is called.
+        The index generation is stored in the Django cache: an invalidation
+        done by one process is seen by all the processes sharing the cache.
+        Note: the default cache (local memory) is not shared between processes.
+
+        Subclasses define:
+            (str) cache_key: key used to store the generation of the index
+            build(): returns the index data
+    """
+    cache_key = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = None
+        self._generation = None
+
+    @abc.abstractmethod
+    def build(self):
+        """
+            Returns the index data, built from the database.
+            It is called by get() with the index lock held, the data returned
+            is shared by all the threads of the process and must not be modified.
+        """
+
+    def generation(self):
+        """
+            Returns the current generation of the index.
+            It changes every time the index is invalidated, it can be used
+            to validate data built from the same tables (e.g. ETag).
+        """
+        return cache.get_or_set(self.cache_key, uuid.uuid4().hex, timeout=None)
+
+    def get(self):
+        """
+            Returns the index data, rebuilding it if the index was invalidated.
+        """
+        generation = self.generation()
+
+        with self._lock:
+            if self._data is None or self._generation != generation:
+                self._data = self.build()
+                self._generation = generation
+
+            return self._data
+
+    def invalidate(self):
+        """
+            Marks the index as stale in all processes.
+            The index is invalidated now (current process) and again once the
+            transaction is committed, so other processes do not keep an index
+            rebuilt from uncommitted data.
+        """
+        self._new_generation()
+        transaction.on_commit(self._new_generation)
+
+    def _new_generation(self):
+        cache.set(self.cache_key, uuid.uuid4().hex, timeout=None)
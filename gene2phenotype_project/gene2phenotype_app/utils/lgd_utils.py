@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+
+import heapq
+import itertools
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q, Count, Sum
+
+
+# Cached JSON of the records expires after one day
+RECORD_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_record_audience(user):
+    """
+        Returns the audience of the record data: 'curator' or 'anonymous'.
+        The record data is different for curators (all comments, curators names).
+    """
+    return "curator" if user.is_authenticated else "anonymous"
+
+def get_records_etag(queryset):
+    """
+        Returns the value used to validate the cached data of a list of records.
+        Any update to the records increments the sum of the versions.
+
+        Args:
+            queryset: LocusGenotypeDisease queryset
+
+        Returns:
+            (str) etag: number of records and sum of the versions
+    """
+    data = queryset.aggregate(
+        total=Count('id'),
+        version=Sum('version')
+    )
+
+    return f"{data['total']}-{data['version'] or 0}"
+
+def get_record_cache_key(stable_id, audience, version):
+    return f"lgd:{stable_id}:{audience}:{version}"
+
+def get_record_version_cache_key(stable_id):
+    return f"lgd_version:{stable_id}"
+
+def get_cached_record_version(stable_id):
+    """
+        Returns the cached version (int) of the record or None if it is not cached.
+        The version is cached with the record JSON: a cache hit does not query the database.
+        It is replaced by bump_record_version() when the record is updated.
+    """
+    return cache.get(get_record_version_cache_key(stable_id))
+
+def set_cached_record_version(stable_id, version):
+    """
+        Stores the version of the record read from the database.
+        The value is only added if it is not cached: a version stored meanwhile
+        by bump_record_version() is more recent.
+    """
+    cache.add(get_record_version_cache_key(stable_id), version, timeout=RECORD_CACHE_TIMEOUT)
+
+def get_cached_record(stable_id, audience, version):
+    """
+        Returns the cached JSON of the record or None if the record is not cached.
+        The JSON is cached for each version of the record: when the record
+        is updated its version changes and the old JSON is not used again.
+
+        Args:
+            (str) stable_id: G2P stable ID
+            (str) audience: 'anonymous' or 'curator'
+            (int) version: record version (column 'version')
+    """
+    return cache.get(get_record_cache_key(stable_id, audience, version))
+
+def set_cached_record(stable_id, audience, version, content):
+    """
+        Stores the JSON of the record.
+        The version has to be read before the record is loaded from the database,
+        if the record is updated meanwhile the JSON is stored under the old version.
+    """
+    cache.set(get_record_cache_key(stable_id, audience, version), content, timeout=RECORD_CACHE_TIMEOUT)
+
+def bump_record_version(queryset):
+    """
+        Increments the version of the records in the queryset.
+        The cached JSON of the records is stored under the version,
+        it is not used again once the transaction is committed.
+        The cached versions are removed now and replaced by the new
+        versions once the transaction is committed.
+
+        Args:
+            queryset: LocusGenotypeDisease queryset
+    """
+    from ..models import LocusGenotypeDisease
+
+    records = LocusGenotypeDisease.objects.filter(id__in=list(queryset.values_list('id', flat=True)))
+    records.update(version=F('version') + 1)
+
+    stable_ids = list(records.values_list('stable_id__stable_id', flat=True))
+    cache.delete_many([get_record_version_cache_key(stable_id) for stable_id in stable_ids])
+
+    def update_cached_versions():
+        # A request could have cached the old version before the commit
+        versions = records.values_list('stable_id__stable_id', 'version')
+        cache.set_many({
+            get_record_version_cache_key(stable_id): version for stable_id, version in versions
+        }, timeout=RECORD_CACHE_TIMEOUT)
+
+    if stable_ids:
+        transaction.on_commit(update_cached_versions)
+
+def get_contributor_models():
+    """
+        Returns the models with history used to find the curators of a record.
+        Each model is associated with the field that links it to the LGD record.
+    """
+    from ..models import (LocusGenotypeDisease, LGDCrossCuttingModifier, LGDPanel,
+                          LGDPhenotype, LGDPublication, LGDVariantGenccConsequence,
+                          LGDVariantType, LGDVariantTypeDescription)
+
+    return {
+        LocusGenotypeDisease: "id",
+        LGDCrossCuttingModifier: "lgd_id",
+        LGDPanel: "lgd_id",
+        LGDPhenotype: "lgd_id",
+        LGDPublication: "lgd_id",
+        LGDVariantGenccConsequence: "lgd_id",
+        LGDVariantType: "lgd_id",
+        LGDVariantTypeDescription: "lgd_id",
+    }
+
+def add_contributors(contributors):
+    """
+        Adds users to the list of curators of the records.
+        Users already linked to the record are ignored.
+
+        Args:
+            contributors: iterable of (lgd id, user id)
+    """
+    from ..models import LGDContributor
+
+    LGDContributor.objects.bulk_create(
+        [LGDContributor(lgd_id=lgd_id, user_id=user_id) for lgd_id, user_id in contributors],
+        batch_size=1000,
+        ignore_conflicts=True
+    )
+
+# Record fields displayed in the history when the record is updated
+RECORD_HISTORY_FIELDS = {
+    "locus": "locus__name",
+    "genotype": "genotype__value",
+    "disease": "disease__name",
+    "confidence": "confidence__value",
+    "confidence_support": "confidence_support",
+    "molecular_mechanism": "mechanism__value",
+    "mechanism_support": "mechanism_support__value",
+    "is_reviewed": "is_reviewed",
+    "is_deleted": "is_deleted",
+}
+
+def get_history_models():
+    """
+        Returns the models included in the history of a record.
+        Each model is associated with its data type and with the field used
+        to describe the change (None for the record itself).
+        The order of the models is used to sort changes with the same date.
+    """
+    from ..models import (LocusGenotypeDisease, LGDCrossCuttingModifier, LGDMolecularMechanismEvidence,
+                          LGDMolecularMechanismSynopsis, LGDPanel, LGDPhenotype, LGDPhenotypeSummary,
+                          LGDPublication, LGDVariantGenccConsequence, LGDVariantType, LGDVariantTypeDescription)
+
+    return {
+        LocusGenotypeDisease: ("record", None),
+        LGDPanel: ("panel", "panel__name"),
+        LGDPublication: ("publication", "publication__pmid"),
+        LGDPhenotype: ("phenotype", "phenotype__accession"),
+        LGDPhenotypeSummary: ("phenotype_summary", "summary"),
+        LGDVariantType: ("variant_type", "variant_type_ot__term"),
+        LGDVariantTypeDescription: ("variant_description", "description"),
+        LGDVariantGenccConsequence: ("variant_consequence", "variant_consequence__term"),
+        LGDCrossCuttingModifier: ("cross_cutting_modifier", "ccm__value"),
+        LGDMolecularMechanismSynopsis: ("mechanism_synopsis", "synopsis__value"),
+        LGDMolecularMechanismEvidence: ("mechanism_evidence", "evidence__value"),
+    }
+
+def encode_history_cursor(position):
+    """
+        Encodes the position (history_date, data type, history_id) of the
+        last change of a page.
+    """
+    history_date, data_type, history_id = position
+    value = f"{history_date.isoformat()}|{data_type}|{history_id}"
+
+    return urlsafe_b64encode(value.encode()).decode()
+
+def decode_history_cursor(cursor):
+    """
+        Returns the position encoded by encode_history_cursor().
+        Raises ValueError if the cursor is invalid.
+    """
+    try:
+        history_date, data_type, history_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(history_date), data_type, int(history_id)
+    except (TypeError, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
+
+def get_history_action(row):
+    if row["history_type"] == "+":
+        return "created"
+    if row["history_type"] == "-" or row["is_deleted"]:
+        return "deleted"
+    return "updated"
+
+def get_history_user(row):
+    if row["history_user__first_name"] is None:
+        return None
+    return f"{row['history_user__first_name']} {row['history_user__last_name']}"
+
+def get_record_history(lgd_id, limit, cursor=None):
+    """
+        Returns the changes made to the record and to its data, newest first.
+
+        Each history table is read in (history_date, history_id) descending order,
+        starting after the cursor, and the streams are merged with a k-way merge.
+        Each table only returns the rows of the page (at most limit + 1), the
+        queries use the (lgd_id, history_date) indexes of the history tables.
+
+        Args:
+            (int) lgd_id: LGD record id
+            (int) limit: maximum number of changes to return
+            (str) cursor: position of the last change of the previous page (optional)
+
+        Returns:
+            (list) changes: list of changes
+            (str) next_cursor: cursor of the next page or None if it is the last page
+
+        Raises:
+            ValueError if the cursor is invalid
+    """
+    history_models = get_history_models()
+    data_types = [data_type for data_type, _ in history_models.values()]
+    position = None
+
+    if cursor is not None:
+        position = decode_history_cursor(cursor)
+        if position[1] not in data_types:
+            raise ValueError(f"Invalid cursor '{cursor}'")
+        cursor_index = data_types.index(position[1])
+
+    streams = []
+    for index, (model, (data_type, value_field)) in enumerate(history_models.items()):
+        lgd_field = "id" if value_field is None else "lgd_id"
+        queryset = model.history.filter(**{lgd_field: lgd_id})
+
+        if position is not None:
+            # Changes after the cursor: sorted by (history_date, table, history_id) descending
+            history_date, _, history_id = position
+            if index < cursor_index:
+                queryset = queryset.filter(history_date__lte=history_date)
+            elif index == cursor_index:
+                queryset = queryset.filter(Q(history_date__lt=history_date) |
+                                           Q(history_date=history_date, history_id__lt=history_id))
+            else:
+                queryset = queryset.filter(history_date__lt=history_date)
+
+        fields = ["history_id", "history_date", "history_type", "is_deleted",
+                  "history_user__first_name", "history_user__last_name"]
+        if value_field is None:
+            fields.extend(RECORD_HISTORY_FIELDS.values())
+            # One more row is needed to find the fields updated by the last change
+            rows = queryset.order_by("-history_date", "-history_id").values(*fields)[:limit + 2]
+            streams.append(iter_record_changes(rows, index, data_type))
+        else:
+            fields.append(value_field)
+            rows = queryset.order_by("-history_date", "-history_id").values(*fields)[:limit + 1]
+            streams.append(iter_data_changes(rows, index, data_type, value_field))
+
+    merged = heapq.merge(*streams, key=lambda change: change[0], reverse=True)
+    page = list(itertools.islice(merged, limit + 1))
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        history_date, index, history_id = page[-1][0]
+        next_cursor = encode_history_cursor((history_date, data_types[index], history_id))
+
+    return [change for _, change in page], next_cursor
+
+def iter_record_changes(rows, index, data_type):
+    """
+        Yields the changes of the record (LocusGenotypeDisease history).
+        Updates list the fields that changed since the previous version.
+    """
+    rows = list(rows)
+
+    for row, previous_row in itertools.zip_longest(rows, rows[1:]):
+        change = {
+            "date": row["history_date"],
+            "user": get_history_user(row),
+            "data_type": data_type,
+            "action": get_history_action(row),
+            "value": None,
+        }
+
+        if row["history_type"] == "~" and previous_row is not None:
+            change["changes"] = {
+                name: row[field] for name, field in RECORD_HISTORY_FIELDS.items()
+                if row[field] != previous_row[field]
+            }
+
+        yield (row["history_date"], index, row["history_id"]), change
+
+def iter_data_changes(rows, index, data_type, value_field):
+    """
+        Yields the changes of data linked to the record (panels, publications, etc.).
+    """
+    for row in rows:
+        yield (row["history_date"], index, row["history_id"]), {
+            "date": row["history_date"],
+            "user": get_history_user(row),
+            "data_type": data_type,
+            "action": get_history_action(row),
+            "value": row[value_field],
+        }
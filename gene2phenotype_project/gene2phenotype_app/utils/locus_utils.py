@@ -3,6 +3,9 @@
 import os
 import sys
 import requests
+import numpy as np
+
+from .index_utils import ProcessIndex
 
 def query_ensembl(url):
     r = requests.get(url, headers={ "Content-Type" : "application/json"})
@@ -46,4 +49,131 @@ def validate_gene(gene_name):
                                                   'disease':pheno['description'] })
 
     
-    return validated
\ No newline at end of file
+    return validated
+
+
+class GeneIndex(ProcessIndex):
+    """
+        Gene name index.
+        Maps the gene symbols, gene synonyms and gene identifiers
+        (HGNC, Ensembl, OMIM) to the locus id.
+        The names are case insensitive.
+    """
+    cache_key = "gene_index"
+
+    def build(self):
+        from ..models import Locus, LocusAttrib, LocusIdentifier
+
+        symbols = {}
+        synonyms = {}
+        identifiers = {}
+
+        genes = Locus.objects.filter(type__type__code='locus_type', type__value='gene').order_by('id')
+        for name, locus_id in genes.values_list('name', 'id').iterator():
+            symbols.setdefault(name.upper(), locus_id)
+
+        locus_attribs = LocusAttrib.objects.filter(attrib_type__code='gene_synonym', is_deleted=0).order_by('id')
+        for value, locus_id in locus_attribs.values_list('value', 'locus_id').iterator():
+            synonyms.setdefault(value.upper(), locus_id)
+
+        locus_identifiers = LocusIdentifier.objects.order_by('id')
+        for identifier, locus_id in locus_identifiers.values_list('identifier', 'locus_id').iterator():
+            identifiers.setdefault(identifier.upper(), locus_id)
+
+        return symbols, synonyms, identifiers
+
+    def resolve(self, name):
+        """
+            Returns the locus id of the gene or None if the gene is not found.
+            The gene symbols take precedence over the synonyms and the identifiers.
+
+            Args:
+                (str) name: gene symbol, gene synonym or gene identifier
+        """
+        key = name.upper()
+
+        for names in self.get():
+            if key in names:
+                return names[key]
+
+        return None
+
+
+gene_index = GeneIndex()
+
+
+def clean_chromosome(name):
+    """
+        Returns the chromosome name as stored in the sequence table.
+        Example: 'chr1' -> '1', 'chrx' -> 'X'
+    """
+    name = name.strip()
+    if name[:3].lower() == "chr":
+        name = name[3:]
+
+    return name.upper()
+
+
+class RegionIndex(ProcessIndex):
+    """
+        Genomic interval index of the loci.
+        For each chromosome the loci are sorted by start and the index stores:
+            - starts: locus start (sorted)
+            - ends: locus end
+            - max_ends: maximum end of the loci up to each position
+            - ids: locus id
+        max_ends is sorted, the loci overlapping a region are found with two
+        binary searches: the loci after the last start <= region end cannot
+        overlap and the loci before the first max_end >= region start
+        cannot overlap either.
+    """
+    cache_key = "region_index"
+
+    def build(self):
+        from ..models import Locus
+
+        loci = {}
+        queryset = Locus.objects.values_list('sequence__name', 'start', 'end', 'id')
+
+        for chromosome, start, end, locus_id in queryset.iterator():
+            loci.setdefault(clean_chromosome(chromosome), []).append((start, end, locus_id))
+
+        index = {}
+        for chromosome, intervals in loci.items():
+            intervals.sort()
+            data = np.array(intervals, dtype=np.int64)
+            index[chromosome] = {
+                "starts": data[:, 0],
+                "ends": data[:, 1],
+                "max_ends": np.maximum.accumulate(data[:, 1]),
+                "ids": data[:, 2],
+            }
+
+        return index
+
+    def overlap(self, chromosome, start, end):
+        """
+            Returns the loci overlapping the region.
+
+            Args:
+                (str) chromosome: chromosome name (with or without 'chr' prefix)
+                (int) start: region start (1-based, inclusive)
+                (int) end: region end (inclusive)
+
+            Returns:
+                (list) locus ids sorted by locus start
+        """
+        data = self.get().get(clean_chromosome(chromosome))
+        if data is None:
+            return []
+
+        first = np.searchsorted(data["max_ends"], start, side="left")
+        last = np.searchsorted(data["starts"], end, side="right")
+        if first >= last:
+            return []
+
+        candidates = slice(first, last)
+        return data["ids"][candidates][data["ends"][candidates] >= start].tolist()
+
+
+region_index = RegionIndex()
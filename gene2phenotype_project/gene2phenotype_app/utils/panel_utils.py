@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+import numpy as np
+
+from .index_utils import ProcessIndex
+
+
+# Confidence values ordered from the lowest to the highest
+# The code of each value is its position in the list (0 = no record)
+CONFIDENCE_LEVELS = ["", "refuted", "disputed", "limited", "moderate", "strong", "definitive"]
+
+
+def ids_to_bitset(ids):
+    """
+        Converts a list of integer IDs into a bitset (python int).
+        Bit N is set if ID N is in the list.
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+
+    buffer = bytearray(max(ids) // 8 + 1)
+    for id in ids:
+        buffer[id >> 3] |= 1 << (id & 7)
+
+    return int.from_bytes(buffer, "little")
+
+def bitset_to_ids(bitset):
+    """
+        Returns the sorted list of IDs set in the bitset.
+    """
+    ids = []
+    data = bitset.to_bytes((bitset.bit_length() + 7) // 8, "little")
+
+    for byte_index, byte in enumerate(data):
+        if byte:
+            for bit in range(8):
+                if byte >> bit & 1:
+                    ids.append(byte_index * 8 + bit)
+
+    return ids
+
+def build_gene_panel_matrix(rows):
+    """
+        Builds the gene x panel matrix with the best confidence per cell.
+
+        Args:
+            rows: iterable of (gene symbol, panel name, confidence value)
+
+        Returns:
+            (list) genes: sorted gene symbols (matrix rows)
+            (list) panels: sorted panel names (matrix columns)
+            (numpy.ndarray) matrix: confidence codes, see CONFIDENCE_LEVELS
+
+        Raises:
+            ValueError: the confidence is not in CONFIDENCE_LEVELS
+    """
+    confidence_codes = {value: code for code, value in enumerate(CONFIDENCE_LEVELS)}
+    genes = {}
+    panels = {}
+    row_index = []
+    column_index = []
+    values = []
+
+    for gene, panel, confidence in rows:
+        row_index.append(genes.setdefault(gene, len(genes)))
+        column_index.append(panels.setdefault(panel, len(panels)))
+        if confidence not in confidence_codes:
+            raise ValueError(f"Unknown confidence '{confidence}' for gene '{gene}' in panel '{panel}'")
+        values.append(confidence_codes[confidence])
+
+    matrix = np.zeros((len(genes), len(panels)), dtype=np.int8)
+    # Keeps the maximum value when the same cell is set more than once
+    np.maximum.at(matrix, (np.array(row_index, dtype=np.intp), np.array(column_index, dtype=np.intp)),
+                  np.array(values, dtype=np.int8))
+
+    gene_names = sorted(genes)
+    panel_names = sorted(panels)
+    matrix = matrix[np.ix_([genes[gene] for gene in gene_names], [panels[panel] for panel in panel_names])]
+
+    return gene_names, panel_names, matrix
+
+
+class PanelIndex(ProcessIndex):
+    """
+        Panel membership index.
+        For each panel it stores bitsets of the LGD records (LGD id)
+        and of the genes (locus id) linked to the panel.
+        Two sets are kept for each panel:
+            - all: all the records (authenticated users)
+            - reviewed: only reviewed records (non-authenticated users)
+
+        Set operations between panels are done with bitwise operations.
+    """
+    cache_key = "panel_index"
+
+    operations = {
+        "intersection": lambda a, b: a & b,
+        "difference": lambda a, b: a & ~b,
+        "union": lambda a, b: a | b,
+    }
+
+    def build(self):
+        from ..models import LGDPanel
+
+        panel_records = {}
+        queryset = LGDPanel.objects.filter(
+            is_deleted=0,
+            lgd__is_deleted=0
+        ).values_list('panel__name', 'lgd_id', 'lgd__locus_id', 'lgd__is_reviewed')
+
+        for panel_name, lgd_id, locus_id, is_reviewed in queryset.iterator():
+            data = panel_records.setdefault(panel_name, {
+                "all": ([], []),
+                "reviewed": ([], [])
+            })
+            data["all"][0].append(lgd_id)
+            data["all"][1].append(locus_id)
+            if is_reviewed == 1:
+                data["reviewed"][0].append(lgd_id)
+                data["reviewed"][1].append(locus_id)
+
+        index = {}
+        for panel_name, data in panel_records.items():
+            index[panel_name] = {
+                group: {
+                    "records": ids_to_bitset(lgd_ids),
+                    "genes": ids_to_bitset(locus_ids)
+                } for group, (lgd_ids, locus_ids) in data.items()
+            }
+
+        return index
+
+    def compare(self, panel_a, panel_b, operation, data_type="records", reviewed_only=True):
+        """
+            Compares two panels.
+
+            Args:
+                (str) panel_a: panel name
+                (str) panel_b: panel name
+                (str) operation: 'intersection', 'difference' (a - b) or 'union'
+                (str) data_type: 'records' or 'genes'
+                (bool) reviewed_only: only include reviewed records
+
+            Returns:
+                (list) sorted list of LGD ids (records) or locus ids (genes)
+        """
+        index = self.get()
+        group = "reviewed" if reviewed_only else "all"
+        empty = {"records": 0, "genes": 0}
+
+        bitset_a = index.get(panel_a, {}).get(group, empty)[data_type]
+        bitset_b = index.get(panel_b, {}).get(group, empty)[data_type]
+
+        return bitset_to_ids(self.operations[operation](bitset_a, bitset_b))
+
+
+panel_index = PanelIndex()
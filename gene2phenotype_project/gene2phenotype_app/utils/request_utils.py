@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+import io
+import re
+
+
+def read_id_list(request, field):
+    """
+        Returns the list of identifiers (gene names, gene IDs, PMIDs) uploaded by the user.
+        The identifiers can be uploaded as a text or CSV/TSV file ('file')
+        or sent as a list or as text in the request data.
+        The identifiers can be separated by new lines, commas, semicolons, tabs or spaces,
+        lines starting with '#' are ignored.
+
+        Args:
+            request: HTTP request
+            (str) field: request data field with the identifiers (if there is no file)
+
+        Returns:
+            (list) identifiers without duplicates, in the input order
+    """
+    if 'file' in request.FILES:
+        text = io.TextIOWrapper(request.FILES['file'], encoding='utf-8', errors='replace').read()
+    else:
+        values = request.data.get(field, '')
+        text = "\n".join(str(value) for value in values) if isinstance(values, list) else str(values)
+
+    identifiers = []
+    for line in text.splitlines():
+        if not line.startswith('#'):
+            identifiers.extend(value for value in re.split(r"[\s,;]+", line) if value)
+
+    # Remove duplicates and keep the input order
+    return list(dict.fromkeys(identifiers))
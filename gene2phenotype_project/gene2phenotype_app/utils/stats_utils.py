@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+import threading
+from collections import Counter
+from django.db import transaction
+
+from .date_utils import get_date_now
+
+
+# Categories of the dataset stats and the field used to group the records
+# The variant consequences are read from a separate table
+STATS_CATEGORIES = {
+    'confidence': 'confidence__value',
+    'mechanism': 'mechanism__value',
+    'genotype': 'genotype__value',
+}
+
+# Records changed in the current transaction (one set per thread)
+_pending = threading.local()
+
+
+def get_public_records():
+    """
+        Returns the records counted in the stats: reviewed records
+        linked to at least one visible panel.
+    """
+    from ..models import LocusGenotypeDisease
+
+    return LocusGenotypeDisease.objects.filter(
+        is_deleted=0,
+        is_reviewed=1,
+        lgdpanel__is_deleted=0,
+        lgdpanel__panel__is_visible=1
+    )
+
+def get_stats_contributions(lgd_ids=None):
+    """
+        Returns the contribution of the public records to the stats.
+
+        Args:
+            (set) lgd_ids: only calculate the contribution of these records (default: all records)
+
+        Returns:
+            (list) DatasetStatsRecord objects (not saved)
+    """
+    from ..models import DatasetStatsRecord, LGDVariantGenccConsequence
+
+    queryset = get_public_records()
+    if lgd_ids is not None:
+        queryset = queryset.filter(id__in=lgd_ids)
+
+    fields = list(STATS_CATEGORIES.values())
+    contributions = []
+    public_ids = []
+
+    for lgd_id, locus_id, *values in queryset.values_list('id', 'locus_id', *fields).distinct().iterator():
+        public_ids.append(lgd_id)
+        contributions.append(DatasetStatsRecord(lgd_id=lgd_id, category='total', value='records'))
+        contributions.append(DatasetStatsRecord(lgd_id=lgd_id, category='gene', value=str(locus_id)))
+
+        for category, value in zip(STATS_CATEGORIES, values):
+            if value is not None:
+                contributions.append(DatasetStatsRecord(lgd_id=lgd_id, category=category, value=value))
+
+    consequences = LGDVariantGenccConsequence.objects.filter(is_deleted=0)
+    if lgd_ids is not None:
+        consequences = consequences.filter(lgd_id__in=public_ids)
+    else:
+        consequences = consequences.filter(lgd__in=get_public_records().values('id'))
+
+    rows = consequences.values_list('lgd_id', 'variant_consequence__term').distinct()
+    for lgd_id, term in rows.iterator():
+        contributions.append(DatasetStatsRecord(lgd_id=lgd_id, category='variant_consequence', value=term))
+
+    return contributions
+
+def refresh_stats():
+    """
+        Recalculates the stats of all the records and replaces the rollup rows.
+        Called by the command refresh_dataset_stats.
+    """
+    from ..models import DatasetStats, DatasetStatsRecord
+
+    date_now = get_date_now()
+    contributions = get_stats_contributions()
+
+    counts = Counter(
+        (contribution.category, contribution.value)
+        for contribution in contributions if contribution.category != 'gene'
+    )
+    genes = {contribution.value for contribution in contributions if contribution.category == 'gene'}
+
+    rows = [
+        DatasetStats(category='total', value='records', count=counts.pop(('total', 'records'), 0), date_update=date_now),
+        DatasetStats(category='total', value='genes', count=len(genes), date_update=date_now)
+    ]
+    for (category, value), count in counts.items():
+        rows.append(DatasetStats(category=category, value=value, count=count, date_update=date_now))
+
+    with transaction.atomic():
+        DatasetStats.objects.all().delete()
+        DatasetStats.objects.bulk_create(rows)
+        DatasetStatsRecord.objects.all().delete()
+        DatasetStatsRecord.objects.bulk_create(contributions, batch_size=1000)
+
+def update_stats(lgd_ids):
+    """
+        Updates the rollup rows with the changes of the records.
+        The old contribution of the records is replaced by the new one
+        and the difference is applied to the rollup counts.
+        Nothing is done until the rollup is created by refresh_stats().
+
+        Args:
+            (set) lgd_ids: records that changed
+    """
+    from ..models import DatasetStats, DatasetStatsRecord
+
+    with transaction.atomic():
+        # Lock the rollup rows, another process could be updating the same counts
+        stats = {(row.category, row.value): row for row in DatasetStats.objects.select_for_update()}
+
+        if ('total', 'records') not in stats:
+            return
+
+        old_contributions = DatasetStatsRecord.objects.filter(lgd_id__in=lgd_ids)
+        old = list(old_contributions.values_list('category', 'value'))
+        new_contributions = get_stats_contributions(lgd_ids)
+
+        genes = {value for category, value in old if category == 'gene'}
+        genes.update(contribution.value for contribution in new_contributions if contribution.category == 'gene')
+        gene_contributions = DatasetStatsRecord.objects.filter(category='gene', value__in=genes)
+        genes_before = gene_contributions.values('value').distinct().count()
+
+        old_contributions.delete()
+        DatasetStatsRecord.objects.bulk_create(new_contributions, batch_size=1000)
+        genes_after = gene_contributions.values('value').distinct().count()
+
+        delta = Counter(
+            (contribution.category, contribution.value)
+            for contribution in new_contributions if contribution.category != 'gene'
+        )
+        delta.subtract(key for key in old if key[0] != 'gene')
+        delta[('total', 'genes')] += genes_after - genes_before
+
+        date_now = get_date_now()
+        new_rows = []
+        for key, difference in delta.items():
+            if key in stats:
+                stats[key].count += difference
+            elif difference:
+                new_rows.append(DatasetStats(category=key[0], value=key[1], count=difference, date_update=date_now))
+
+        for row in stats.values():
+            row.date_update = date_now
+
+        # Values without records are removed, the totals are kept
+        empty_ids = [row.id for row in stats.values() if row.count <= 0 and row.category != 'total']
+        DatasetStats.objects.filter(id__in=empty_ids).delete()
+        DatasetStats.objects.bulk_update(
+            [row for row in stats.values() if row.id not in empty_ids], ['count', 'date_update']
+        )
+        DatasetStats.objects.bulk_create(new_rows)
+
+def schedule_stats_update(lgd_ids):
+    """
+        Updates the stats of the records after the current transaction is committed.
+        The records changed in the same transaction are collected and updated once:
+        the first callback updates all the pending records, the next ones have nothing to do.
+        If the transaction is rolled back, the pending records are updated
+        with the next transaction (the update recalculates their contribution).
+
+        Args:
+            lgd_ids: ids of the records that changed
+    """
+    if not hasattr(_pending, 'lgd_ids'):
+        _pending.lgd_ids = set()
+
+    _pending.lgd_ids.update(lgd_ids)
+    transaction.on_commit(update_pending_stats)
+
+def update_pending_stats():
+    lgd_ids = getattr(_pending, 'lgd_ids', None)
+    if not lgd_ids:
+        return
+
+    _pending.lgd_ids = set()
+    update_stats(lgd_ids)
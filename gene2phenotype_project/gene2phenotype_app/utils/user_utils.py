@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from email.message import EmailMessage
 from smtplib import SMTP
 from django.conf import settings
@@ -60,3 +61,66 @@ class CustomMail():
                 server.send_message(message)
         except Exception as e:
             return str(e)
+
+
+@dataclass(frozen=True)
+class AuthContext:
+    """
+        Data of the user who sent the request.
+        It is built once per request by get_auth_context().
+
+        Attributes:
+            user: User object or AnonymousUser
+            (bool) is_authenticated
+            (bool) is_superuser
+            (frozenset) panels: names of the panels the user can edit
+    """
+    user: object
+    is_authenticated: bool
+    is_superuser: bool
+    panels: frozenset
+
+    def can_edit_panels(self, panel_names):
+        """
+            Returns True if the user can edit all the panels in the list.
+        """
+        return all(panel_name in self.panels for panel_name in panel_names)
+
+def get_auth_context(request):
+    """
+        Returns the AuthContext of the request.
+        The context is built on first access and kept in the request.
+    """
+    from ..models import UserPanel
+
+    auth_context = getattr(request, "_auth_context", None)
+
+    if auth_context is None:
+        user = request.user
+
+        if user.is_authenticated:
+            panels = UserPanel.objects.filter(user=user, is_deleted=0).values_list('panel__name', flat=True)
+            auth_context = AuthContext(user, True, bool(user.is_superuser), frozenset(panels))
+        else:
+            auth_context = AuthContext(user, False, False, frozenset())
+
+        request._auth_context = auth_context
+
+    return auth_context
+
+def auth_from_serializer_context(context):
+    """
+        Returns the AuthContext sent by the view in the serializer context
+        (key 'auth_context'), it is used to select the data the user can read.
+        Serializers created without an AuthContext only see the public data.
+        Note: the serializers that write data still receive the user object
+        in the key 'user' (creator of the comments, publications, etc.).
+    """
+    from django.contrib.auth.models import AnonymousUser
+
+    auth_context = context.get("auth_context")
+
+    if auth_context is None:
+        auth_context = AuthContext(AnonymousUser(), False, False, frozenset())
+
+    return auth_context
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+import gzip
+import heapq
+import io
+import re
+
+from .locus_utils import clean_chromosome
+
+
+VCF_INFO_HEADER = ('##INFO=<ID=G2P,Number=.,Type=String,Description="G2P records overlapping the variant. '
+                   'Format: gene|stable_id|allelic_requirement|confidence">\n')
+
+# Characters not allowed in the INFO values
+INFO_INVALID_CHARACTERS = re.compile(r"[\s;=,|]")
+
+
+def open_text_stream(file_obj):
+    """
+        Returns a text stream reading the file, the file can be gzipped.
+        The compression is detected from the first bytes of the file.
+
+        Args:
+            file_obj: binary file object
+    """
+    stream = io.BufferedReader(file_obj) if not hasattr(file_obj, 'peek') else file_obj
+
+    if stream.peek(2)[:2] == b"\x1f\x8b":
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+
+    return io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+def get_vcf_intervals(queryset):
+    """
+        Returns the intervals used to annotate the VCF.
+        For each chromosome it returns a list of (start, end, annotation) sorted by start,
+        with one interval per locus linked to at least one record.
+
+        Args:
+            queryset: LocusGenotypeDisease queryset
+    """
+    loci = {}
+    rows = queryset.values_list(
+        'locus_id', 'locus__sequence__name', 'locus__start', 'locus__end', 'locus__name',
+        'stable_id__stable_id', 'genotype__value', 'confidence__value'
+    ).order_by('locus_id', 'stable_id__stable_id')
+
+    for locus_id, chromosome, start, end, name, stable_id, genotype, confidence in rows.iterator():
+        locus = loci.setdefault(locus_id, (clean_chromosome(chromosome), start, end, []))
+        values = (name, stable_id, genotype, confidence)
+        locus[3].append("|".join(INFO_INVALID_CHARACTERS.sub("_", str(value)) for value in values))
+
+    intervals = {}
+    for chromosome, start, end, annotations in loci.values():
+        intervals.setdefault(chromosome, []).append((start, end, ",".join(annotations)))
+
+    for chromosome_intervals in intervals.values():
+        chromosome_intervals.sort()
+
+    return intervals
+
+def annotate_vcf(lines, intervals):
+    """
+        Adds the G2P INFO field to the variants overlapping the intervals.
+
+        The variants are joined with the intervals with a sweep: the intervals
+        of the chromosome are visited once in start order, an interval is
+        active from the first variant after its start until the first variant
+        after its end. Only the active intervals are kept in memory (heap
+        ordered by end).
+        The VCF is expected to be sorted by position within each chromosome,
+        if a variant is before the previous one the sweep restarts from the
+        beginning of the chromosome.
+
+        Args:
+            lines: iterable of VCF lines
+            intervals: intervals by chromosome, see get_vcf_intervals()
+
+        Yields:
+            (str) VCF lines
+    """
+    chromosome = None
+    chromosome_intervals = []
+    next_interval = 0
+    active = []
+    previous_pos = 0
+    # The annotation of consecutive variants is often the same
+    last_key = None
+    last_annotation = None
+
+    for line in lines:
+        if line.startswith("#"):
+            if line.startswith("#CHROM"):
+                yield VCF_INFO_HEADER
+            yield line
+            continue
+
+        fields = line.split("\t", 8)
+        if len(fields) < 8:
+            yield line
+            continue
+
+        if fields[0] != chromosome:
+            chromosome = fields[0]
+            chromosome_intervals = intervals.get(clean_chromosome(chromosome), [])
+            next_interval = 0
+            active = []
+            previous_pos = 0
+            last_key = None
+
+        if not chromosome_intervals:
+            yield line
+            continue
+
+        pos = int(fields[1])
+        if pos < previous_pos:
+            # Unsorted input: restart the sweep
+            next_interval = 0
+            active = []
+        previous_pos = pos
+        end = pos + max(len(fields[3]), 1) - 1
+
+        while next_interval < len(chromosome_intervals) and chromosome_intervals[next_interval][0] <= end:
+            heapq.heappush(active, (chromosome_intervals[next_interval][1], next_interval))
+            next_interval += 1
+
+        while active and active[0][0] < pos:
+            heapq.heappop(active)
+
+        if not active:
+            yield line
+            continue
+
+        # Intervals added for a longer variant can start after the end of this variant
+        key = tuple(sorted(index for _, index in active if chromosome_intervals[index][0] <= end))
+        if not key:
+            yield line
+            continue
+
+        if key != last_key:
+            last_key = key
+            last_annotation = "G2P=" + ",".join(chromosome_intervals[index][2] for index in key)
+
+        info = fields[7].rstrip("\r\n")
+        fields[7] = last_annotation if info in ("", ".") else f"{info};{last_annotation}"
+        if len(fields) == 8:
+            fields[7] += "\n"
+
+        yield "\t".join(fields)
@@ -1,11 +1,13 @@
 from .base import BaseView, BaseAdd, BaseUpdate, ListEndpoints
 
 from .panel import (PanelList, PanelDetail, PanelRecordsSummary, 
-                    PanelDownload, LGDEditPanel)
+                    PanelDownload, LGDEditPanel, PanelCompare, PanelRecords,
+                    PanelMatrixDownload)
 
-from .locus import LocusGene, LocusGeneSummary, GeneFunction
+from .locus import (LocusGene, LocusGeneSummary, GeneFunction, LocusGenePage, LocusRegion,
+                    GeneListDownload, GeneIdentifierResolve)
 
-from .disease import GeneDiseaseView, DiseaseDetail, DiseaseSummary, AddDisease
+from .disease import GeneDiseaseView, DiseaseDetail, DiseaseSummary, DiseaseSuggestions, AddDisease
 
 from .curation import (AddCurationData, ListCurationEntries, CurationDataDetail,
                        UpdateCurationData, PublishRecord, DeleteCurationData)
@@ -17,13 +19,16 @@ from .attrib import AttribTypeList, AttribTypeDescriptionList, AttribList
 from .user import (UserList, CreateUserView, LoginView, ManageUserView,
                    UserPanels, LogOutView, CustomTokenRefreshView, ChangePasswordView, VerifyEmailView, ResetPasswordView)
 
-from .publication import PublicationDetail, AddPublication, LGDEditPublications
+from .publication import PublicationDetail, PublicationRecords, AddPublication, LGDEditPublications
 
 from .locus_genotype_disease import (ListMolecularMechanisms, VariantTypesList,
                                      LocusGenotypeDiseaseDetail, LGDEditCCM,
                                      LGDEditComment, LGDEditVariantConsequences,
                                      LGDEditVariantTypes, LGDEditVariantTypeDescriptions,
                                      LGDUpdateConfidence, LocusGenotypeDiseaseDelete,
-                                     LGDUpdateMechanism)
+                                     LGDUpdateMechanism, LocusGenotypeDiseaseBatchDetail,
+                                     LocusGenotypeDiseaseHistory)
 
-from .phenotype import AddPhenotype, PhenotypeDetail, LGDEditPhenotypes, LGDEditPhenotypeSummary
\ No newline at end of file
+from .phenotype import AddPhenotype, PhenotypeDetail, LGDEditPhenotypes, LGDEditPhenotypeSummary
+
+from .stats import DatasetStatistics
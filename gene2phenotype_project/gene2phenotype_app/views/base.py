@@ -3,14 +3,20 @@ from django.core.exceptions import PermissionDenied
 from django.http import Http404
 from rest_framework.response import Response
 from django.db import transaction
+from django.db.models import Q
 from django.urls import get_resolver
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
 from rest_framework.decorators import api_view
 from rest_framework.permissions import BasePermission
 from rest_framework.views import APIView
 
+import abc
 import re
 
-from gene2phenotype_app.models import User
+from gene2phenotype_app.models import LocusGenotypeDisease
+
+from ..utils import bump_record_version, get_record_audience, get_auth_context
 
 
 class BaseView(generics.ListAPIView):
@@ -92,12 +98,76 @@ class CustomPermissionAPIView(APIView):
             return [permissions.IsAuthenticated(), IsSuperUser()]
         return [permissions.IsAuthenticated()]
 
+class RecordVersionMixin:
+    """
+        Increments the version of the G2P record after a successful update.
+        The version invalidates the cached JSON of the record.
+        It is used by the views that update a record, the record stable_id is
+        part of the url.
+
+        Set 'update_shared_publications' to True if the view can update the
+        publication data (comments, families) shared by other records.
+    """
+    update_shared_publications = False
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        stable_id = kwargs.get("stable_id")
+        if (stable_id is not None and request.method not in permissions.SAFE_METHODS
+            and status.is_success(response.status_code)):
+            query = Q(stable_id__stable_id=stable_id)
+            if self.update_shared_publications:
+                query |= Q(lgdpublication__publication__lgdpublication__lgd__stable_id__stable_id=stable_id)
+
+            bump_record_version(LocusGenotypeDisease.objects.filter(query).distinct())
+
+        return response
+
+class ConditionalGetMixin(abc.ABC):
+    """
+        Adds the ETag to the GET responses.
+        The view defines get_etag() which returns the etag without loading the data.
+        If the client already has the current data, the response is
+        '304 Not Modified' and the data is not loaded.
+
+        There is no Last-Modified header: the records have no date
+        updated by every change (the review date is not).
+    """
+
+    @abc.abstractmethod
+    def get_etag(self, request, *args, **kwargs):
+        """
+            Returns the etag (str) of the data or None if the data is not
+            available to the user (the response is not conditional).
+            The etag has to change every time the data changes.
+        """
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request, *args, **kwargs)
+
+        if etag is not None:
+            # The data depends on the user and on the format (JSON or browsable API)
+            etag = quote_etag(f"{etag}-{get_record_audience(request.user)}-{request.accepted_renderer.format}")
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            if etag is not None:
+                response.headers["ETag"] = etag
+            # The user is authenticated with the cookie or the header
+            patch_vary_headers(response, ["Cookie", "Authorization"])
+
+        return response
+
 class IsSuperUser(BasePermission):
     """
         Allows access only to superusers.
     """
     def has_permission(self, request, view):
-        return request.user and request.user.is_superuser
+        return get_auth_context(request).is_superuser
 
 
 @api_view(['GET'])
@@ -105,13 +175,7 @@ def ListEndpoints(request):
     """
         Returns a list of available endpoints.
     """
-    user = request.user
-
-    # Get user obj
-    try:
-        user_obj = User.objects.get(email=user, is_active=1)
-    except User.DoesNotExist:
-        user_obj = None
+    auth_context = get_auth_context(request)
 
     resolver = get_resolver()
     url_patterns = []
@@ -134,9 +198,9 @@ def ListEndpoints(request):
 
             # Authenticated users have access to all endpoints
             # Non-authenticated users can only search data
-            if(user_obj is not None and pattern != ""):
+            if(auth_context.is_authenticated and pattern != ""):
                 list_urls.add(pattern)
-            elif(user_obj is None and pattern != "" and "add" not in pattern
+            elif(not auth_context.is_authenticated and pattern != "" and "add" not in pattern
                  and "curation" not in pattern and not match):
                 list_urls.add(pattern)
 
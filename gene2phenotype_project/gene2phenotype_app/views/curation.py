@@ -10,7 +10,9 @@ from gene2phenotype_app.serializers import CurationDataSerializer
 
 from gene2phenotype_app.models import G2PStableID, CurationData, LocusGenotypeDisease
 
-from .base import BaseView, BaseAdd
+from gene2phenotype_app.utils import get_auth_context
+
+from .base import BaseView, BaseAdd, RecordVersionMixin
 
 
 ### Curation data
@@ -33,8 +35,6 @@ class AddCurationData(BaseAdd):
             Returns:
                 A Response object with appropriate status and message.
         """
-        user = self.request.user
-
         json_file_path = settings.BASE_DIR.joinpath("gene2phenotype_app", "utils", "curation_schema.json")
         try:
             with open(json_file_path, 'r') as file:
@@ -56,7 +56,7 @@ class AddCurationData(BaseAdd):
         except jsonschema.exceptions.ValidationError as e:
             return Response({"message": "JSON data does not follow the required format. Required format is" + str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer = self.serializer_class(data=request.data, context={'user': user})
+        serializer = self.serializer_class(data=request.data, context={'auth_context': get_auth_context(request)})
 
         if serializer.is_valid():
             instance = serializer.save()
@@ -193,8 +193,6 @@ class UpdateCurationData(generics.UpdateAPIView):
             return queryset
 
     def update(self, request, *args, **kwargs):
-        user = self.request.user
- 
         # Get curation entry to be updated
         curation_obj = self.get_queryset().first()
 
@@ -220,7 +218,7 @@ class UpdateCurationData(generics.UpdateAPIView):
         serializer = CurationDataSerializer(
             curation_obj,
             data=request.data,
-            context={'user': user,'session_name': curation_obj.session_name}
+            context={'auth_context': get_auth_context(request), 'session_name': curation_obj.session_name}
         )
 
         if serializer.is_valid():
@@ -230,7 +228,7 @@ class UpdateCurationData(generics.UpdateAPIView):
         else:
             return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
-class PublishRecord(APIView):
+class PublishRecord(RecordVersionMixin, APIView):
     """
         Publish the data.
         If data is published succesfully, it deletes entry from curation data list and
@@ -246,6 +244,8 @@ class PublishRecord(APIView):
     http_method_names = ['post', 'head']
     serializer_class = CurationDataSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # Publication comments and families are displayed in all records with the publication
+    update_shared_publications = True
 
     def post(self, request, stable_id):
         user = self.request.user
@@ -260,7 +260,7 @@ class PublishRecord(APIView):
 
             # Publish record
             try:
-                lgd_obj = self.serializer_class(context={'user': user}).publish(curation_obj)
+                lgd_obj = self.serializer_class(context={'auth_context': get_auth_context(request)}).publish(curation_obj)
                 # Delete entry from 'curation_data'
                 curation_obj.delete()
 
@@ -1,24 +1,24 @@
 from rest_framework import permissions
 from rest_framework.response import Response
-from django.db.models import Q
+from rest_framework.exceptions import ValidationError
 
 from gene2phenotype_app.serializers import (GeneDiseaseSerializer,
                                             DiseaseDetailSerializer,
-                                            CreateDiseaseSerializer)
+                                            CreateDiseaseSerializer,
+                                            LocusGeneSerializer)
 
-from gene2phenotype_app.models import (AttribType, Locus, OntologyTerm,
-                                       DiseaseOntologyTerm, Disease,
-                                       LocusAttrib, GeneDisease)
+from gene2phenotype_app.models import Disease, LocusGenotypeDisease
 
-from ..utils import clean_omim_disease
-from .base import BaseView, BaseAdd
+from ..utils import get_records_etag, disease_suggestion_index, disease_resolver
+from .base import BaseView, BaseAdd, ConditionalGetMixin
+from .locus import GeneLookupMixin
 
-class GeneDiseaseView(BaseView):
+class GeneDiseaseView(GeneLookupMixin, BaseView):
     """
         Retrieves all diseases associated with a specific gene.
 
         Args:
-            (str) gene_name: gene symbol or the synonym symbol
+            (str) gene_name: gene symbol, synonym symbol or gene ID (HGNC, Ensembl, OMIM)
 
         Returns:
             Response object includes:
@@ -32,46 +32,19 @@ class GeneDiseaseView(BaseView):
 
     serializer_class = GeneDiseaseSerializer
 
-    def get_queryset(self):
-        name = self.kwargs['name']
-        gene_obj = Locus.objects.filter(name=name)
-        queryset = GeneDisease.objects.filter(gene=gene_obj.first())
-
-        if not queryset.exists():
-            # Try to find gene in locus_attrib (gene synonyms)
-            attrib_type = AttribType.objects.filter(code='gene_synonym')
-            queryset = LocusAttrib.objects.filter(value=name, attrib_type=attrib_type.first().id, is_deleted=0)
-
-            if not queryset.exists():
-                self.handle_no_permission('Gene', name)
-
-            gene_obj = Locus.objects.filter(id=queryset.first().locus.id)
-            queryset = GeneDisease.objects.filter(gene=gene_obj.first())
-
-            if not queryset.exists():
-                self.handle_no_permission('Gene-Disease association', name)
-
-        return queryset
-
     def get(self, request, name, *args, **kwargs):
-        queryset = self.get_queryset()
-        results = []
-        for gene_disease_obj in queryset:
-            # Return the original disease name and the clean version (without subtype)
-            # In the future, we will import diseases from other sources (Mondo, GenCC)
-            new_disease_name = clean_omim_disease(gene_disease_obj.disease)
-            results.append({
-                            'original_disease_name': gene_disease_obj.disease,
-                            'disease_name': new_disease_name,
-                            'identifier': gene_disease_obj.identifier,
-                            'source': gene_disease_obj.source.name
-                           })
+        # Return the original disease name and the clean version (without subtype)
+        results = LocusGeneSerializer.diseases(self.get_locus())
+
+        if not results:
+            self.handle_no_permission('Gene-Disease association', name)
 
         return Response({'results': results, 'count': len(results)})
 
-class DiseaseDetail(BaseView):
+class DiseaseDetail(ConditionalGetMixin, BaseView):
     """
         Display information for a specific disease.
+        The disease is found with the disease resolver (see DiseaseResolver).
 
         Args:
             (str) disease id: disease name or ontology ID (Mondo, OMIM)
@@ -82,31 +55,27 @@ class DiseaseDetail(BaseView):
 
     serializer_class = DiseaseDetailSerializer
 
-    def get_queryset(self):
-        id = self.kwargs['id']
-
-        # Fetch disease by MONDO ID or by OMIM ID (only digits)
-        if id.startswith('MONDO') or id.isdigit():
-            ontology_term = OntologyTerm.objects.filter(accession=id)
+    def get_disease_id(self):
+        if not hasattr(self, '_disease_id'):
+            id = self.kwargs['id']
+            disease_id = disease_resolver.resolve(id)
 
-            if not ontology_term.exists():
+            if disease_id is None:
                 self.handle_no_permission('Disease', id)
 
-            disease_ontology = DiseaseOntologyTerm.objects.filter(ontology_term_id=ontology_term.first().id)
-
-            if not disease_ontology.exists():
-                self.handle_no_permission('Disease', id)
+            self._disease_id = disease_id
 
-            queryset = Disease.objects.filter(id=disease_ontology.first().disease_id)
+        return self._disease_id
 
-        else:
-            # Fetch disease by name or by synonym
-            queryset = Disease.objects.filter(name=id) | Disease.objects.filter(Q(diseasesynonym__synonym=id))
+    def get_queryset(self):
+        return Disease.objects.filter(id=self.get_disease_id())
 
-        if not queryset.exists():
-            self.handle_no_permission('Disease', id)
+    def get_etag(self, request, *args, **kwargs):
+        disease_id = self.get_disease_id()
+        etag = get_records_etag(LocusGenotypeDisease.objects.filter(disease_id=disease_id))
 
-        return queryset
+        # The disease resolver is invalidated when the disease, its synonyms or its ontology terms change
+        return f"disease-{disease_id}-{etag}-{disease_resolver.generation()}"
 
     def list(self, request, *args, **kwargs):
         disease_obj = self.get_queryset().first()
@@ -138,13 +107,65 @@ class DiseaseSummary(DiseaseDetail):
 
         return Response(response_data)
 
+class DiseaseSuggestions(BaseView):
+    """
+        Display the existing diseases with a name or synonym similar to the input name.
+        It can be used to find near duplicates before adding a new disease.
+        The similarity is calculated with the disease suggestion index (see DiseaseSuggestionIndex).
+
+        Args:
+            (str) name: disease name (query parameter)
+            (int) limit: maximum number of diseases (query parameter, default 10, max 50)
+
+        Returns:
+            Response object includes:
+                            (list) results: diseases sorted by similarity
+                                            - id
+                                            - name
+                                            - matched_name: disease name or synonym similar to the input
+                                            - is_synonym
+                                            - score: similarity between 0 and 1
+                            (int) count: number of diseases
+    """
+
+    max_limit = 50
+
+    def get(self, request, *args, **kwargs):
+        name = request.query_params.get('name', '').strip()
+        if not name:
+            raise ValidationError({"message": "Please provide a disease name"})
+
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), self.max_limit)
+        except ValueError:
+            raise ValidationError({"message": "Invalid limit"})
+
+        if limit < 1:
+            raise ValidationError({"message": "Invalid limit"})
+
+        results = disease_suggestion_index.suggest(name, limit)
+
+        return Response({'results': results, 'count': len(results)})
+
 
 ### Add data
 """
     Add new disease.
     This view is called by the endpoint that directly adds a disease (add/disease/).
     The create method is in the CreateDiseaseSerializer.
+    Similar existing diseases can be found with the suggestions endpoint (diseases/suggestions/).
+    The response also includes the diseases similar to the new disease ('suggestions'),
+    they are possible duplicates to review, the disease is always added.
 """
 class AddDisease(BaseAdd):
     serializer_class = CreateDiseaseSerializer
     permission_classes = [permissions.IsAuthenticated]
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        self.suggestions = serializer.suggestions
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response.data["suggestions"] = self.suggestions
+        return response
@@ -1,19 +1,54 @@
+from rest_framework import status
 from rest_framework.response import Response
+from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
+from django.http import StreamingHttpResponse
+from django.db.models import Prefetch
+from datetime import datetime
+import csv, json, re
 
-from gene2phenotype_app.models import (AttribType, Attrib,
-                                       Locus, LocusAttrib)
+from gene2phenotype_app.models import (LocusGenotypeDisease, Locus, LocusIdentifier, LocusAttrib,
+                                       UniprotAnnotation, GeneStats, GeneDisease, LGDPanel, Source)
 
 from gene2phenotype_app.serializers import LocusGeneSerializer
 
-from .base import BaseView
+from .base import BaseView, ConditionalGetMixin
+from .locus_genotype_disease import get_visible_records
 
+from ..utils import get_records_etag, gene_index, region_index, read_id_list
 
-class LocusGene(BaseView):
+
+class GeneLookupMixin:
+    """
+        Finds the gene from the 'name' in the URL.
+        The name can be the gene symbol, a gene synonym or a gene identifier
+        (HGNC, Ensembl, OMIM), it is resolved with the gene index.
+    """
+    def get_locus_queryset(self):
+        return Locus.objects.select_related('sequence__reference')
+
+    def get_locus(self):
+        if not hasattr(self, '_locus'):
+            name = self.kwargs['name']
+            locus_id = gene_index.resolve(name)
+            locus = None
+
+            if locus_id is not None:
+                locus = self.get_locus_queryset().filter(id=locus_id).first()
+
+            if locus is None:
+                self.handle_no_permission('Gene', name)
+
+            self._locus = locus
+
+        return self._locus
+
+class LocusGene(GeneLookupMixin, ConditionalGetMixin, BaseView):
     """
         Display the gene data.
 
         Args:
-            (str) gene_name: gene symbol or the synonym symbol
+            (str) gene_name: gene symbol, synonym symbol or gene ID (HGNC, Ensembl, OMIM)
 
         Returns:
             LocusGene object data:
@@ -32,34 +67,25 @@ class LocusGene(BaseView):
     serializer_class = LocusGeneSerializer
 
     def get_queryset(self):
-        name = self.kwargs['name']
-        attrib_type = AttribType.objects.filter(code='locus_type')
-        attrib = Attrib.objects.filter(type=attrib_type.first().id, value='gene')
-        queryset = Locus.objects.filter(name=name, type=attrib.first().id)
-
-        if not queryset.exists():
-            # Try to find gene in locus_attrib (gene synonyms)
-            attrib_type = AttribType.objects.filter(code='gene_synonym')
-            queryset = LocusAttrib.objects.filter(value=name, attrib_type=attrib_type.first().id, is_deleted=0)
+        return Locus.objects.filter(id=self.get_locus().id)
 
-            if not queryset.exists():
-                self.handle_no_permission('Gene', name)
+    def get_etag(self, request, *args, **kwargs):
+        locus = self.get_locus()
+        etag = get_records_etag(LocusGenotypeDisease.objects.filter(locus=locus))
 
-            queryset = Locus.objects.filter(id=queryset.first().locus.id)
-
-        return queryset
+        # The gene index is invalidated when the gene, its synonyms or its identifiers change
+        return f"gene-{locus.id}-{etag}-{gene_index.generation()}"
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset().first()
-        serializer = LocusGeneSerializer(queryset)
+        serializer = LocusGeneSerializer(self.get_locus())
         return Response(serializer.data)
 
-class LocusGeneSummary(BaseView):
+class LocusGeneSummary(GeneLookupMixin, BaseView):
     """
         Display a summary of the latest G2P entries associated with gene.
 
         Args:
-            (str) gene_name: gene symbol or the synonym symbol
+            (str) gene_name: gene symbol, synonym symbol or gene ID (HGNC, Ensembl, OMIM)
 
         Returns:
             Response object includes:
@@ -70,36 +96,24 @@ class LocusGeneSummary(BaseView):
     serializer_class = LocusGeneSerializer
 
     def get(self, request, name, *args, **kwargs):
-        attrib_type = AttribType.objects.filter(code='locus_type')
-        attrib = Attrib.objects.filter(type=attrib_type.first().id, value='gene')
-        queryset = Locus.objects.filter(name=name, type=attrib.first().id)
-
-        if not queryset.exists():
-            # Try to find gene in locus_attrib (gene synonyms)
-            attrib_type = AttribType.objects.filter(code='gene_synonym')
-            queryset = LocusAttrib.objects.filter(value=name, attrib_type=attrib_type.first().id, is_deleted=0)
-
-            if not queryset.exists():
-                self.handle_no_permission('Gene', name)
-
-            queryset = Locus.objects.filter(id=queryset.first().locus.id)
+        locus = self.get_locus()
 
         serializer = LocusGeneSerializer
-        summmary = serializer.records_summary(queryset.first(), self.request.user)
+        summmary = serializer.records_summary(locus, self.request.user)
         response_data = {
-            'gene_symbol': queryset.first().name,
+            'gene_symbol': locus.name,
             'records_summary': summmary,
         }
 
         return Response(response_data)
 
-class GeneFunction(BaseView):
+class GeneFunction(GeneLookupMixin, BaseView):
     """
         Display the gene product function.
         Data retrieved from UniProt API.
 
         Args:
-            (str) gene_name: gene symbol or the synonym symbol
+            (str) gene_name: gene symbol, synonym symbol or gene ID (HGNC, Ensembl, OMIM)
 
         Returns:
             Response object includes:
@@ -111,27 +125,364 @@ class GeneFunction(BaseView):
     serializer_class = LocusGeneSerializer
 
     def get(self, request, name, *args, **kwargs):
-        attrib_type = AttribType.objects.filter(code='locus_type')
-        attrib = Attrib.objects.filter(type=attrib_type.first().id, value='gene')
-        queryset = Locus.objects.filter(name=name, type=attrib.first().id)
-
-        if not queryset.exists():
-            # Try to find gene in locus_attrib (gene synonyms)
-            attrib_type = AttribType.objects.filter(code='gene_synonym')
-            queryset = LocusAttrib.objects.filter(value=name, attrib_type=attrib_type.first().id, is_deleted=0)
-
-            if not queryset.exists():
-                self.handle_no_permission('Gene', name)
-
-            queryset = Locus.objects.filter(id=queryset.first().locus.id)
+        locus = self.get_locus()
 
         serializer = LocusGeneSerializer
-        summmary = serializer.function(queryset.first())
-        gene_stats = serializer.badonyi_score(queryset.first())
+        summmary = serializer.function(locus)
+        gene_stats = serializer.badonyi_score(locus)
         response_data = {
-            'gene_symbol': queryset.first().name,
+            'gene_symbol': locus.name,
             'function': summmary,
             'gene_stats': gene_stats
         }
 
         return Response(response_data)
+
+class LocusGenePage(GeneLookupMixin, BaseView):
+    """
+        Display all the data of the gene page.
+        The gene is resolved once and the data is loaded with a few queries.
+
+        Args:
+            (str) gene_name: gene symbol, synonym symbol or gene ID (HGNC, Ensembl, OMIM)
+            (str) include: comma-separated list of sections (optional, default all sections)
+                           Example: ?include=gene,records_summary
+
+        Returns:
+            Response object includes:
+                            (string) gene_symbol
+                            (dict) gene: gene data, see LocusGene
+                            (list) records_summary: see LocusGeneSummary
+                            (dict) function: gene product function from UniProt
+                            (dict) gene_stats: gene scores from the Badonyi probabilities
+                            (list) diseases: external gene-disease associations, see GeneDiseaseView
+    """
+
+    serializer_class = LocusGeneSerializer
+
+    # Data prefetched for each section
+    sections = {
+        "gene": [
+            Prefetch('locusidentifier_set',
+                     queryset=LocusIdentifier.objects.select_related('source'),
+                     to_attr='prefetched_ids'),
+            Prefetch('locusattrib_set',
+                     queryset=LocusAttrib.objects.filter(attrib_type__code='gene_synonym', is_deleted=0),
+                     to_attr='prefetched_synonyms'),
+        ],
+        "records_summary": [],
+        "function": [
+            Prefetch('uniprotannotation_set',
+                     queryset=UniprotAnnotation.objects.all(),
+                     to_attr='prefetched_uniprot_annotations'),
+        ],
+        "gene_stats": [
+            Prefetch('genestats_set',
+                     queryset=GeneStats.objects.select_related('description_attrib'),
+                     to_attr='prefetched_gene_stats'),
+        ],
+        "diseases": [
+            Prefetch('genedisease_set',
+                     queryset=GeneDisease.objects.select_related('source'),
+                     to_attr='prefetched_gene_diseases'),
+        ],
+    }
+
+    def get_include(self):
+        include = self.request.query_params.get('include', None)
+        if not include:
+            return list(self.sections)
+
+        include = [section.strip() for section in include.split(',') if section.strip()]
+        invalid = [section for section in include if section not in self.sections]
+        if invalid:
+            raise ValidationError({"message": f"Invalid sections: {', '.join(invalid)}"})
+
+        return include
+
+    def get_locus_queryset(self):
+        prefetch_list = []
+        for section in self.include:
+            prefetch_list.extend(self.sections[section])
+
+        return super().get_locus_queryset().prefetch_related(*prefetch_list)
+
+    def get(self, request, name, *args, **kwargs):
+        self.include = self.get_include()
+        locus = self.get_locus()
+
+        serializer = LocusGeneSerializer
+        section_data = {
+            "gene": lambda: serializer(locus).data,
+            "records_summary": lambda: serializer.records_summary(locus, request.user),
+            "function": lambda: serializer.function(locus),
+            "gene_stats": lambda: serializer.badonyi_score(locus),
+            "diseases": lambda: serializer.diseases(locus),
+        }
+
+        response_data = {'gene_symbol': locus.name}
+        for section in self.include:
+            response_data[section] = section_data[section]()
+
+        return Response(response_data)
+
+class LocusRegion(BaseView):
+    """
+        Display the loci overlapping a genomic region and their G2P records.
+        The loci are found with the region index (see RegionIndex).
+
+        Args:
+            (str) region: chromosome:start-end
+                          Example: 12:88049016-88142099 or chr12:88049016-88142099
+
+        Returns:
+            Response object includes:
+                            (list) results: loci sorted by start
+                                            - locus data
+                                            - records: G2P records linked to the locus
+                            (int) count: number of loci
+    """
+
+    region_pattern = re.compile(r"^(\w+):([\d,]+)-([\d,]+)$")
+
+    def get_region(self, region):
+        match = self.region_pattern.match(region.strip())
+        if match is None:
+            raise ValidationError({"message": f"Invalid region '{region}', the format is chromosome:start-end"})
+
+        chromosome, start, end = match.groups()
+        start = int(start.replace(",", ""))
+        end = int(end.replace(",", ""))
+        if start > end:
+            raise ValidationError({"message": f"Invalid region '{region}', start is greater than end"})
+
+        return chromosome, start, end
+
+    def get(self, request, region, *args, **kwargs):
+        chromosome, start, end = self.get_region(region)
+        locus_ids = region_index.overlap(chromosome, start, end)
+
+        records = {}
+        queryset = get_visible_records(request.user).filter(locus_id__in=locus_ids).select_related(
+            'stable_id', 'disease', 'genotype', 'confidence', 'mechanism'
+        ).prefetch_related(
+            Prefetch('lgdpanel_set',
+                     queryset=LGDPanel.objects.filter(is_deleted=0).select_related('panel'),
+                     to_attr='prefetched_panels')
+        )
+        for lgd in queryset:
+            records.setdefault(lgd.locus_id, []).append({
+                'stable_id': lgd.stable_id.stable_id,
+                'disease': lgd.disease.name,
+                'genotype': lgd.genotype.value,
+                'confidence': lgd.confidence.value,
+                'molecular_mechanism': lgd.mechanism.value,
+                'panels': [lgd_panel.panel.name for lgd_panel in lgd.prefetched_panels],
+            })
+
+        loci = Locus.objects.filter(id__in=locus_ids).select_related('sequence', 'type').in_bulk()
+
+        results = []
+        for locus_id in locus_ids:
+            # The index can include loci deleted by other processes
+            if locus_id not in loci:
+                continue
+
+            locus = loci[locus_id]
+            results.append({
+                'name': locus.name,
+                'type': locus.type.value,
+                'sequence': locus.sequence.name,
+                'start': locus.start,
+                'end': locus.end,
+                'strand': locus.strand,
+                'records': records.get(locus_id, []),
+            })
+
+        return Response({'results': results, 'count': len(results)})
+
+class Echo:
+    """
+        Pseudo-buffer used by the csv writer to stream the rows.
+        write() returns the row instead of storing it.
+    """
+    def write(self, value):
+        return value
+
+@api_view(['POST'])
+def GeneListDownload(request):
+    """
+        Method to download the G2P records of a list of genes.
+        The genes are resolved with the gene index (gene symbol, synonym or gene ID),
+        the gene symbols and the records are loaded with three queries.
+        Non-authenticated users can only download reviewed records linked to visible panels.
+
+        Args:
+                (HttpRequest) request: HTTP request
+                (file) file: text or CSV/TSV file with the list of genes
+                (list/str) genes: list of genes (if no file is uploaded)
+                (str) output: file type 'csv' (default) or 'tsv'
+
+        Returns:
+                csv/tsv file: one row per input gene and record. The column 'status' is:
+                    - found: the gene has records
+                    - no records: the gene was found but it does not have records (empty record data)
+                    - not found: the gene was not found (empty gene and record data)
+                The header 'X-Genes-Not-Found' has the number of genes not found.
+    """
+    max_genes = 25000
+    output = request.query_params.get('output', 'csv')
+
+    if output not in ('csv', 'tsv'):
+        return Response({"message": f"Invalid output '{output}'"}, status=status.HTTP_400_BAD_REQUEST)
+
+    names = read_id_list(request, 'genes')
+    if not names:
+        return Response({"message": "Please upload a list of genes"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(names) > max_genes:
+        return Response({"message": f"The maximum number of genes is {max_genes}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Genes found with different names (e.g. symbol and synonym) are reported for each name
+    genes = [(name, gene_index.resolve(name)) for name in names] # list of (input name, locus id or None)
+    locus_ids = {locus_id for name, locus_id in genes if locus_id is not None}
+    not_found = sum(1 for name, locus_id in genes if locus_id is None)
+
+    gene_symbols = dict(Locus.objects.filter(id__in=locus_ids).values_list('id', 'name'))
+
+    queryset = get_visible_records(request.user).filter(locus_id__in=locus_ids)
+
+    lgd_panel_data = {} # key = lgd_id; value = panel names
+    queryset_lgd_panel = LGDPanel.objects.filter(is_deleted=0, lgd__in=queryset.values('id'))
+    if not request.user.is_authenticated:
+        queryset_lgd_panel = queryset_lgd_panel.filter(panel__is_visible=1)
+    for lgd_id, panel_name in queryset_lgd_panel.values_list('lgd_id', 'panel__name'):
+        lgd_panel_data.setdefault(lgd_id, []).append(panel_name)
+
+    locus_records = {} # key = locus id; value = list of records
+    queryset_list = queryset.values_list(
+        'id', 'locus_id', 'stable_id__stable_id', 'disease__name', 'genotype__value',
+        'confidence__value', 'mechanism__value', 'date_review'
+    ).order_by('stable_id__stable_id')
+    for lgd_id, locus_id, *record in queryset_list:
+        locus_records.setdefault(locus_id, []).append((lgd_id, record))
+
+    def rows():
+        yield ["input", "status", "gene symbol", "g2p id", "disease name", "allelic requirement", "confidence",
+               "molecular mechanism", "panel", "date of last review"]
+
+        for name, locus_id in genes:
+            if locus_id is None:
+                yield [name, "not found", "", "", "", "", "", "", "", ""]
+                continue
+
+            gene_symbol = gene_symbols.get(locus_id, "")
+            records = locus_records.get(locus_id, [])
+            if not records:
+                yield [name, "no records", gene_symbol, "", "", "", "", "", "", ""]
+
+            for lgd_id, (stable_id, disease, genotype, confidence, mechanism, date_review) in records:
+                yield [name, "found", gene_symbol, stable_id, disease, genotype, confidence, mechanism,
+                       '; '.join(lgd_panel_data.get(lgd_id, [])),
+                       date_review.strftime('%Y-%m-%d') if date_review else ""]
+
+    writer = csv.writer(Echo(), delimiter='\t' if output == 'tsv' else ',')
+    date_now = datetime.today().strftime('%Y-%m-%d')
+    filename = f"G2P_gene_list_{date_now}.{output}"
+
+    return StreamingHttpResponse(
+        (writer.writerow(row) for row in rows()),
+        content_type="text/csv" if output == 'csv' else "text/tab-separated-values",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Genes-Not-Found": str(not_found)
+        }
+    )
+
+@api_view(['POST'])
+def GeneIdentifierResolve(request):
+    """
+        Method to map a list of gene identifiers (HGNC, Ensembl, OMIM) to the genes and their G2P records.
+        The identifiers are resolved in batches, with one query to find the genes
+        and one query to find the records of each batch.
+        The identifiers are case insensitive (as in the gene index).
+        The response is streamed while the batches are resolved.
+        Non-authenticated users can only see reviewed records linked to visible panels.
+
+        Args:
+                (HttpRequest) request: HTTP request
+                (file) file: text or CSV/TSV file with the list of identifiers
+                (list/str) identifiers: list of identifiers (if no file is uploaded)
+                (str) source: only search identifiers from this source (example: HGNC, Ensembl)
+
+        Returns:
+                JSON object:
+                        (dict) results: key = identifier; value = gene data
+                                        - gene_symbol
+                                        - source: identifier source
+                                        - records: stable IDs of the G2P records linked to the gene
+                        (list) not_found: identifiers not found
+                        (int) count: number of identifiers found
+    """
+    max_identifiers = 50000
+    batch_size = 1000
+    source = request.query_params.get('source', None)
+
+    identifiers = read_id_list(request, 'identifiers')
+    if not identifiers:
+        return Response({"message": "Please upload a list of identifiers"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(identifiers) > max_identifiers:
+        return Response({"message": f"The maximum number of identifiers is {max_identifiers}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    queryset_identifiers = LocusIdentifier.objects.order_by('id')
+    if source:
+        source_obj = Source.objects.filter(name__iexact=source).first()
+        if source_obj is None:
+            return Response({"message": f"Invalid source '{source}'"}, status=status.HTTP_400_BAD_REQUEST)
+        # Uses the (source, identifier) index
+        queryset_identifiers = queryset_identifiers.filter(source_id=source_obj.id)
+
+    queryset_records = get_visible_records(request.user).order_by('stable_id__stable_id')
+
+    def chunks():
+        not_found = []
+        count = 0
+
+        yield '{"results":{'
+
+        for i in range(0, len(identifiers), batch_size):
+            batch = identifiers[i:i + batch_size]
+
+            # The identifiers are compared in upper case: the column collation is case insensitive
+            # in MySQL, the upper case identifiers are also queried for other databases
+            genes = {} # key = identifier (upper case); value = (locus id, gene symbol, source)
+            rows = queryset_identifiers.filter(
+                identifier__in=set(batch) | {identifier.upper() for identifier in batch}
+            ).values_list('identifier', 'locus_id', 'locus__name', 'source__name')
+            for identifier, locus_id, gene_symbol, source_name in rows:
+                genes.setdefault(identifier.upper(), (locus_id, gene_symbol, source_name))
+
+            locus_records = {} # key = locus id; value = list of stable IDs
+            rows = queryset_records.filter(locus_id__in={gene[0] for gene in genes.values()}).values_list(
+                'locus_id', 'stable_id__stable_id'
+            )
+            for locus_id, stable_id in rows:
+                locus_records.setdefault(locus_id, []).append(stable_id)
+
+            items = []
+            for identifier in batch:
+                if identifier.upper() not in genes:
+                    not_found.append(identifier)
+                    continue
+
+                locus_id, gene_symbol, source_name = genes[identifier.upper()]
+                data = {"gene_symbol": gene_symbol, "source": source_name, "records": locus_records.get(locus_id, [])}
+                items.append(f"{json.dumps(identifier)}:{json.dumps(data, separators=(',', ':'))}")
+
+            if items:
+                yield ("," if count else "") + ",".join(items)
+                count += len(items)
+
+        yield f'}},"not_found":{json.dumps(not_found)},"count":{count}}}'
+
+    return StreamingHttpResponse(chunks(), content_type="application/json")
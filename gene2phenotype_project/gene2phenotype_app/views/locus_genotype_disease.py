@@ -1,13 +1,17 @@
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.http import Http404
+from rest_framework.renderers import JSONRenderer
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
+from django.conf import settings
+from django.http import Http404, HttpResponse
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.db import transaction, IntegrityError
 
 
-from gene2phenotype_app.serializers import (UserSerializer, LocusGenotypeDiseaseSerializer,
+from gene2phenotype_app.serializers import (LocusGenotypeDiseaseSerializer,
                                             LGDCrossCuttingModifierSerializer,
                                             LGDCommentSerializer, LGDVariantConsequenceListSerializer,
                                             LGDVariantGenCCConsequenceSerializer, LGDCrossCuttingModifierListSerializer,
@@ -15,14 +19,17 @@ from gene2phenotype_app.serializers import (UserSerializer, LocusGenotypeDisease
                                             LGDVariantTypeDescriptionListSerializer, LGDVariantTypeDescriptionSerializer,
                                             LGDCommentListSerializer)
 
-from gene2phenotype_app.models import (User, Attrib, LocusGenotypeDisease, OntologyTerm,
+from gene2phenotype_app.models import (Attrib, LocusGenotypeDisease, OntologyTerm,
                                        G2PStableID, CVMolecularMechanism, LGDCrossCuttingModifier, 
                                        LGDVariantGenccConsequence, LGDVariantType, LGDVariantTypeComment,
                                        LGDVariantTypeDescription, LGDPanel, LGDPhenotype, LGDPhenotypeSummary,
                                        LGDMolecularMechanismEvidence, LGDMolecularMechanismSynopsis, LGDPublication,
                                        LGDComment)
 
-from .base import BaseUpdate, CustomPermissionAPIView, IsSuperUser
+from .base import BaseUpdate, CustomPermissionAPIView, IsSuperUser, RecordVersionMixin, ConditionalGetMixin
+
+from ..utils import (get_cached_record, set_cached_record, get_cached_record_version, set_cached_record_version,
+                     get_record_audience, get_auth_context, get_record_history, schedule_stats_update)
 
 
 class ListMolecularMechanisms(generics.ListAPIView):
@@ -100,7 +107,7 @@ class VariantTypesList(generics.ListAPIView):
                          'protein_changing_variants': list_protein,
                          'other_variants': list})
 
-class LocusGenotypeDiseaseDetail(generics.ListAPIView):
+class LocusGenotypeDiseaseDetail(ConditionalGetMixin, generics.ListAPIView):
     """
         Display all data for a specific G2P stable ID.
 
@@ -117,6 +124,15 @@ class LocusGenotypeDiseaseDetail(generics.ListAPIView):
                     - phenotypes
                     - publications
                     - etc
+
+        Optional query parameters (comma-separated list of fields):
+            fields: only display these fields
+            exclude: do not display these fields
+            Example: ?fields=locus,disease,confidence,panels
+
+        The JSON response is cached for each audience (anonymous users and curators)
+        and for each version of the record: the version is incremented every time the record is updated.
+        The version is also cached, the cached JSON is returned without querying the database.
     """
 
     serializer_class = LocusGenotypeDiseaseSerializer
@@ -127,27 +143,203 @@ class LocusGenotypeDiseaseDetail(generics.ListAPIView):
 
         g2p_stable_id = get_object_or_404(G2PStableID, stable_id=stable_id)
 
-        # Authenticated users (curators) can see all entries:
-        #   - in visible and non-visible panels
-        #   - entries flagged as not reviewed (is_reviewed=0)
-        if user.is_authenticated:
-            queryset = LocusGenotypeDisease.objects.filter(stable_id=g2p_stable_id, is_deleted=0)
-        else:
-            queryset = LocusGenotypeDisease.objects.filter(stable_id=g2p_stable_id, is_reviewed=1, is_deleted=0, lgdpanel__panel__is_visible=1).distinct()
+        queryset = get_visible_records(user).filter(stable_id=g2p_stable_id)
 
         if not queryset.exists():
             raise Http404(f"No matching Entry found for: {stable_id}")
         else:
             return queryset
 
+    def get_etag(self, request, *args, **kwargs):
+        """
+            The ETag is the record version, it is incremented every time the record is updated.
+            If the JSON of the cached version is cached for the audience of the user,
+            the user can see the record and the database is not queried.
+            Otherwise the version is read with the visibility rules of the user.
+            The responses with a subset of fields have a different ETag.
+        """
+        stable_id = self.kwargs['stable_id']
+        audience = get_record_audience(request.user)
+        self.fields = get_selected_fields(request)
+        self.content = None
+
+        # The browsable API and the responses with a subset of fields are not cached
+        self.use_cache = request.accepted_renderer.format == "json" and self.fields is None
+        self.version = get_cached_record_version(stable_id)
+
+        if self.use_cache and self.version is not None:
+            self.content = get_cached_record(stable_id, audience, self.version)
+
+        if self.content is None:
+            self.version = get_visible_records(request.user).filter(
+                stable_id__stable_id=stable_id
+            ).values_list('version', flat=True).first()
+
+            if self.version is None:
+                return None
+
+            set_cached_record_version(stable_id, self.version)
+
+        etag = f"{stable_id}-{self.version}"
+        if self.fields is not None:
+            etag += f"-{','.join(self.fields)}"
+
+        return etag
+
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset().first()
-        serializer = LocusGenotypeDiseaseSerializer(queryset, context={'user': self.request.user})
+        stable_id = self.kwargs['stable_id']
+        audience = get_record_audience(request.user)
+        fields = self.fields
+        # The cache is only used if the user can see the record (version is set)
+        use_cache = self.use_cache and self.version is not None
+
+        if self.content is not None:
+            return HttpResponse(self.content, content_type="application/json")
+
+        lgd_obj = LocusGenotypeDiseaseSerializer.prefetch_records(self.get_queryset(), self.request.user, fields).first()
+        serializer = LocusGenotypeDiseaseSerializer(lgd_obj, context={'auth_context': get_auth_context(self.request)}, fields=fields)
+
+        if use_cache:
+            set_cached_record(stable_id, audience, self.version, JSONRenderer().render(serializer.data))
+
         return Response(serializer.data)
 
+class LocusGenotypeDiseaseBatchDetail(APIView):
+    """
+        Display all data for a list of G2P stable IDs.
+        The records are loaded with a fixed number of queries
+        (see LocusGenotypeDiseaseSerializer.prefetch_records).
+
+        Input example:
+                    { "stable_ids": ["G2P00001", "G2P00002"] }
+
+        Optional query parameters 'fields' and 'exclude': see LocusGenotypeDiseaseDetail
+
+        Returns:
+                Response object includes:
+                    (list) results: list of LocusGenotypeDisease objects
+                    (int) count: number of records
+                    (list) not_found: stable IDs not found
+    """
+    http_method_names = ['post', 'options']
+    max_stable_ids = 500
+
+    def post(self, request, *args, **kwargs):
+        stable_ids = request.data.get("stable_ids", None)
+
+        if not isinstance(stable_ids, list) or not stable_ids:
+            return Response({"message": "Please enter a list of stable IDs"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(stable_ids) > self.max_stable_ids:
+            return Response({"message": f"The maximum number of stable IDs is {self.max_stable_ids}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        fields = get_selected_fields(request)
+        stable_ids = list(dict.fromkeys(str(stable_id) for stable_id in stable_ids))
+        queryset = get_visible_records(request.user).filter(stable_id__stable_id__in=stable_ids)
+        records = {
+            lgd.stable_id.stable_id: lgd
+            for lgd in LocusGenotypeDiseaseSerializer.prefetch_records(queryset, request.user, fields)
+        }
+
+        # Keep the order of the input list
+        lgd_list = [records[stable_id] for stable_id in stable_ids if stable_id in records]
+        serializer = LocusGenotypeDiseaseSerializer(lgd_list, many=True, context={'auth_context': get_auth_context(request)},
+                                                    fields=fields)
+
+        return Response({
+            'results': serializer.data,
+            'count': len(lgd_list),
+            'not_found': [stable_id for stable_id in stable_ids if stable_id not in records]
+        })
+
+class LocusGenotypeDiseaseHistory(APIView):
+    """
+        Display the changes made to a G2P record, newest first.
+        The changes are read from the history of the record and of its data
+        (panels, publications, phenotypes, variant types, etc.).
+        Only available to authenticated users.
+
+        Args:
+            (string) stable_id
+            (int) page_size: number of changes per page (optional)
+            (str) cursor: page cursor, see 'next' (optional)
+
+        Returns:
+                Response object includes:
+                    (list) results: list of changes
+                                    - date
+                                    - user
+                                    - data_type: record, panel, publication, etc.
+                                    - action: created, updated or deleted
+                                    - value: the data added/updated/deleted
+                                    - changes: fields updated (record updates only)
+                    (str) next: link to the next page
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_page_size = 500
+
+    def get(self, request, stable_id, *args, **kwargs):
+        lgd = get_visible_records(request.user).filter(stable_id__stable_id=stable_id).first()
+        if lgd is None:
+            raise Http404(f"No matching Entry found for: {stable_id}")
+
+        try:
+            page_size = min(int(request.query_params.get("page_size", settings.REST_FRAMEWORK["PAGE_SIZE"])),
+                            self.max_page_size)
+        except ValueError:
+            page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+        page_size = max(page_size, 1)
+
+        try:
+            changes, next_cursor = get_record_history(lgd.id, page_size, request.query_params.get("cursor"))
+        except ValueError as e:
+            raise ValidationError({"message": str(e)})
+
+        next_link = None
+        if next_cursor is not None:
+            next_link = replace_query_param(request.build_absolute_uri(), "cursor", next_cursor)
+
+        return Response({
+            "next": next_link,
+            "results": changes
+        })
+
+def get_selected_fields(request):
+    """
+        Returns the record fields selected with the query parameters:
+            - fields: comma-separated list of fields to display
+            - exclude: comma-separated list of fields to exclude
+        Returns None if all the fields are selected.
+    """
+    selection = {}
+    for param in ("fields", "exclude"):
+        value = request.query_params.get(param, "")
+        selection[param] = [name.strip() for name in value.split(",") if name.strip()]
+
+    return LocusGenotypeDiseaseSerializer.select_fields(selection["fields"], selection["exclude"])
+
+def get_visible_records(user):
+    """
+        Returns the LGD records the user can see.
+        Authenticated users (curators) can see all entries:
+            - in visible and non-visible panels
+            - entries flagged as not reviewed (is_reviewed=0)
+        Non-authenticated users can only see reviewed entries linked to visible panels.
+        Called by: LocusGenotypeDiseaseDetail(), LocusGenotypeDiseaseBatchDetail(),
+                   LocusGenotypeDiseaseHistory(), LocusRegion(), GeneListDownload(),
+                   GeneIdentifierResolve(), PublicationRecords()
+    """
+    if user.is_authenticated:
+        queryset = LocusGenotypeDisease.objects.filter(is_deleted=0)
+    else:
+        queryset = LocusGenotypeDisease.objects.filter(is_reviewed=1, is_deleted=0, lgdpanel__panel__is_visible=1).distinct()
+
+    return queryset
+
 
 ### Add or delete data ###
-class LGDUpdateConfidence(BaseUpdate):
+class LGDUpdateConfidence(RecordVersionMixin, BaseUpdate):
     http_method_names = ['put', 'options']
     serializer_class = LocusGenotypeDiseaseSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -198,9 +390,7 @@ class LGDUpdateConfidence(BaseUpdate):
         )
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_auth_context(request).panels
         has_common = serializer.check_user_permission(lgd_obj, user_panel_list)
 
         if has_common is False:
@@ -218,7 +408,7 @@ class LGDUpdateConfidence(BaseUpdate):
         else:
             return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
-class LGDUpdateMechanism(BaseUpdate):
+class LGDUpdateMechanism(RecordVersionMixin, BaseUpdate):
     http_method_names = ['patch', 'options']
     serializer_class = LocusGenotypeDiseaseSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -280,7 +470,6 @@ class LGDUpdateMechanism(BaseUpdate):
                     }
 
         """
-        user = request.user
         mechanism_data = request.data
 
         # Get G2P entry to be updated
@@ -288,9 +477,7 @@ class LGDUpdateMechanism(BaseUpdate):
         serializer = LocusGenotypeDiseaseSerializer()
 
         # Check if user has permission to edit this entry
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_auth_context(request).panels
         has_common = serializer.check_user_permission(lgd_obj, user_panel_list)
 
         if has_common is False:
@@ -341,7 +528,7 @@ class LGDUpdateMechanism(BaseUpdate):
                 {"message": f"Molecular mechanism updated successfully for '{stable_id}'"},
                 status=status.HTTP_200_OK)
 
-class LGDEditVariantConsequences(CustomPermissionAPIView):
+class LGDEditVariantConsequences(RecordVersionMixin, CustomPermissionAPIView):
     """
         Add or delete lgd-variant consequence(s).
 
@@ -396,10 +583,7 @@ class LGDEditVariantConsequences(CustomPermissionAPIView):
         lgd = get_object_or_404(LocusGenotypeDisease, stable_id__stable_id=stable_id, is_deleted=0)
 
         # Check if user has permission to update panel
-        user = self.request.user
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_auth_context(request).panels
         has_common = LocusGenotypeDiseaseSerializer(lgd).check_user_permission(lgd, user_panel_list)
         if has_common is False:
             return Response({"message": f"No permission to update record '{stable_id}'"}, status=status.HTTP_403_FORBIDDEN)
@@ -475,10 +659,7 @@ class LGDEditVariantConsequences(CustomPermissionAPIView):
         lgd_obj = get_object_or_404(LocusGenotypeDisease, stable_id__stable_id=stable_id, is_deleted=0)
 
         # Check if user has permission to update panel
-        user = self.request.user
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_auth_context(request).panels
         has_common = LocusGenotypeDiseaseSerializer(lgd_obj).check_user_permission(lgd_obj, user_panel_list)
         if has_common is False:
             return Response({"message": f"No permission to update record '{stable_id}'"}, status=status.HTTP_403_FORBIDDEN)
@@ -494,6 +675,8 @@ class LGDEditVariantConsequences(CustomPermissionAPIView):
 
         try:
             LGDVariantGenccConsequence.objects.filter(lgd=lgd_obj, variant_consequence=consequence_obj, is_deleted=0).update(is_deleted=1)
+            # update() does not send the save signals
+            schedule_stats_update([lgd_obj.id])
         except:
             return Response(
                 {"errors": f"Could not delete variant consequence '{consequence}' for ID '{stable_id}'"},
@@ -504,7 +687,7 @@ class LGDEditVariantConsequences(CustomPermissionAPIView):
                 {"message": f"Variant consequence '{consequence}' successfully deleted for ID '{stable_id}'"},
                 status=status.HTTP_200_OK)
 
-class LGDEditCCM(CustomPermissionAPIView):
+class LGDEditCCM(RecordVersionMixin, CustomPermissionAPIView):
     """
         Add or delete LGD-cross cutting modifier(s).
 
@@ -556,10 +739,7 @@ class LGDEditCCM(CustomPermissionAPIView):
         lgd = get_object_or_404(LocusGenotypeDisease, stable_id__stable_id=stable_id, is_deleted=0)
 
         # Check if user has permission to update panel
-        user = self.request.user
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_auth_context(request).panels
         has_common = LocusGenotypeDiseaseSerializer(lgd).check_user_permission(lgd, user_panel_list)
         if has_common is False:
             return Response({"message": f"No permission to update record '{stable_id}'"}, status=status.HTTP_403_FORBIDDEN)
@@ -616,14 +796,10 @@ class LGDEditCCM(CustomPermissionAPIView):
 
         ccm_tmp = request.data.get('term')
         ccm = ccm_tmp.replace("_", " ")
-        user = request.user
-
         lgd_obj = get_object_or_404(LocusGenotypeDisease, stable_id__stable_id=stable_id, is_deleted=0)
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_auth_context(request).panels
         has_common = LocusGenotypeDiseaseSerializer(lgd_obj).check_user_permission(lgd_obj, user_panel_list)
         if has_common is False:
             return Response({"message": f"No permission to update record '{stable_id}'"}, status=status.HTTP_403_FORBIDDEN)
@@ -647,7 +823,7 @@ class LGDEditCCM(CustomPermissionAPIView):
                 {"message": f"Cross cutting modifier '{ccm}' successfully deleted for ID '{stable_id}'"},
                  status=status.HTTP_200_OK)
 
-class LGDEditVariantTypes(CustomPermissionAPIView):
+class LGDEditVariantTypes(RecordVersionMixin, CustomPermissionAPIView):
     """
         Add or delete LGD-variant type(s).
 
@@ -711,9 +887,7 @@ class LGDEditVariantTypes(CustomPermissionAPIView):
         lgd = get_object_or_404(LocusGenotypeDisease, stable_id__stable_id=stable_id, is_deleted=0)
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_auth_context(request).panels
         has_common = LocusGenotypeDiseaseSerializer(lgd).check_user_permission(lgd, user_panel_list)
         if has_common is False:
             return Response({"message": f"No permission to update record '{stable_id}'"}, status=status.HTTP_403_FORBIDDEN)
@@ -736,7 +910,7 @@ class LGDEditVariantTypes(CustomPermissionAPIView):
                 # The data is created in LGDVariantTypeSerializer
                 serializer_class = LGDVariantTypeSerializer(
                     data=var_type,
-                    context={"lgd": lgd, "user": user_obj}
+                    context={"lgd": lgd, "user": user}
                 )
 
                 if serializer_class.is_valid():
@@ -773,10 +947,7 @@ class LGDEditVariantTypes(CustomPermissionAPIView):
         lgd_obj = get_object_or_404(LocusGenotypeDisease, stable_id__stable_id=stable_id, is_deleted=0)
 
         # Check if user has permission to update panel
-        user = request.user
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_auth_context(request).panels
         has_common = LocusGenotypeDiseaseSerializer(lgd_obj).check_user_permission(lgd_obj, user_panel_list)
         if has_common is False:
             return Response({"message": f"No permission to update record '{stable_id}'"}, status=status.HTTP_403_FORBIDDEN)
@@ -814,7 +985,7 @@ class LGDEditVariantTypes(CustomPermissionAPIView):
                 {"message": f"Variant type '{variant_type}' successfully deleted for ID '{stable_id}'"},
                 status=status.HTTP_200_OK)
 
-class LGDEditVariantTypeDescriptions(CustomPermissionAPIView):
+class LGDEditVariantTypeDescriptions(RecordVersionMixin, CustomPermissionAPIView):
     """
         Add or delete LGD-variant type(s)
 
@@ -867,14 +1038,10 @@ class LGDEditVariantTypeDescriptions(CustomPermissionAPIView):
                         }]
                     }
         """
-        user = self.request.user
-
         lgd = get_object_or_404(LocusGenotypeDisease, stable_id__stable_id=stable_id, is_deleted=0)
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_auth_context(request).panels
         has_common = LocusGenotypeDiseaseSerializer(lgd).check_user_permission(lgd, user_panel_list)
         if has_common is False:
             return Response({"message": f"No permission to update record '{stable_id}'"}, status=status.HTTP_403_FORBIDDEN)
@@ -931,14 +1098,10 @@ class LGDEditVariantTypeDescriptions(CustomPermissionAPIView):
             return Response({"errors": f"Empty variant type description. Please provide the 'description'."}, status=status.HTTP_400_BAD_REQUEST)
 
         var_desc = request.data.get('description')
-        user = request.user
-
         lgd_obj = get_object_or_404(LocusGenotypeDisease, stable_id__stable_id=stable_id, is_deleted=0)
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_auth_context(request).panels
         has_common = LocusGenotypeDiseaseSerializer(lgd_obj).check_user_permission(lgd_obj, user_panel_list)
         if has_common is False:
             return Response({"message": f"No permission to update record '{stable_id}'"}, status=status.HTTP_403_FORBIDDEN)
@@ -957,7 +1120,7 @@ class LGDEditVariantTypeDescriptions(CustomPermissionAPIView):
                 {"message": f"Variant type description '{var_desc}' successfully deleted for ID '{stable_id}'"},
                 status=status.HTTP_200_OK)
 
-class LGDEditComment(CustomPermissionAPIView):
+class LGDEditComment(RecordVersionMixin, CustomPermissionAPIView):
     """
         Add or delete a comment to a G2P record (LGD).
     """
@@ -1005,8 +1168,6 @@ class LGDEditComment(CustomPermissionAPIView):
                     ]
                 }
         """
-        user = self.request.user
-
         # Check if G2P ID exists
         lgd = get_object_or_404(LocusGenotypeDisease, stable_id__stable_id=stable_id, is_deleted=0)
 
@@ -1015,10 +1176,9 @@ class LGDEditComment(CustomPermissionAPIView):
         lgd_panels = lgd_serializer.get_panels(lgd)
         # Example of lgd_panels:
         # [{'name': 'DD', 'description': 'Developmental disorders'}, {'name': 'Eye', 'description': 'Eye disorders'}]
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        user_serializer = UserSerializer(user_obj, context={"user": user})
+        auth_context = get_auth_context(request)
 
-        if not user_serializer.check_panel_permission(lgd_panels):
+        if not auth_context.can_edit_panels(panel.get("name") for panel in lgd_panels):
             return Response({"message": f"No permission to edit {stable_id}"}, status=status.HTTP_403_FORBIDDEN)
 
         # LGDCommentListSerializer accepts a list of comments
@@ -1038,7 +1198,7 @@ class LGDEditComment(CustomPermissionAPIView):
             for comment in lgd_comments_data:
                 serializer_class = LGDCommentSerializer(
                     data=comment,
-                    context={"lgd": lgd, "user": user_obj}
+                    context={"lgd": lgd, "user": auth_context.user}
                 )
 
                 if serializer_class.is_valid():
@@ -1068,14 +1228,10 @@ class LGDEditComment(CustomPermissionAPIView):
             Example: { "comment": "This is a comment" }
         """
         comment = request.data.get('comment')
-        user = request.user
-
         lgd_obj = get_object_or_404(LocusGenotypeDisease, stable_id__stable_id=stable_id, is_deleted=0)
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_auth_context(request).panels
         has_common = LocusGenotypeDiseaseSerializer(lgd_obj).check_user_permission(lgd_obj, user_panel_list)
         if has_common is False:
             return Response({"message": f"No permission to update record '{stable_id}'"}, status=status.HTTP_403_FORBIDDEN)
@@ -1091,7 +1247,7 @@ class LGDEditComment(CustomPermissionAPIView):
                     {"message": f"Comment successfully deleted for ID '{stable_id}'"},
                     status=status.HTTP_200_OK)
 
-class LocusGenotypeDiseaseDelete(APIView):
+class LocusGenotypeDiseaseDelete(RecordVersionMixin, APIView):
     """
         Delete a LGD record
     """
@@ -1106,15 +1262,11 @@ class LocusGenotypeDiseaseDelete(APIView):
             The deletion does not remove the entry from the database, instead
             it sets the flag 'is_deleted' to 1.
         """
-        user = request.user
-
         stable_id_obj = get_object_or_404(G2PStableID, stable_id=stable_id, is_deleted=0)
         lgd_obj = get_object_or_404(LocusGenotypeDisease, stable_id=stable_id_obj, is_deleted=0)
 
         # Check if user has permission to update panel
-        user_obj = get_object_or_404(User, email=user, is_active=1)
-        serializer_user = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list = [panel for panel in serializer_user.panels_names(user_obj)]
+        user_panel_list = get_auth_context(request).panels
         has_common = LocusGenotypeDiseaseSerializer(lgd_obj).check_user_permission(lgd_obj, user_panel_list)
         if has_common is False:
             return Response({"message": f"No permission to update record '{stable_id}'"}, status=status.HTTP_403_FORBIDDEN)
@@ -1,23 +1,29 @@
 from rest_framework import generics, status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from django.http import Http404, HttpResponse
 from rest_framework.decorators import api_view
+from rest_framework.pagination import CursorPagination
 from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
-import csv, gzip, tempfile, os
+from django.db.models import Q, Prefetch
+import csv, gzip, tempfile, os, io, hashlib
+import numpy as np
 from datetime import datetime
 
-from gene2phenotype_app.models import (Panel, User, LocusGenotypeDisease,
+from gene2phenotype_app.models import (Panel, LocusGenotypeDisease,
                                        LGDVariantType, LGDVariantGenccConsequence,
                                        LGDMolecularMechanismEvidence, LGDPhenotype,
                                        LGDPublication, LGDCrossCuttingModifier,
-                                       LGDPanel, LGDComment)
+                                       LGDPanel, LGDComment, Locus)
 
-from gene2phenotype_app.serializers import PanelDetailSerializer, LGDPanelSerializer, UserSerializer
+from gene2phenotype_app.serializers import PanelDetailSerializer, LGDPanelSerializer
 
-from .base import BaseView, IsSuperUser, CustomPermissionAPIView
+from gene2phenotype_app.utils import (panel_index, build_gene_panel_matrix, CONFIDENCE_LEVELS,
+                                      get_records_etag, get_auth_context, schedule_stats_update)
+
+from .base import BaseView, IsSuperUser, CustomPermissionAPIView, RecordVersionMixin, ConditionalGetMixin
 
 
 class PanelList(generics.ListAPIView):
@@ -56,7 +62,7 @@ class PanelList(generics.ListAPIView):
 
         return Response({'results':sorted_panels, 'count':len(sorted_panels)})
 
-class PanelDetail(BaseView):
+class PanelDetail(ConditionalGetMixin, BaseView):
     """
         Display the panel info.
 
@@ -72,7 +78,25 @@ class PanelDetail(BaseView):
                             (dict) stats
     """
 
-    def get(self, request, name, *args, **kwargs):
+    def get_etag(self, request, *args, **kwargs):
+        """
+            The ETag is built from the records of the panel, the panel
+            description and the curators (the users linked to the panel
+            are not part of the records).
+        """
+        panel = Panel.objects.filter(name=self.kwargs['name']).first()
+
+        if panel is None or (panel.is_visible == 0 and not request.user.is_authenticated):
+            return None
+
+        etag = get_records_etag(LocusGenotypeDisease.objects.filter(lgdpanel__panel=panel))
+        curators = PanelDetailSerializer().get_curators(panel)
+        panel_data = hashlib.sha1("\n".join([str(panel.description), *curators]).encode()).hexdigest()
+
+        return f"panel-{panel.id}-{etag}-{panel_data[:16]}"
+
+    def list(self, request, *args, **kwargs):
+        name = self.kwargs['name']
         user = self.request.user
         queryset = Panel.objects.filter(name=name)
 
@@ -132,8 +156,180 @@ class PanelRecordsSummary(BaseView):
         else:
             self.handle_no_permission('Panel', name)
 
+class PanelRecordsPagination(CursorPagination):
+    """
+        Keyset pagination for the panel records.
+        The records are ordered by their primary key (unique and not null),
+        each page is fetched with 'WHERE id > cursor LIMIT page_size'.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+class PanelRecords(BaseView):
+    """
+        Display the G2P records associated with the panel.
+        The records are paginated with keyset (cursor) pagination.
+
+        Args:
+            (str) panel: the panel short name
+            (str) confidence: filter by confidence (optional)
+            (str) genotype: filter by allelic requirement (optional)
+            (str) mechanism: filter by molecular mechanism (optional)
+            (str) review_after: records reviewed on or after date YYYY-MM-DD (optional)
+            (str) review_before: records reviewed before date YYYY-MM-DD (optional)
+            Filters accept a comma separated list of values.
+
+        Returns:
+            Response object includes:
+                            (list) results: list of records
+                            (str) next: link to the next page
+                            (str) previous: link to the previous page
+    """
+
+    pagination_class = PanelRecordsPagination
+
+    filters = {
+        'confidence': 'confidence__value__in',
+        'genotype': 'genotype__value__in',
+        'mechanism': 'mechanism__value__in',
+    }
+
+    def get_queryset(self):
+        user = self.request.user
+        name = self.kwargs['name']
+
+        panel = Panel.objects.filter(name=name).first()
+        if panel is None or (panel.is_visible == 0 and not user.is_authenticated):
+            self.handle_no_permission('Panel', name)
+
+        queryset = LocusGenotypeDisease.objects.filter(
+            lgdpanel__panel=panel,
+            lgdpanel__is_deleted=0,
+            is_deleted=0
+        )
+
+        # Non-authenticated users can only see reviewed records
+        if not user.is_authenticated:
+            queryset = queryset.filter(is_reviewed=1)
+
+        for param, lookup in self.filters.items():
+            value = self.request.query_params.get(param, None)
+            if value:
+                queryset = queryset.filter(**{lookup: value.split(',')})
+
+        for param, lookup in (('review_after', 'date_review__gte'), ('review_before', 'date_review__lt')):
+            value = self.request.query_params.get(param, None)
+            if value:
+                try:
+                    date = datetime.strptime(value, '%Y-%m-%d')
+                except ValueError:
+                    raise ValidationError({"message": f"Invalid date '{value}', the format is YYYY-MM-DD"})
+                queryset = queryset.filter(**{lookup: date})
+
+        return queryset.select_related(
+            'stable_id', 'locus', 'disease', 'genotype', 'confidence', 'mechanism'
+        ).prefetch_related(
+            Prefetch('lgdvariantgenccconsequence_set',
+                     queryset=LGDVariantGenccConsequence.objects.filter(is_deleted=0).select_related('variant_consequence')),
+            Prefetch('lgdvarianttype_set',
+                     queryset=LGDVariantType.objects.filter(is_deleted=0).select_related('variant_type_ot'))
+        )
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+
+        results = []
+        for lgd in page:
+            variant_types = []
+            for lgd_variant_type in lgd.lgdvarianttype_set.all():
+                if lgd_variant_type.variant_type_ot.term not in variant_types:
+                    variant_types.append(lgd_variant_type.variant_type_ot.term)
+
+            results.append({
+                'stable_id': lgd.stable_id.stable_id,
+                'locus': lgd.locus.name,
+                'disease': lgd.disease.name,
+                'genotype': lgd.genotype.value,
+                'confidence': lgd.confidence.value,
+                'variant_consequence': [
+                    lgd_consequence.variant_consequence.term for lgd_consequence in lgd.lgdvariantgenccconsequence_set.all()
+                ],
+                'variant_type': variant_types,
+                'molecular_mechanism': lgd.mechanism.value,
+                'last_updated': lgd.date_review.strftime("%Y-%m-%d") if lgd.date_review else None
+            })
+
+        return self.get_paginated_response(results)
+
+class PanelCompare(BaseView):
+    """
+        Compare the records or the genes of two panels.
+        The comparison uses the in-memory panel index.
+
+        Args:
+            (str) a: first panel short name
+            (str) b: second panel short name
+            (str) op: operation 'intersection' (default), 'difference' (a - b) or 'union'
+            (str) type: type of data to compare 'records' (default) or 'genes'
+
+        Returns:
+            Paginated response object includes:
+                            (list) results: list of records or genes
+                            (int) count: number of records or genes
+    """
+
+    def list(self, request, *args, **kwargs):
+        user = self.request.user
+        panel_a = request.query_params.get('a', None)
+        panel_b = request.query_params.get('b', None)
+        operation = request.query_params.get('op', 'intersection')
+        data_type = request.query_params.get('type', 'records')
+
+        if not panel_a or not panel_b:
+            return Response({"message": "Please enter two panels to compare"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if operation not in panel_index.operations:
+            return Response({"message": f"Invalid operation '{operation}'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if data_type not in ("records", "genes"):
+            return Response({"message": f"Invalid type '{data_type}'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        panels = []
+        for name in (panel_a, panel_b):
+            panel = Panel.objects.filter(name=name).first()
+            if panel is None or (panel.is_visible == 0 and not user.is_authenticated):
+                self.handle_no_permission('Panel', name)
+            panels.append(panel.name)
+
+        # Non-authenticated users can only see reviewed records
+        ids = panel_index.compare(panels[0], panels[1], operation, data_type,
+                                  reviewed_only=not user.is_authenticated)
+
+        page = self.paginate_queryset(ids)
+
+        if data_type == "genes":
+            genes = dict(Locus.objects.filter(id__in=page).values_list('id', 'name'))
+            results = [{"gene_symbol": genes[id]} for id in page if id in genes]
+        else:
+            records = {
+                lgd['id']: lgd for lgd in LocusGenotypeDisease.objects.filter(id__in=page).values(
+                    'id', 'stable_id__stable_id', 'locus__name', 'disease__name',
+                    'genotype__value', 'confidence__value', 'mechanism__value')
+            }
+            results = [{
+                "stable_id": records[id]['stable_id__stable_id'],
+                "locus": records[id]['locus__name'],
+                "disease": records[id]['disease__name'],
+                "genotype": records[id]['genotype__value'],
+                "confidence": records[id]['confidence__value'],
+                "molecular_mechanism": records[id]['mechanism__value']
+            } for id in page if id in records]
+
+        return self.get_paginated_response(results)
+
 ### Edit data ###
-class LGDEditPanel(CustomPermissionAPIView):
+class LGDEditPanel(RecordVersionMixin, CustomPermissionAPIView):
     """
         Method to add or delete LGD-panel association.
     """
@@ -155,8 +351,6 @@ class LGDEditPanel(CustomPermissionAPIView):
             Input example:
                         { "name": "DD" }
         """
-        user = self.request.user
-
         panel_name_input = request.data.get("name", None)
 
         if panel_name_input is None or panel_name_input == "":
@@ -166,9 +360,7 @@ class LGDEditPanel(CustomPermissionAPIView):
         panel_obj = get_object_or_404(Panel, name=panel_name_input)
 
         # Check if user can update panel
-        user_obj = get_object_or_404(User, email=user)
-        serializer = UserSerializer(user_obj, context={"user" : user})
-        user_panel_list_lower = [panel.lower() for panel in serializer.panels_names(user_obj)]
+        user_panel_list_lower = [panel.lower() for panel in get_auth_context(request).panels]
 
         if panel_name_input.lower() not in user_panel_list_lower:
             return Response({"message": f"No permission to update panel {panel_name_input}"}, status=status.HTTP_403_FORBIDDEN)
@@ -204,6 +396,9 @@ class LGDEditPanel(CustomPermissionAPIView):
 
         try:
             LGDPanel.objects.filter(lgd=lgd_obj, panel=panel_obj, is_deleted=0).update(is_deleted=1)
+            # update() does not send the save signals
+            panel_index.invalidate()
+            schedule_stats_update([lgd_obj.id])
         except:
             return Response(
                 {"errors": f"Could not delete panel '{panel}' for ID '{stable_id}'"},
@@ -232,13 +427,7 @@ def PanelDownload(request, name):
                 Invalid panel
     """
 
-    user_email = request.user
-
-    # Get user
-    try:
-        user_obj = User.objects.get(email=user_email)
-    except User.DoesNotExist:
-        user_obj = None
+    auth_context = get_auth_context(request)
 
     # Check if panel is valid
     try:
@@ -392,7 +581,7 @@ def PanelDownload(request, name):
 
     # Authenticated users can download all panels
     # Non authenticated users can only download visible panels
-    if panel.is_visible == 1 or (user_obj and user_obj.is_authenticated and panel.is_visible == 0):
+    if panel.is_visible == 1 or (auth_context.is_authenticated and panel.is_visible == 0):
         # Download reviewed entries
         queryset_list = LocusGenotypeDisease.objects.filter(
             is_deleted = 0,
@@ -556,6 +745,70 @@ def PanelDownload(request, name):
 
     return response
 
+@api_view(['GET'])
+def PanelMatrixDownload(request):
+    """
+        Method to download the gene x panel matrix.
+        Each cell has the best confidence of the records linked to the gene and the panel.
+        Authenticated users can download data for all panels and records.
+
+        Args:
+                (HttpRequest) request: HTTP request
+                (str) output: file type 'tsv' (default) or 'npz'
+
+        Returns:
+                tsv file: one row per gene, one column per panel
+                npz file: numpy arrays 'genes', 'panels', 'matrix' and 'confidence'
+                          (matrix values are indexes of 'confidence', 0 = no record)
+                500 if a record has a confidence not supported by the matrix (see CONFIDENCE_LEVELS)
+    """
+    user = request.user
+    output = request.query_params.get('output', 'tsv')
+
+    if output not in ('tsv', 'npz'):
+        return Response({"message": f"Invalid output '{output}'"}, status=status.HTTP_400_BAD_REQUEST)
+
+    queryset = LGDPanel.objects.filter(is_deleted=0, lgd__is_deleted=0)
+
+    # Non authenticated users can only download reviewed records from visible panels
+    if not user.is_authenticated:
+        queryset = queryset.filter(lgd__is_reviewed=1, panel__is_visible=1)
+
+    rows = queryset.values_list('lgd__locus__name', 'panel__name', 'lgd__confidence__value').iterator()
+    try:
+        genes, panels, matrix = build_gene_panel_matrix(rows)
+    except ValueError as e:
+        return Response({"message": f"Cannot build the gene panel matrix: {e}"},
+                        status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    date_now = datetime.today().strftime('%Y-%m-%d')
+    filename = f"G2P_gene_panel_matrix_{date_now}.{output}"
+
+    if output == 'npz':
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer,
+                            genes=np.array(genes),
+                            panels=np.array(panels),
+                            matrix=matrix,
+                            confidence=np.array(CONFIDENCE_LEVELS))
+        return HttpResponse(
+            buffer.getvalue(),
+            content_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
+    response = HttpResponse(
+        content_type="text/tab-separated-values",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+    writer = csv.writer(response, delimiter='\t')
+    writer.writerow(["gene symbol"] + panels)
+    for gene, row in zip(genes, matrix.tolist()):
+        writer.writerow([gene] + [CONFIDENCE_LEVELS[code] for code in row])
+
+    return response
+
 def extract_locus_id(locus_ids):
     """
         Method to extract the gene MIM ID and the
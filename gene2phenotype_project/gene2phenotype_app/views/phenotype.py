@@ -13,7 +13,7 @@ from gene2phenotype_app.serializers import (PhenotypeOntologyTermSerializer, LGD
 from gene2phenotype_app.models import (OntologyTerm, LGDPhenotype, LocusGenotypeDisease,
                                        LGDPhenotypeSummary)
 
-from .base import BaseAdd, CustomPermissionAPIView, IsSuperUser
+from .base import BaseAdd, CustomPermissionAPIView, IsSuperUser, RecordVersionMixin
 
 from ..utils import validate_phenotype
 
@@ -79,7 +79,7 @@ def PhenotypeDetail(request, hpo_list):
 
 ### LGD-phenotype ###
 # Add or delete data
-class LGDEditPhenotypes(CustomPermissionAPIView):
+class LGDEditPhenotypes(RecordVersionMixin, CustomPermissionAPIView):
     """
         Add or delete lgd-phenotype.
 
@@ -196,7 +196,7 @@ class LGDEditPhenotypes(CustomPermissionAPIView):
                 {"message": f"Phenotype '{accession}' successfully deleted for ID '{stable_id}'"},
                 status=status.HTTP_200_OK)
 
-class LGDEditPhenotypeSummary(CustomPermissionAPIView):
+class LGDEditPhenotypeSummary(RecordVersionMixin, CustomPermissionAPIView):
     """
         Add or delete a LGD-phenotype summary
 
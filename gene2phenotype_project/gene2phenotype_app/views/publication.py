@@ -3,7 +3,9 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
 from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+import json, re
 
 from gene2phenotype_app.serializers import (PublicationSerializer, LGDPublicationSerializer,
                                             LGDPublicationListSerializer, LGDPhenotypeSerializer,
@@ -14,9 +16,10 @@ from gene2phenotype_app.models import (Publication, LocusGenotypeDisease, LGDPub
                                        LGDPhenotype, LGDPhenotypeSummary, LGDVariantType,
                                        LGDVariantTypeDescription, LGDMolecularMechanismEvidence)
 
-from .base import BaseAdd, BaseUpdate, IsSuperUser
+from .base import BaseAdd, BaseUpdate, IsSuperUser, RecordVersionMixin
+from .locus_genotype_disease import get_visible_records
 
-from ..utils import get_publication, get_authors
+from ..utils import get_publication, get_authors, read_id_list
 
 
 """
@@ -97,6 +100,104 @@ def PublicationDetail(request, pmids):
     return response
 
 
+"""
+    Retrieve the G2P records citing a list of PMIDs.
+    A record cites a publication if the publication is linked to the record or
+    to the record phenotypes, variant types or molecular mechanism evidence.
+    The PMIDs are processed in batches, each batch runs one query per link table.
+    The response is streamed while the batches are processed.
+    Non-authenticated users can only see reviewed records linked to visible panels.
+
+    Args:
+            (HttpRequest) request: HTTP request
+            (file) file: text or CSV/TSV file with the list of PMIDs
+            (list/str) pmids: list of PMIDs (if no file is uploaded)
+
+    Returns:
+            JSON object:
+                (list) results: records grouped by PMID (same order as the input)
+                                    - pmid
+                                    - records: list of records citing the PMID
+                                                - stable_id
+                                                - linked_by: where the PMID is linked
+                                                  (possible values: 'publication', 'phenotype',
+                                                  'variant_type', 'mechanism_evidence')
+                (list) not_found: PMIDs not found in G2P or without records
+                (list) invalid: invalid PMIDs (a PMID has 1 to 10 digits)
+                (int) count: number of PMIDs with records
+"""
+@api_view(['POST'])
+def PublicationRecords(request):
+    max_pmids = 50000
+    batch_size = 1000
+    link_tables = (
+        ('publication', LGDPublication),
+        ('phenotype', LGDPhenotype),
+        ('variant_type', LGDVariantType),
+        ('mechanism_evidence', LGDMolecularMechanismEvidence),
+    )
+
+    pmid_list = []
+    invalid_pmids = []
+    for pmid_str in read_id_list(request, 'pmids'):
+        # isdigit() accepts other Unicode digits (e.g. '²')
+        if re.fullmatch(r"[0-9]{1,10}", pmid_str):
+            pmid_list.append(int(pmid_str))
+        else:
+            invalid_pmids.append(pmid_str)
+
+    if not pmid_list and not invalid_pmids:
+        return Response({"message": "Please upload a list of PMIDs"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(pmid_list) > max_pmids:
+        return Response({"message": f"The maximum number of PMIDs is {max_pmids}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    visible_records = get_visible_records(request.user).values('id')
+
+    def chunks():
+        not_found = []
+        count = 0
+
+        yield '{"results":['
+
+        for i in range(0, len(pmid_list), batch_size):
+            batch = pmid_list[i:i + batch_size]
+            publications = dict(Publication.objects.filter(pmid__in=batch).values_list('id', 'pmid'))
+
+            # key = pmid; value = dict (key = stable_id; value = link types)
+            pmid_records = {}
+            if publications:
+                for link_type, model in link_tables:
+                    rows = model.objects.filter(
+                        publication_id__in=list(publications), is_deleted=0, lgd_id__in=visible_records
+                    ).values_list('publication_id', 'lgd__stable_id__stable_id')
+
+                    for publication_id, stable_id in rows:
+                        records = pmid_records.setdefault(publications[publication_id], {})
+                        link_types = records.setdefault(stable_id, [])
+                        if link_type not in link_types:
+                            link_types.append(link_type)
+
+            items = []
+            for pmid in batch:
+                if pmid not in pmid_records:
+                    not_found.append(pmid)
+                    continue
+
+                records = [
+                    {"stable_id": stable_id, "linked_by": link_types}
+                    for stable_id, link_types in sorted(pmid_records[pmid].items())
+                ]
+                items.append(json.dumps({"pmid": pmid, "records": records}, separators=(',', ':')))
+
+            if items:
+                yield ("," if count else "") + ",".join(items)
+                count += len(items)
+
+        yield f'],"not_found":{json.dumps(not_found)},"invalid":{json.dumps(invalid_pmids)},"count":{count}}}'
+
+    return StreamingHttpResponse(chunks(), content_type="application/json")
+
+
 ### Add publication ###
 class AddPublication(BaseAdd):
     """
@@ -108,7 +209,7 @@ class AddPublication(BaseAdd):
 
 ### LGD-publication ###
 # Add or delete data
-class LGDEditPublications(BaseUpdate):
+class LGDEditPublications(RecordVersionMixin, BaseUpdate):
     """
         Add or delete lgd-publication.
 
@@ -124,6 +225,8 @@ class LGDEditPublications(BaseUpdate):
             it sets the flag 'is_deleted' to 1.
     """
     http_method_names = ['post', 'update', 'options']
+    # Publication comments and families are displayed in all records with the publication
+    update_shared_publications = True
 
     def get_permissions(self):
         """
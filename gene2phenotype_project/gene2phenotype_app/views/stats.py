@@ -0,0 +1,33 @@
+from rest_framework.response import Response
+
+from gene2phenotype_app.models import DatasetStats
+
+from gene2phenotype_app.serializers import DatasetStatsSerializer
+
+from .base import BaseView
+
+
+class DatasetStatistics(BaseView):
+    """
+        Display the global statistics of the G2P records.
+        The stats are read from the rollup table (dataset_stats).
+        The rollup is created by the command refresh_dataset_stats, the stats
+        are empty until the command is run.
+
+        Returns:
+            Response object includes:
+                            (int) total_records: number of records
+                            (int) total_genes: number of distinct genes
+                            (dict) by_confidence: number of records by confidence
+                            (dict) by_mechanism: number of records by molecular mechanism
+                            (dict) by_genotype: number of records by allelic requirement
+                            (dict) by_variant_consequence: number of records by variant consequence
+                            (string) last_updated: date of the last refresh
+    """
+
+    serializer_class = DatasetStatsSerializer
+
+    def list(self, request, *args, **kwargs):
+        queryset = DatasetStats.objects.all()
+
+        return Response(DatasetStatsSerializer().stats(queryset))
@@ -12,6 +12,7 @@ from datetime import timedelta
 from gene2phenotype_app.serializers import (UserSerializer, LoginSerializer,
                                             CreateUserSerializer, LogoutSerializer, ChangePasswordSerializer, VerifyEmailSerializer, PasswordResetSerializer)
 from gene2phenotype_app.models import User, UserPanel
+from gene2phenotype_app.utils import get_auth_context
 from .base import BaseView
 from gene2phenotype_app.authentication import CustomAuthentication
 from rest_framework.exceptions import AuthenticationFailed
@@ -72,8 +73,7 @@ class UserList(generics.ListAPIView):
         return context
 
     def get_queryset(self):
-        user = self.request.user
-        if user and user.is_authenticated:
+        if get_auth_context(self.request).is_authenticated:
             queryset = User.objects.filter(is_active=1)
         else:
             queryset = User.objects.filter(is_active=1, is_staff=0)
@@ -82,7 +82,7 @@ class UserList(generics.ListAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
-        serializer = UserSerializer(queryset, many=True, context={'user': self.request.user})
+        serializer = UserSerializer(queryset, many=True, context={'auth_context': get_auth_context(request)})
 
         return Response({'results': serializer.data, 'count':len(serializer.data)})
 
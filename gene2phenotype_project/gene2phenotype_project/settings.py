@@ -157,7 +157,9 @@ WSGI_APPLICATION = 'gene2phenotype_project.wsgi.application'
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
 # For testing
-if 'test' in sys.argv or 'test_coverage' in sys.argv:
+TESTING = 'test' in sys.argv or 'test_coverage' in sys.argv
+
+if TESTING:
     DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -177,6 +179,24 @@ else:
         }
     }
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# The cache stores the record JSON and the versions of the in-memory indexes,
+# it must be shared by all the processes (e.g. memcached or redis)
+# Config section (optional):
+#   [cache]
+#   backend=django.core.cache.backends.memcached.PyMemcacheCache
+#   location=127.0.0.1:11211
+# Without the section the local memory cache is used, it is not shared: the system
+# checks report a warning outside the tests (see gene2phenotype_app/checks.py)
+if config.has_section('cache'):
+    CACHES = {
+        'default': {
+            'BACKEND': config.get('cache', 'backend'),
+            'LOCATION': config.get('cache', 'location'),
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 